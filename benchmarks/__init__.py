@@ -0,0 +1,8 @@
+"""Benchmarks of visbrain hot paths (asv compatible).
+
+Run the benchmarks with `asv run` (see asv.conf.json) or run each benchmark
+once, at its smallest problem size, with `pytest -m smoke benchmarks`.
+"""
+from .common import use_headless
+
+use_headless()
@@ -0,0 +1,28 @@
+"""Benchmark the projection of sources on a brain mesh."""
+from visbrain.objects import BrainObj, SourceObj
+from visbrain.objects._projection import _project_sources_data
+
+from .common import generate_sources
+
+
+class TimeProjectSources(object):
+    """Time the projection of source's data on the B1 template."""
+
+    params = ([10, 100, 1000], ['modulation', 'repartition'])
+    param_names = ['n_sources', 'project']
+
+    def setup(self, n_sources, project):
+        """Generate sources close to the brain surface."""
+        self.b_obj = BrainObj('B1')
+        xyz, data = generate_sources(self.b_obj.mesh._vertices, n_sources)
+        self.s_obj = SourceObj('s', xyz, data=data)
+
+    def time_project_sources(self, n_sources, project):
+        """Time _project_sources_data."""
+        _project_sources_data(self.s_obj, self.b_obj, project, radius=10.,
+                              mask_color='gray')
+
+    def peakmem_project_sources(self, n_sources, project):
+        """Peak memory of _project_sources_data."""
+        _project_sources_data(self.s_obj, self.b_obj, project, radius=10.,
+                              mask_color='gray')
@@ -0,0 +1,36 @@
+"""Benchmark colormap functions."""
+import numpy as np
+
+from visbrain.utils.color import array2colormap
+
+
+class TimeArray2Colormap(object):
+    """Time array2colormap."""
+
+    params = [10000, 100000, 1000000]
+    param_names = ['n_values']
+
+    def setup(self, n_values):
+        """Generate data."""
+        rng = np.random.RandomState(0)
+        self.x = rng.randn(n_values)
+        self.out = np.empty((n_values, 4), dtype=np.float32)
+        self.kw = dict(cmap='viridis', clim=(-2., 2.), vmin=-1.5,
+                       under='gray', vmax=1.5, over='red')
+        array2colormap(self.x[0:10], **self.kw)  # cache the lookup table
+
+    def time_array2colormap(self, n_values):
+        """Time array2colormap."""
+        array2colormap(self.x, **self.kw)
+
+    def time_array2colormap_out(self, n_values):
+        """Time array2colormap with a preallocated output."""
+        array2colormap(self.x, out=self.out, **self.kw)
+
+    def time_array2colormap_translucent(self, n_values):
+        """Time array2colormap with translucent values."""
+        array2colormap(self.x, out=self.out, translucent=(-.5, .5), **self.kw)
+
+    def peakmem_array2colormap(self, n_values):
+        """Peak memory of array2colormap."""
+        array2colormap(self.x, **self.kw)
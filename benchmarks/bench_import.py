@@ -0,0 +1,25 @@
+"""Benchmark importation of non-graphical entry points.
+
+Each benchmark runs in a fresh interpreter. Use `python -X importtime -c
+"import visbrain.io"` for a detailed report.
+"""
+
+
+class TimeImport(object):
+    """Time importation of non-graphical entry points."""
+
+    def timeraw_import_visbrain(self):
+        """Time import visbrain."""
+        return "import visbrain"
+
+    def timeraw_import_io(self):
+        """Time import visbrain.io."""
+        return "import visbrain.io"
+
+    def timeraw_import_read_sleep(self):
+        """Time import visbrain.io.read_sleep."""
+        return "from visbrain.io.read_sleep import ReadSleepData"
+
+    def timeraw_import_detection(self):
+        """Time import visbrain.utils.sleep.detection."""
+        return "import visbrain.utils.sleep.detection"
@@ -0,0 +1,61 @@
+"""Benchmark reading of sleep files and annotations."""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from visbrain.io.read_annotations import AnnotationStore
+from visbrain.io.read_sleep import read_edf
+
+from .common import SEED, write_edf
+
+
+class TimeReadEdf(object):
+    """Time read_edf on a synthetic 8 channels file."""
+
+    params = [60, 600, 3600]
+    param_names = ['seconds']
+
+    def setup(self, seconds):
+        """Write the EDF file."""
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'bench.edf')
+        write_edf(self.path, n_channels=8, duration=seconds, sf=256)
+
+    def teardown(self, seconds):
+        """Remove the EDF file."""
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def time_read_edf(self, seconds):
+        """Time read_edf (down-sampled to 100Hz)."""
+        read_edf(self.path, 100.)
+
+    def peakmem_read_edf(self, seconds):
+        """Peak memory of read_edf."""
+        read_edf(self.path, 100.)
+
+
+class TimeAnnotationStore(object):
+    """Time merges and window queries of annotations."""
+
+    params = [1000, 100000]
+    param_names = ['n_annotations']
+
+    def setup(self, n_annotations):
+        """Generate artefact-like annotations."""
+        rng = np.random.RandomState(SEED)
+        start = np.sort(rng.uniform(0., 28800., n_annotations))
+        end = start + rng.exponential(2., n_annotations)
+        text = rng.choice(['art', 'arousal', 'movement'], n_annotations)
+        self.annotations = np.c_[start, end, text]
+        self.store = AnnotationStore(self.annotations)
+
+    def time_merge(self, n_annotations):
+        """Time merging annotations into a store."""
+        AnnotationStore(self.annotations, self.annotations)
+
+    def time_query(self, n_annotations):
+        """Time querying the annotations of 100 windows of 30s."""
+        for t in np.arange(0., 3000., 30.):
+            self.store.query(t, t + 30.)
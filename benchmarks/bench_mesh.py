@@ -0,0 +1,42 @@
+"""Benchmark mesh functions."""
+from visbrain.utils.mesh import laplacian_smoothing, volume_to_mesh
+
+from .common import generate_mesh, generate_volume
+
+
+class TimeLaplacianSmoothing(object):
+    """Time laplacian_smoothing."""
+
+    params = [2, 3, 4]
+    param_names = ['subdivisions']
+
+    def setup(self, subdivisions):
+        """Generate an icosphere."""
+        self.vertices, self.faces = generate_mesh(subdivisions)
+
+    def time_laplacian_smoothing(self, subdivisions):
+        """Time laplacian_smoothing."""
+        laplacian_smoothing(self.vertices, self.faces)
+
+    def peakmem_laplacian_smoothing(self, subdivisions):
+        """Peak memory of laplacian_smoothing."""
+        laplacian_smoothing(self.vertices, self.faces)
+
+
+class TimeVolumeToMesh(object):
+    """Time volume_to_mesh."""
+
+    params = [32, 64, 128]
+    param_names = ['size']
+
+    def setup(self, size):
+        """Generate a volume."""
+        self.vol = generate_volume(size)
+
+    def time_volume_to_mesh(self, size):
+        """Time volume_to_mesh."""
+        volume_to_mesh(self.vol, level=.5)
+
+    def peakmem_volume_to_mesh(self, size):
+        """Peak memory of volume_to_mesh."""
+        volume_to_mesh(self.vol, level=.5)
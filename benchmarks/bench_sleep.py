@@ -0,0 +1,81 @@
+"""Benchmark sleep detections."""
+import numpy as np
+
+from visbrain.utils import generate_eeg
+from visbrain.utils.sleep.detection import spindlesdetect
+
+
+class TimeSpindlesDetect(object):
+    """Time spindlesdetect on synthetic EEG."""
+
+    params = [1, 10, 60]
+    param_names = ['minutes']
+
+    def setup(self, minutes):
+        """Generate a single EEG channel."""
+        self.sf = 100.
+        n_pts = int(minutes * 60 * self.sf)
+        self.data = generate_eeg(sf=self.sf, n_pts=n_pts, f_max=40.)[0].ravel()
+        self.hypno = np.zeros((n_pts,), dtype=np.float32)
+
+    def time_spindlesdetect(self, minutes):
+        """Time spindlesdetect."""
+        spindlesdetect(self.data, self.sf, 2., self.hypno, False)
+
+    def peakmem_spindlesdetect(self, minutes):
+        """Peak memory of spindlesdetect."""
+        spindlesdetect(self.data, self.sf, 2., self.hypno, False)
+
+
+def _resize(canvas, size):
+    """Resize a canvas (headless backends do not emit resize events)."""
+    canvas.size = size
+    canvas.events.resize(size=size)
+
+
+class TimeChannelFrame(object):
+    """Time a frame of Sleep channels, as lanes of a single canvas or as one
+    canvas per channel."""
+
+    params = [8, 32, 64]
+    param_names = ['channels']
+
+    def setup(self, channels):
+        """Draw a line of 10 seconds at 1000Hz in each channel."""
+        from vispy import scene
+        from visbrain.sleep.interface.ui_init import AxisCanvas, ChannelCanvas
+        time = np.arange(10000, dtype=np.float32) / 1000.
+        data = generate_eeg(sf=1000., n_pts=len(time),
+                            n_channels=channels)[0].reshape(channels, -1)
+        names = ['chan%i' % k for k in range(channels)]
+        self.lanes = ChannelCanvas(names)
+        self.canvases = [AxisCanvas(name=k) for k in names]
+        for k, d in enumerate(data):
+            pos = np.c_[time, d].astype(np.float32)
+            for c in (self.lanes[k], self.canvases[k]):
+                scene.visuals.Line(pos, parent=c.wc.scene, color='black')
+                c.set_camera(scene.PanZoomCamera(rect=(0., d.min(), 10.,
+                                                       d.ptp())))
+        self.lanes.set_visible(np.ones((channels,), dtype=bool))
+        _resize(self.lanes.canvas, (1000, 60 * channels))
+        for c in self.canvases:
+            _resize(c.canvas, (1000, 60))
+        try:  # compile shaders
+            self.time_lanes(channels)
+            self.time_canvases(channels)
+        except Exception as e:
+            raise NotImplementedError("Rendering is not available (%s)" % e)
+
+    def teardown(self, channels):
+        """Close canvas."""
+        for c in [self.lanes] + self.canvases:
+            c.canvas.close()
+
+    def time_lanes(self, channels):
+        """Time a frame of a single canvas with one lane per channel."""
+        self.lanes.canvas.render()
+
+    def time_canvases(self, channels):
+        """Time a frame of one canvas per channel."""
+        for c in self.canvases:
+            c.canvas.render()
@@ -0,0 +1,31 @@
+"""Benchmark topographic interpolation."""
+import numpy as np
+
+from visbrain.visuals.TopoVisual import TopoMesh
+
+from .common import SEED
+
+
+class TimeGriddata(object):
+    """Time the interpolation of channels on a grid."""
+
+    params = ([16, 64, 256], [32, 64, 128])
+    param_names = ['n_channels', 'grid']
+
+    def setup(self, n_channels, grid):
+        """Generate channels in the unit disc."""
+        rng = np.random.RandomState(SEED)
+        radius, theta = np.sqrt(rng.rand(2, n_channels))
+        theta *= 2. * np.pi
+        self.x, self.y = radius * np.cos(theta), radius * np.sin(theta)
+        self.v = rng.randn(n_channels)
+        self.xi, self.yi = np.meshgrid(np.linspace(-1., 1., grid),
+                                       np.linspace(-1., 1., grid))
+
+    def time_griddata(self, n_channels, grid):
+        """Time TopoMesh._griddata."""
+        TopoMesh._griddata(self.x, self.y, self.v, self.xi, self.yi)
+
+    def peakmem_griddata(self, n_channels, grid):
+        """Peak memory of TopoMesh._griddata."""
+        TopoMesh._griddata(self.x, self.y, self.v, self.xi, self.yi)
@@ -0,0 +1,147 @@
+"""Synthetic inputs and headless configuration shared by benchmarks.
+
+Every generator uses a fixed seed so that timings are comparable between
+commits.
+"""
+import os
+import sys
+
+import numpy as np
+
+SEED = 0
+
+
+def use_headless():
+    """Run Qt / VisPy without display.
+
+    The backend is selected with the VISBRAIN_BENCH_BACKEND environment
+    variable :
+
+        * 'offscreen' (default on Linux without DISPLAY) : Qt offscreen
+          platform.
+        * 'osmesa' : VisPy OSMesa application (requires libOSMesa).
+        * 'egl' : VisPy EGL application (e.g with EGL_PLATFORM=surfaceless).
+        * 'default' : do not change the backend.
+    """
+    headless = sys.platform.startswith('linux') and not os.environ.get(
+        'DISPLAY')
+    backend = os.environ.get('VISBRAIN_BENCH_BACKEND',
+                             'offscreen' if headless else 'default')
+    if backend == 'offscreen':
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    elif backend == 'osmesa':
+        import vispy
+        vispy.use(app='osmesa', gl='gl2')
+    elif backend == 'egl':
+        import vispy
+        vispy.use(app='egl')
+    from visbrain.utils.logging import set_log_level
+    set_log_level('error')
+    return backend
+
+
+def generate_mesh(subdivisions=3):
+    """Generate an icosphere mesh.
+
+    Parameters
+    ----------
+    subdivisions : int | 3
+        Number of subdivisions of the icosahedron (10 * 4 ** subdivisions + 2
+        vertices).
+
+    Returns
+    -------
+    vertices : array_like
+        Array of vertices of shape (n_vertices, 3).
+    faces : array_like
+        Array of faces of shape (n_faces, 3).
+    """
+    from vispy.geometry import create_sphere
+    mesh = create_sphere(radius=50., method='ico', subdivisions=subdivisions)
+    return mesh.get_vertices().astype(np.float64), mesh.get_faces()
+
+
+def generate_volume(size=64, n_blobs=5):
+    """Generate a volume made of gaussian blobs.
+
+    Parameters
+    ----------
+    size : int | 64
+        Size of each dimension of the volume.
+    n_blobs : int | 5
+        Number of gaussian blobs.
+
+    Returns
+    -------
+    vol : array_like
+        Volume of shape (size, size, size) with values in [0, 1].
+    """
+    rng = np.random.RandomState(SEED)
+    grid = np.ogrid[0:size, 0:size, 0:size]
+    vol = np.zeros((size, size, size), dtype=np.float32)
+    for center in rng.uniform(size / 4., 3 * size / 4., (n_blobs, 3)):
+        dist = sum((g - c) ** 2 for g, c in zip(grid, center))
+        vol += np.exp(-dist / (2. * (size / 10.) ** 2)).astype(np.float32)
+    return vol / vol.max()
+
+
+def generate_sources(vertices, n_sources=100):
+    """Generate sources close to the vertices of a mesh.
+
+    Parameters
+    ----------
+    vertices : array_like
+        Array of vertices of shape (n_vertices, 3).
+    n_sources : int | 100
+        Number of sources.
+
+    Returns
+    -------
+    xyz : array_like
+        Source coordinates of shape (n_sources, 3).
+    data : array_like
+        Source data of shape (n_sources,).
+    """
+    rng = np.random.RandomState(SEED)
+    idx = rng.randint(0, len(vertices), n_sources)
+    xyz = vertices[idx] + rng.randn(n_sources, 3)
+    return xyz, rng.rand(n_sources)
+
+
+def write_edf(path, n_channels=8, duration=60, sf=256):
+    """Write a European Data Format file of random int16 samples.
+
+    Parameters
+    ----------
+    path : string
+        Path to the file.
+    n_channels : int | 8
+        Number of channels.
+    duration : int | 60
+        Duration of the recording (in seconds, one record per second).
+    sf : int | 256
+        Sampling frequency.
+    """
+    rng = np.random.RandomState(SEED)
+
+    def _fields(values, width):
+        return ''.join(str(v).ljust(width)[:width] for v in values)
+    chans = range(n_channels)
+    hdr = '0'.ljust(8) + ''.ljust(80) + ''.ljust(80) + '01.01.17' + \
+        '22.30.15' + str(256 * (n_channels + 1)).ljust(8) + ''.ljust(44) + \
+        str(duration).ljust(8) + '1'.ljust(8) + str(n_channels).ljust(4)
+    hdr += _fields(['EEG%i' % k for k in chans], 16)
+    hdr += _fields(['' for k in chans], 80)
+    hdr += _fields(['uV' for k in chans], 8)
+    hdr += _fields([-3200 for k in chans], 8)
+    hdr += _fields([3200 for k in chans], 8)
+    hdr += _fields([-32767 for k in chans], 8)
+    hdr += _fields([32767 for k in chans], 8)
+    hdr += _fields(['' for k in chans], 80)
+    hdr += _fields([sf for k in chans], 8)
+    hdr += _fields(['' for k in chans], 32)
+    # Records are (n_records, n_channels, sf) int16 samples :
+    samples = rng.randint(-3000, 3000, (duration, n_channels, sf))
+    with open(path, 'wb') as f:
+        f.write(hdr.encode('ascii'))
+        f.write(samples.astype('<i2').tobytes())
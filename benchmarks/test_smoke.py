@@ -0,0 +1,56 @@
+"""Run each benchmark once, at its smallest problem size.
+
+Select these tests with `pytest -m smoke benchmarks`.
+"""
+import inspect
+
+import pytest
+
+from . import (bench_brain, bench_color, bench_import, bench_io, bench_mesh,
+               bench_sleep, bench_topo)
+
+MODULES = [bench_brain, bench_color, bench_import, bench_io, bench_mesh,
+           bench_sleep, bench_topo]
+PREFIXES = ('time_', 'timeraw_', 'peakmem_', 'mem_', 'track_')
+
+
+def _smallest_params(cls):
+    """Get the smallest parameters of a benchmark (asv convention)."""
+    params = getattr(cls, 'params', [])
+    if not params:
+        return ()
+    elif len(getattr(cls, 'param_names', [])) > 1:
+        return tuple(p[0] for p in params)
+    return (params[0],)
+
+
+def _benchmarks():
+    """Get the (class, method) benchmarks of every module."""
+    for module in MODULES:
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            for name in sorted(dir(cls)):
+                if name.startswith(PREFIXES):
+                    yield pytest.param(cls, name, id='%s.%s.%s' % (
+                        module.__name__.split('.')[-1], cls.__name__, name))
+
+
+@pytest.mark.smoke
+@pytest.mark.parametrize('cls, name', list(_benchmarks()))
+def test_benchmark(cls, name):
+    """Run a benchmark at its smallest problem size."""
+    params = _smallest_params(cls)
+    bench = cls()
+    if hasattr(bench, 'setup'):
+        try:
+            bench.setup(*params)
+        except NotImplementedError as e:  # asv convention to skip
+            pytest.skip(str(e))
+    try:
+        out = getattr(bench, name)(*params)
+        if name.startswith('timeraw_'):  # code to run in a new interpreter
+            exec(out, {})
+    finally:
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*params)
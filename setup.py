@@ -44,7 +44,7 @@ setup(
     url=URL,
     download_url=DOWNLOAD_URL,
     # PACKAGE / DATA
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
     package_dir={'visbrain': 'visbrain'},
     package_data=PACKAGE_DATA,
     include_package_data=True,
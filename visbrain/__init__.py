@@ -18,18 +18,35 @@ Right now, visbrain contains five modules :
 See http://visbrain.org/ for a complete and step-by step documentation
 """
 import sys
-
-# Import modules :
-from .brain import Brain
-from .colorbar import Colorbar
-from .figure import Figure
-from .sleep import Sleep
-from .topo import Topo
-from .signal import Signal
+from importlib import import_module
 
 __all__ = ['Brain', 'Colorbar', 'Figure', 'Signal', 'Sleep', 'Topo']
 __version__ = "0.4.2"
 
+# Modules are only imported when used (e.g `from visbrain import Brain`) so
+# that non-graphical sub-packages (io, utils...) can be imported without Qt :
+_MODULES = dict(Brain='brain', Colorbar='colorbar', Figure='figure',
+                Signal='signal', Sleep='sleep', Topo='topo')
+
+
+def __getattr__(name):
+    """Import GUI modules on first access."""
+    if name in _MODULES:
+        module = getattr(import_module('.' + _MODULES[name], __name__), name)
+        globals()[name] = module
+        return module
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    """List module attributes, including lazy ones."""
+    return sorted(list(globals().keys()) + __all__)
+
+
+if sys.version_info < (3, 7):  # no module __getattr__ (PEP 562)
+    for _name in __all__:
+        __getattr__(_name)
+
 
 # PyQt5 crash if an error occured. This small function fix it for all modules
 # to retrieve the PyQt4 behavior :
@@ -81,7 +81,7 @@ class UiSources(object):
     def _fcn_source_select(self):
         """Select the source to display."""
         txt = self._s_select.currentText().split(' ')[0].lower()
-        self.sources.set_visible_sources(txt, self.atlas.vertices)
+        self.sources.set_visible_sources(txt, self.atlas)
 
     @_run_method_if_needed
     def _fcn_source_symbol(self):
@@ -156,6 +156,8 @@ class TestBrain(_TestVisbrain):
         """Test method sources_to_convex_hull."""
         s_xyz = 20 * np.random.randn(10, 3)
         vb.sources_to_convex_hull(s_xyz)
+        _, inside = vb.sources_to_convex_hull(s_xyz, points=[[1e3, 0, 0]])
+        assert not inside.any()
 
     ###########################################################################
     #                              TIME-SERIES
@@ -7,10 +7,11 @@ Brain instance.
 """
 import logging
 
+import numpy as np
 from scipy.spatial import ConvexHull
 
 from ..visuals import BrainMesh
-from ..utils import (color2vb, safely_set_cbox)
+from ..utils import (color2vb, safely_set_cbox, points_in_mesh)
 from ..io import save_config_json, write_fig_canvas
 
 logger = logging.getLogger('visbrain')
@@ -361,8 +362,7 @@ class BrainUserMethods(object):
         if select in ['all', 'none', 'left', 'right', None]:
             obj.set_visible_sources(select=select)
         elif select in ['inside', 'outside']:
-            vert = self.atlas.vertices
-            obj.set_visible_sources(select=select, v=vert)
+            obj.set_visible_sources(select=select, v=self.atlas)
 
     def __projection(self, idx_proj, radius, project_on, contribute,
                      mask_color, **kwargs):
@@ -442,26 +442,34 @@ class BrainUserMethods(object):
         """
         obj = self.sources[name] if name is not None else self.sources
         v = self.atlas if fit_to == 'brain' else self.roi
-        obj.fit_to_vertices(v.vertices)
+        obj.fit_to_vertices(v)
 
-    def sources_to_convex_hull(self, xyz):
+    def sources_to_convex_hull(self, xyz, points=None):
         """Convert a set of sources into a convex hull.
 
         Parameters
         ----------
         xyz : array_like
             Array of sources coordinates of shape (N, 3)
+        points : array_like | None
+            Array of coordinates of shape (M, 3). If not None, also test if
+            those points are inside the convex hull.
 
         Returns
         -------
         faces : array_like
             A set of faces than can be then passed to the add_mesh method.
+        inside : array_like
+            Boolean array of shape (M,). Only returned if points is not None.
 
         See also
         --------
         add_mesh : add a mesh to the scene
         """
-        return ConvexHull(xyz).simplices
+        faces = ConvexHull(xyz).simplices
+        if points is None:
+            return faces
+        return faces, points_in_mesh(points, np.asarray(xyz), faces)
 
     # =========================================================================
     # =========================================================================
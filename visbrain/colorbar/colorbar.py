@@ -1,10 +1,8 @@
 """Colorbar module."""
-import sys
-from PyQt5 import QtWidgets
-
 import vispy.app as visapp
 
 from .ui_init import UiInit
+from ..config import CONFIG
 from ..visuals import CbarQt, CbarBase, CbarObjetcs
 
 
@@ -62,7 +60,7 @@ class Colorbar(UiInit):
         if 'vmax' in list(kwargs.keys()) and (kwargs['vmax'] is not None):
             kwargs['isvmax'] = True
         # Create the app and initialize all graphical elements :
-        self._app = QtWidgets.QApplication(sys.argv)
+        self._app = CONFIG['PYQT_APP']
         # Initialise GUI :
         UiInit.__init__(self)
 
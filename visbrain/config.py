@@ -3,10 +3,8 @@ import sys
 import getopt
 import logging
 
-from PyQt5 import QtWidgets
-from vispy import app as visapp
-
-from .utils import Profiler, set_log_level
+from .utils.logging import set_log_level
+from .utils.others import Profiler
 
 """Set 'info' as the default logging level
 """
@@ -14,8 +12,33 @@ logger = logging.getLogger('visbrain')
 set_log_level('info')
 
 """Configuration dict
+
+The PyQt and VisPy applications are only created on first access (e.g
+CONFIG['PYQT_APP']) so that importing visbrain doesn't require a display.
 """
-CONFIG = {}
+
+
+class _Config(dict):
+    """Configuration dict with applications created on demand."""
+
+    def __missing__(self, key):
+        if key == 'PYQT_APP':
+            from PyQt5 import QtWidgets
+            app = QtWidgets.QApplication.instance()
+            if app is None:
+                app = QtWidgets.QApplication([''])
+            self[key] = app
+        elif key == 'VISPY_APP':
+            from vispy import app as visapp
+            self['PYQT_APP']  # the PyQt application should exist before
+            self[key] = visapp.application.Application()
+        else:
+            raise KeyError(key)
+        logger.debug("%s created" % key)
+        return self[key]
+
+
+CONFIG = _Config()
 
 """Visbrain profiler (derived from the VisPy profiler)
 """
@@ -23,19 +46,12 @@ PROFILER = Profiler()
 
 """PyQt application
 """
-PYQT_APP = QtWidgets.QApplication.instance()
-if PYQT_APP is None:
-    PYQT_APP = QtWidgets.QApplication([''])
-CONFIG['PYQT_APP'] = PYQT_APP
 CONFIG['SHOW_PYQT_APP'] = True
 
-"""VisPy application
-"""
-CONFIG['VISPY_APP'] = visapp.application.Application()
-
 
 def use_app(backend_name):
     """Use a specific backend."""
+    from vispy import app as visapp
     CONFIG['VISPY_APP'] = visapp.application.Application(backend_name)
 
 
@@ -9,6 +9,7 @@ from .read_data import *  # noqa
 from .read_sleep import *  # noqa
 from .rw_config import *  # noqa
 from .rw_hypno import *  # noqa
+from .rw_session import *  # noqa
 from .rw_utils import *  # noqa
 from .write_data import *  # noqa
 from .write_image import *  # noqa
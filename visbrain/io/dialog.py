@@ -3,7 +3,6 @@
 * dialog_save : Open a window to save a file
 * dialog_load : Open a window to load a file
 """
-from PyQt5.QtWidgets import QFileDialog, QColorDialog
 import os
 
 from .rw_utils import safety_save
@@ -32,6 +31,7 @@ def dialog_save(self, name='Save file', default='file',
     filename : string
         Filename for saving.
     """
+    from PyQt5.QtWidgets import QFileDialog
     # Build all extensions :
     if isinstance(allext, (list, tuple)):
         allext = ';;'.join(allext)
@@ -64,6 +64,7 @@ def dialog_load(self, name='Open file', default='file',
     filename : string
         Filename for opening.
     """
+    from PyQt5.QtWidgets import QFileDialog
     # Open the window :
     file, _ = QFileDialog.getOpenFileName(self, name, default, allext)
     return str(file)
@@ -71,4 +72,5 @@ def dialog_load(self, name='Open file', default='file',
 
 def dialog_color():
     """Open a QColorDialog window."""
+    from PyQt5.QtWidgets import QColorDialog
     return QColorDialog.getColor().name()
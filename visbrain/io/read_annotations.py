@@ -2,7 +2,7 @@
 import numpy as np
 from .dependencies import is_mne_installed
 
-__all__ = ['annotations_to_array', 'merge_annotations']
+__all__ = ['annotations_to_array', 'merge_annotations', 'AnnotationStore']
 
 
 def annotations_to_array(annotations, default_txt='enter annotations'):
@@ -69,12 +69,234 @@ def merge_annotations(*args):
     text : array_like
         Array of text.
     """
-    start = end = text = np.array([])
-    for k in args:
-        # Convert annotations :
-        start_t, end_t, text_t = annotations_to_array(k)
-        # Extend start, end and text :
-        start = np.append(start, start_t)
-        end = np.append(end, end_t)
-        text = np.append(text, text_t)
-    return start, end, text
+    if not args:
+        return np.array([]), np.array([]), np.array([], dtype=str)
+    # Convert annotations and concatenate them once :
+    start, end, text = zip(*[annotations_to_array(k) for k in args])
+    text = [np.asarray(k, dtype=str) for k in text]
+    return np.concatenate(start), np.concatenate(end), np.concatenate(text)
+
+
+class AnnotationStore(object):
+    """Annotations sorted by starting time.
+
+    Annotations are stored in a structured array of (start, end, text id)
+    sorted by starting time and texts are interned in a table. Annotations
+    overlapping a time window are found with a binary search over starting
+    times and over the running maximum of ending times.
+
+    Parameters
+    ----------
+    args : string, array_like, mne.io.annotations.Annotations
+        Annotation file / array / MNE instance to merge (see merge).
+    """
+
+    dtype = np.dtype([('start', float), ('end', float), ('text', np.int32)])
+
+    def __init__(self, *args):
+        """Init."""
+        self._data = np.zeros((0,), dtype=self.dtype)
+        self._texts, self._ids = [], {}
+        self._cache = {}
+        self.merge(*args)
+
+    def __len__(self):
+        """Get the number of annotations."""
+        return len(self._data)
+
+    def __repr__(self):
+        """Representation of the store."""
+        return "AnnotationStore(n_annotations=%i, n_texts=%i)" % (
+            len(self), len(self._texts))
+
+    # ----------------------------- ARRAYS -----------------------------
+    def _cached(self, name, fcn):
+        """Get an array computed once per modification of annotations."""
+        if name not in self._cache:
+            self._cache[name] = fcn()
+        return self._cache[name]
+
+    @property
+    def start(self):
+        """Get the starting time of annotations."""
+        return self._data['start']
+
+    @property
+    def end(self):
+        """Get the ending time of annotations."""
+        return self._data['end']
+
+    @property
+    def text(self):
+        """Get the text of annotations."""
+        return self._cached('text', lambda: np.array(
+            self._texts, dtype=str)[self._data['text']] if len(
+                self._texts) else np.array([], dtype=str))
+
+    @property
+    def middle(self):
+        """Get the middle time of annotations."""
+        return self._cached('middle', lambda: (self.start + self.end) / 2.)
+
+    @property
+    def max_end(self):
+        """Get the running maximum of ending times."""
+        return self._cached('max_end', lambda: np.maximum.accumulate(
+            self.end) if len(self) else self.end.copy())
+
+    def to_array(self):
+        """Get annotations as arrays.
+
+        Returns
+        -------
+        start : array_like
+            First array of float.
+        end : array_like
+            Second array of float.
+        text : array_like
+            Array of text.
+        """
+        return self.start.copy(), self.end.copy(), self.text
+
+    # ----------------------------- EDITION -----------------------------
+    def _intern(self, text):
+        """Get the id of texts (new texts are added to the table)."""
+        uniq, inv = np.unique(np.asarray(text, dtype=str),
+                              return_inverse=True)
+        for k in uniq:
+            if k not in self._ids:
+                self._ids[k] = len(self._texts)
+                self._texts.append(str(k))
+        ids = np.array([self._ids[k] for k in uniq], dtype=np.int32)
+        return ids[inv]
+
+    def _insert(self, start, end, text):
+        """Insert annotations and get their row."""
+        new = np.zeros((len(start),), dtype=self.dtype)
+        new['start'], new['end'] = start, end
+        new['text'] = self._intern(text)
+        new = new[np.argsort(new['start'], kind='mergesort')]
+        # Merge new annotations after old ones with the same start :
+        rows = np.searchsorted(self.start, new['start'], side='right')
+        self._data = np.insert(self._data, rows, new)
+        self._cache.clear()
+        return rows + np.arange(len(new))
+
+    def merge(self, *args):
+        """Merge annotations.
+
+        Parameters
+        ----------
+        args : string, array_like, mne.io.annotations.Annotations
+            Annotation file / array / MNE instance (see
+            annotations_to_array).
+
+        Returns
+        -------
+        rows : array_like
+            Rows of merged annotations.
+        """
+        if not args:
+            return np.array([], dtype=int)
+        return self._insert(*merge_annotations(*args))
+
+    def add(self, start, end=None, text='enter annotations'):
+        """Add a single annotation.
+
+        Parameters
+        ----------
+        start : float
+            Starting time.
+        end : float | None
+            Ending time. If None, the starting time is used.
+        text : string | 'enter annotations'
+            Text of the annotation.
+
+        Returns
+        -------
+        row : int
+            Row of the annotation.
+        """
+        end = start if end is None else end
+        return int(self._insert([float(start)], [float(end)], [text])[0])
+
+    def set_text(self, row, text):
+        """Set the text of an annotation.
+
+        Parameters
+        ----------
+        row : int
+            Row of the annotation.
+        text : string
+            New text.
+        """
+        self._data['text'][row] = self._intern([text])[0]
+        self._cache.pop('text', None)
+
+    def remove(self, rows):
+        """Remove annotations.
+
+        Parameters
+        ----------
+        rows : int | array_like | slice
+            Rows of annotations to remove.
+        """
+        self._data = np.delete(self._data, rows)
+        self._cache.clear()
+
+    def remove_range(self, tmin, tmax):
+        """Remove annotations starting in [tmin, tmax[.
+
+        Parameters
+        ----------
+        tmin, tmax : float
+            Time window.
+
+        Returns
+        -------
+        n : int
+            Number of removed annotations.
+        """
+        sl = slice(*np.searchsorted(self.start, [tmin, tmax], side='left'))
+        self.remove(sl)
+        return sl.stop - sl.start
+
+    # ----------------------------- QUERIES -----------------------------
+    def query(self, tmin, tmax):
+        """Get annotations overlapping a time window.
+
+        Parameters
+        ----------
+        tmin, tmax : float
+            Time window (bounds included).
+
+        Returns
+        -------
+        rows : array_like
+            Sorted rows of annotations.
+        """
+        # Annotations starting after tmax or ending before tmin are skipped :
+        stop = np.searchsorted(self.start, tmax, side='right')
+        start = np.searchsorted(self.max_end, tmin, side='left')
+        return start + np.flatnonzero(self.end[start:stop] >= tmin)
+
+    def find(self, t, direction=1):
+        """Find the next or previous annotation.
+
+        Parameters
+        ----------
+        t : float
+            Reference time.
+        direction : {1, -1}
+            Find the first annotation starting after t (1) or the last
+            annotation starting before t (-1).
+
+        Returns
+        -------
+        row : int
+            Row of the annotation (-1 if there's none).
+        """
+        if direction > 0:
+            row = np.searchsorted(self.start, t, side='right')
+            return int(row) if row < len(self) else -1
+        return int(np.searchsorted(self.start, t, side='left')) - 1
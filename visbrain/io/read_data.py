@@ -12,7 +12,6 @@ This file contain functions to load :
 import numpy as np
 # import os
 
-from ..utils.transform import array_to_stt
 from .dependencies import is_nibabel_installed
 
 __all__ = ('read_mat', 'read_pickle', 'read_npy', 'read_npz',
@@ -86,6 +85,7 @@ def read_nifti(path, hdr_as_array=False):
     if hdr_as_array:
         transform = affine
     else:
+        from ..utils.transform import array_to_stt
         transform = array_to_stt(affine)
 
     return vol, img.header, transform
@@ -16,10 +16,13 @@ import logging
 
 from .rw_utils import get_file_ext
 from .rw_hypno import (read_hypno, oversample_hypno)
+from .rw_session import SessionCache
 from .dialog import dialog_load
 from .mneio import mne_switch
 from .dependencies import is_mne_installed
-from ..utils import get_dsf, vispy_array
+from ..utils import (get_dsf, vispy_array, TRACER, is_lazy_array,
+                     iter_chunks, as_float32)
+from ..utils.memory import CHUNK_BYTES
 from ..io import merge_annotations
 from ..config import PROFILER
 
@@ -32,8 +35,9 @@ class ReadSleepData(object):
     """Main class for reading sleep data."""
 
     def __init__(self, data, channels, sf, hypno, href, preload, use_mne,
-                 downsample, kwargs_mne, annotations):
+                 downsample, kwargs_mne, annotations, cache=False):
         """Init."""
+        self._cache, from_cache = None, False
         # ========================== LOAD DATA ==========================
         # Dialog window if data is None :
         if data is None:
@@ -59,14 +63,28 @@ class ReadSleepData(object):
             if use_mne:
                 is_mne_installed(raise_error=True)
 
+            # ---------- SESSION CACHE ----------
+            if cache:
+                folder = cache if isinstance(cache, str) else None
+                self._cache = SessionCache(
+                    data, folder, downsample=downsample, use_mne=use_mne,
+                    preload=preload, kwargs_mne=kwargs_mne)
+                from_cache = 'data' in self._cache
+
             # ---------- LOAD THE FILE ----------
-            if use_mne:  # Load using MNE functions
-                logger.debug("Load file using MNE-python")
-                kwargs_mne['preload'] = preload
-                args = mne_switch(file, ext, downsample, **kwargs_mne)
-            else:  # Load using Sleep functions
-                logger.debug("Load file using Sleep")
-                args = sleep_switch(file, ext, downsample)
+            with TRACER.span('io.read_sleep', file=file + ext,
+                             use_mne=use_mne, cache=from_cache) as sp:
+                if from_cache:  # Load decimated data from the session cache
+                    logger.debug("Load file from %r" % self._cache)
+                    args = self._load_session()
+                elif use_mne:  # Load using MNE functions
+                    logger.debug("Load file using MNE-python")
+                    kwargs_mne['preload'] = preload
+                    args = mne_switch(file, ext, downsample, **kwargs_mne)
+                else:  # Load using Sleep functions
+                    logger.debug("Load file using Sleep")
+                    args = sleep_switch(file, ext, downsample)
+                sp.set(nbytes=args[3].nbytes)
             # Get output arguments :
             (sf, downsample, dsf, data, channels, n, offset, annot) = args
             info = ("Data successfully loaded (%s):"
@@ -81,7 +99,8 @@ class ReadSleepData(object):
                                 n_channels))
             PROFILER("Data file loaded", level=1)
 
-        elif isinstance(data, np.ndarray):  # array of data is defined
+        elif isinstance(data, np.ndarray) or is_lazy_array(data):
+            # array of data is defined (or memory-mapped)
             if not isinstance(sf, (int, float)):
                 raise ValueError("When passing raw data, the sampling "
                                  "frequency parameter, sf, must either be an "
@@ -90,7 +109,7 @@ class ReadSleepData(object):
             offset = datetime.time(0, 0, 0)
             dsf, downsample = get_dsf(downsample, sf)
             n = data.shape[1]
-            data = data[:, ::dsf]
+            data = data[:, ::dsf] if dsf > 1 else data
         else:
             raise IOError("The data should either be a string which refer to "
                           "the path of a file or an array of raw data of shape"
@@ -108,8 +127,21 @@ class ReadSleepData(object):
         self._sf = float(downsample) if downsample is not None else float(sf)
 
         # ========================== LOAD HYPNOGRAM ==========================
+        # Edited hypnogram of the session (already down-sampled) :
+        hypno_edited = None
+        if (hypno is None) and (self._cache is not None) and (
+                'hypno-edited' in self._cache):
+            hypno_edited = self._cache.load('hypno-edited')
+            if len(hypno_edited) == len(time):
+                logger.info("Use the hypnogram edited during the last "
+                            "session")
+            else:
+                logger.warning("Hypnogram of the last session ignored "
+                               "(length %i instead of %i)" % (
+                                   len(hypno_edited), len(time)))
+                hypno_edited = None
         # Dialog window for hypnogram :
-        if hypno is None:
+        if (hypno is None) and (hypno_edited is None):
             hypno = dialog_load(self, "Open hypnogram", upath,
                                 "Text file (*.txt);;Elan (*.hyp);;"
                                 "CSV file (*.csv);;EDF+ file(*.edf);"
@@ -122,10 +154,22 @@ class ReadSleepData(object):
                 raise ValueError("Then length of the hypnogram must be the "
                                  "same as raw data")
         if isinstance(hypno, str):  # (*.hyp / *.txt / *.csv)
-            hypno, _ = read_hypno(hypno, time=time, datafile=file)
-            # Oversample then downsample :
-            hypno = oversample_hypno(hypno, self._N)[::dsf]
+            def _read_hypno(path=hypno):
+                with TRACER.span('io.read_hypno', file=path):
+                    hyp, _ = read_hypno(path, time=time, datafile=file)
+                # Oversample then downsample :
+                return oversample_hypno(hyp, self._N)[::dsf]
+            if self._cache is None:
+                hypno = _read_hypno()
+            else:
+                stat = os.stat(hypno)
+                hypno = self._cache.get(
+                    'hypno', _read_hypno, file=os.path.abspath(hypno),
+                    size=stat.st_size, mtime=stat.st_mtime_ns, n=self._N,
+                    dsf=dsf)
             PROFILER("Hypnogram file loaded", level=1)
+        if hypno_edited is not None:
+            hypno = hypno_edited
 
         # ========================== CHECKING ==========================
         # ---------- DATA ----------
@@ -192,21 +236,64 @@ class ReadSleepData(object):
                 hypno = np.zeros((npts,), dtype=np.float32)
 
         # ---------- SCALING ----------
-        # Check amplitude of the data and if necessary apply re-scaling
-        if np.abs(np.ptp(data, 0).mean()) < 0.1:
-            warn("Wrong data amplitude for Sleep software.")
-            data *= 1e6
+        # Check amplitude of the data and if necessary apply re-scaling (the
+        # amplitude is computed by chunks, for memory-mapped data). Data of the
+        # session cache are already scaled :
+        scale = None
+        if not from_cache:
+            ptp = sum(np.ptp(c, 0).sum() for _, c in iter_chunks(data, axis=1))
+            if np.abs(ptp / npts) < 0.1:
+                warn("Wrong data amplitude for Sleep software.")
+                scale = 1e6
 
         # ---------- CONVERSION ----------=
-        # Convert data and hypno to be contiguous and float 32 (for vispy):
-        self._data = vispy_array(data)
+        # Convert data and hypno to be contiguous and float 32 (for vispy).
+        # Float32 memory-mapped data are kept on disk and read by slices :
+        if is_lazy_array(data) and (data.dtype == np.float32) and (
+                scale is None):
+            self._data = data
+        else:
+            self._data = as_float32(data, scale=scale)
+        if (self._cache is not None) and not from_cache:
+            self._save_session(sf, downsample, dsf, channels, self._N, offset,
+                               annot)
         self._hypno = vispy_array(hypno)
         self._time = vispy_array(time)
         self._channels = chanc
         self._href = href
         self._hconv = conv
+        # Key of the data (updated when data are re-referenced) :
+        self._data_key = None
         PROFILER("Check data", level=1)
 
+    def _save_session(self, sf, downsample, dsf, channels, n, offset, annot):
+        """Save the decimated data in the session cache."""
+        with TRACER.span('io.save_session', cache=self._cache.folder):
+            start, end, text = merge_annotations(annot)
+            self._cache.save('annot', (start, end, text.astype(str)))
+            self._cache.save('meta', {
+                'sf': float(sf), 'downsample': downsample, 'dsf': int(dsf),
+                'channels': list(channels), 'n': int(n),
+                'offset': [offset.hour, offset.minute, offset.second]})
+            # Saved last, the data entry flags a complete session :
+            self._cache.save('data', self._data)
+        PROFILER("Session cache saved", level=1)
+
+    def _load_session(self):
+        """Load the decimated data from the session cache.
+
+        Returns
+        -------
+        args : tuple
+            Same outputs as sleep_switch.
+        """
+        meta = self._cache.load('meta')
+        data = self._cache.load('data', mmap_mode='r')
+        annot = np.c_[self._cache.load('annot')]
+        offset = datetime.time(*meta['offset'])
+        return (meta['sf'], meta['downsample'], meta['dsf'], data,
+                meta['channels'], meta['n'], offset, annot)
+
 
 def sleep_switch(file, ext, downsample):
     """Switch between sleep data files.
@@ -258,6 +345,53 @@ def sleep_switch(file, ext, downsample):
         raise ValueError("*" + ext + " files are currently not supported.")
 
 
+def _read_scaled(raw, gain, offset=None, chans=None, dsf=1, max_bytes=None):
+    """Read and scale raw samples by chunks into a float32 array.
+
+    Each chunk is converted in float64, then the offset is removed and the
+    gain applied per channel, before being copied into the output.
+
+    Parameters
+    ----------
+    raw : array_like
+        Raw samples of shape (n_chan, n_times) (e.g a memory-mapped array).
+    gain : array_like
+        Gain of each channel of shape (n_chan,).
+    offset : array_like | None
+        Offset of each channel, removed before applying the gain.
+    chans : slice | array_like | None
+        Channels to read. If None, all channels are read.
+    dsf : int | 1
+        Down-sampling factor.
+    max_bytes : int | None
+        Maximum number of bytes of each float64 chunk. If None, CHUNK_BYTES
+        is used.
+
+    Returns
+    -------
+    data : array_like
+        The scaled data of shape (n_chans, n_times / dsf).
+    """
+    chans = slice(None) if chans is None else chans
+    max_bytes = CHUNK_BYTES if max_bytes is None else max_bytes
+    n_chan, n_times = raw.shape
+    gain = np.asarray(gain, dtype=np.float64)[chans].reshape(-1, 1)
+    if offset is not None:
+        offset = np.asarray(offset, dtype=np.float64)[chans].reshape(-1, 1)
+    data = np.empty((len(gain), len(range(0, n_times, dsf))),
+                    dtype=np.float32)
+    # Chunks are a multiple of dsf to keep the down-sampling phase :
+    step = max(int(max_bytes // (n_chan * 8)) // dsf, 1) * dsf
+    for start in range(0, n_times, step):
+        chunk = np.array(raw[:, start:start + step:dsf], dtype=np.float64)
+        chunk = chunk[chans, :]
+        if offset is not None:
+            chunk -= offset
+        chunk *= gain
+        data[:, start // dsf:start // dsf + chunk.shape[1]] = chunk
+    return data
+
+
 ###############################################################################
 ###############################################################################
 #                               LOAD FILES
@@ -374,16 +508,10 @@ def read_trc(path, downsample):
         day, month, year, hour, minute, sec = read_f(f, 'bbbbbb')
         start_time = datetime.time(hour, minute, sec)
 
-        # Raw data
-        f.seek(data_start_offset, 0)
-        m_raw = np.fromstring(f.read(), dtype='u' + str(nbytes))
-        m_raw = m_raw.reshape((int(m_raw.size / n_chan), n_chan)).transpose()
-
         # Read label / gain
         gain = []
         chan = []
         logical_ground = []
-        data = np.empty(shape=m_raw.shape, dtype=np.float32)
 
         f.seek(176, 0)
         zone_names = ['ORDER', 'LABCOD']
@@ -409,19 +537,25 @@ def read_trc(path, downsample):
             gain = np.append(gain, float(physical_max - physical_min) /
                              float(logical_max - logical_min + 1))
 
-    # Multiply by gain
-    m_raw = m_raw - logical_ground[:, np.newaxis]
-    data = m_raw * gain[:, np.newaxis].astype(np.float32)
+    # Raw data (multiplexed samples, not loaded) :
+    n_samples = (os.path.getsize(path) - data_start_offset) // (n_chan *
+                                                                nbytes)
+    m_raw = np.memmap(path, dtype='u' + str(nbytes), mode='r',
+                      offset=data_start_offset, shape=(n_samples, n_chan)).T
 
     # Get original signal length :
-    n = data.shape[1]
+    n = m_raw.shape[1]
 
     # Get down-sample factor :
     sf = float(sf)
     chan = list(chan)
     dsf, downsample = get_dsf(downsample, sf)
 
-    return sf, downsample, dsf, data[:, ::dsf], chan, n, start_time, None
+    # Remove the logical ground and multiply by gain :
+    data = _read_scaled(m_raw, gain.astype(np.float32), logical_ground,
+                        dsf=dsf)
+
+    return sf, downsample, dsf, data, chan, n, start_time, None
 
 
 def read_bva(path, downsample, read_markers=False):
@@ -535,24 +669,23 @@ def read_bva(path, downsample, read_markers=False):
         else:
             anot = None
 
-    with io.open(data_path, 'rb') as f:
-        raw = f.read()
-        size = int(len(raw) / 2)
-
-        ints = np.ndarray((n_chan, int(size / n_chan)),
-                          dtype='<i2', order='F', buffer=raw)
-
-        data = np.float32(np.diag(resolution)).dot(ints)
+    # Raw data (multiplexed samples, not loaded) :
+    n_samples = os.path.getsize(data_path) // (n_chan * 2)
+    ints = np.memmap(data_path, dtype='<i2', mode='r',
+                     shape=(n_samples, n_chan)).T
 
     # Get original signal length :
-    n = data.shape[1]
+    n = ints.shape[1]
 
     # Get down-sample factor :
     sf = float(sf)
     chan = list(chan)
     dsf, downsample = get_dsf(downsample, sf)
 
-    return sf, downsample, dsf, data[:, ::dsf], chan, n, start_time, anot
+    # Multiply by resolution :
+    data = _read_scaled(ints, resolution.astype(np.float32), dsf=dsf)
+
+    return sf, downsample, dsf, data, chan, n, start_time, anot
 
 
 def read_elan(path, downsample):
@@ -613,7 +746,7 @@ def read_elan(path, downsample):
         start_time = datetime.time(0, 0, 0)
 
     # Channels
-    nb_chan = np.int(ent[9])
+    nb_chan = int(ent[9])
     nb_chan = nb_chan
 
     # Last 2 channels do not contain data
@@ -644,7 +777,7 @@ def read_elan(path, downsample):
     nb_samples = int(nb_bytes / (nb_oct * nb_chan))
 
     m_raw = np.memmap(path, dtype=formread, mode='r',
-                      shape=(nb_chan, nb_samples), order={'F'})
+                      shape=(nb_chan, nb_samples), order='F')
 
     # Get original signal length :
     n = m_raw.shape[1]
@@ -655,7 +788,6 @@ def read_elan(path, downsample):
     dsf, downsample = get_dsf(downsample, sf)
 
     # Multiply by gain :
-    data = m_raw[chan_list, ::dsf] * \
-        gain[chan_list][..., np.newaxis]
+    data = _read_scaled(m_raw, gain, chans=chan_list, dsf=dsf)
 
     return sf, downsample, dsf, data, chan, n, start_time, None
@@ -0,0 +1,227 @@
+"""Read and write on-disk session caches.
+
+A session cache is a sidecar folder of .npy / .npz / .json files. It is keyed
+by the path, size and modification time of a data file, plus the parameters
+used to load it. Entries can be keyed by content (see SessionCache.get).
+"""
+import os
+import json
+import hashlib
+import logging
+
+import numpy as np
+
+from ..utils import is_lazy_array, iter_chunks
+
+logger = logging.getLogger('visbrain')
+
+__all__ = ['SessionCache']
+
+CACHE_VERSION = 1
+
+
+class SessionCache(object):
+    """Sidecar on-disk cache of a session.
+
+    If the key of the cache (file path, size, modification time and loading
+    parameters) does not match the key stored in the folder, every entry is
+    removed.
+
+    Parameters
+    ----------
+    path : string
+        Path to the data file.
+    folder : string | None
+        Folder of the cache. By default, the cache is stored next to the data
+        file, in a folder with the '.vbcache' extension.
+    params : dict
+        Additional loading parameters to include in the key (e.g. the
+        down-sampling frequency).
+    """
+
+    def __init__(self, path, folder=None, **params):
+        """Init."""
+        self.path = os.path.abspath(path)
+        self.folder = self.path + '.vbcache' if folder is None else folder
+        stat = os.stat(self.path)
+        self.key = {'version': CACHE_VERSION, 'path': self.path,
+                    'size': stat.st_size, 'mtime': stat.st_mtime_ns,
+                    'params': self.hash(**params)}
+        self.hits = self.misses = 0
+        os.makedirs(self.folder, exist_ok=True)
+        if self._read_json('key') != self.key:
+            self.clear()
+
+    def __contains__(self, name):
+        """Get if an entry is in the cache."""
+        return self._file(name) is not None
+
+    def __repr__(self):
+        """Representation of the cache."""
+        return "SessionCache(path=%r, folder=%r)" % (self.path, self.folder)
+
+    @staticmethod
+    def hash(*args, **kwargs):
+        """Get a short content hash of parameters.
+
+        Parameters can be nested lists, tuples and dictionaries of NumPy
+        arrays, scipy.sparse matrices or objects with a stable representation.
+
+        Returns
+        -------
+        hash : string
+            The hexadecimal hash.
+        """
+        sha = hashlib.sha1()
+
+        def _update(value):
+            if isinstance(value, np.ndarray):
+                sha.update(repr((value.dtype.str, value.shape)).encode())
+                sha.update(np.ascontiguousarray(value).view(np.uint8))
+            elif hasattr(value, 'tocsr'):  # scipy.sparse
+                value = value.tocsr()
+                for k in (value.shape, value.data, value.indices,
+                          value.indptr):
+                    _update(k)
+            elif isinstance(value, dict):
+                for k in sorted(value.keys(), key=repr):
+                    _update(k)
+                    _update(value[k])
+            elif isinstance(value, (list, tuple)):
+                sha.update(b'(')
+                for k in value:
+                    _update(k)
+                sha.update(b')')
+            else:
+                sha.update(repr(value).encode())
+
+        _update(args)
+        _update(kwargs)
+        return sha.hexdigest()[:16]
+
+    # ----------------------------- FILES -----------------------------
+    def _file(self, name):
+        """Get the file of an entry (None if missing)."""
+        for ext in ('.npy', '.npz', '.json'):
+            file = os.path.join(self.folder, name + ext)
+            if os.path.isfile(file):
+                return file
+        return None
+
+    def _read_json(self, name):
+        """Read a JSON file of the folder."""
+        file = os.path.join(self.folder, name + '.json')
+        try:
+            with open(file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def clear(self):
+        """Remove every entry of the cache."""
+        for file in os.listdir(self.folder):
+            if file.endswith(('.npy', '.npz', '.json', '.tmp')):
+                os.remove(os.path.join(self.folder, file))
+        self._write(os.path.join(self.folder, 'key.json'), self.key)
+        logger.debug("Session cache %s cleared" % self.folder)
+
+    @staticmethod
+    def _write(file, value):
+        """Atomically write a value into a file."""
+        tmp = file + '.tmp'
+        if isinstance(value, dict):
+            with open(tmp, 'w') as f:
+                json.dump(value, f)
+        elif isinstance(value, (tuple, list)):
+            with open(tmp, 'wb') as f:
+                np.savez(f, *value)
+        elif is_lazy_array(value):
+            # Copy lazy arrays by chunks :
+            out = np.lib.format.open_memmap(tmp, mode='w+', dtype=value.dtype,
+                                            shape=value.shape)
+            for sl, chunk in iter_chunks(value, axis=-1):
+                out[sl] = chunk
+            out.flush()
+            del out
+        else:
+            with open(tmp, 'wb') as f:
+                np.save(f, np.asarray(value), allow_pickle=False)
+        os.replace(tmp, file)
+
+    # ----------------------------- ENTRIES -----------------------------
+    def load(self, name, mmap_mode=None):
+        """Load an entry.
+
+        Parameters
+        ----------
+        name : string
+            Name of the entry.
+        mmap_mode : {None, 'r', 'r+', 'c'}
+            Memory-map mode used for array entries.
+
+        Returns
+        -------
+        value : array_like | tuple | dict
+            The entry (None if missing).
+        """
+        file = self._file(name)
+        if file is None:
+            return None
+        elif file.endswith('.json'):
+            return self._read_json(name)
+        elif file.endswith('.npz'):
+            with np.load(file, allow_pickle=False) as arch:
+                return tuple(arch['arr_%i' % k] for k in range(len(arch)))
+        return np.load(file, mmap_mode=mmap_mode, allow_pickle=False)
+
+    def save(self, name, value):
+        """Save an entry.
+
+        Parameters
+        ----------
+        name : string
+            Name of the entry.
+        value : array_like | tuple | dict
+            An array (saved as .npy), a tuple of arrays (saved as .npz) or a
+            JSON serializable dictionary (saved as .json).
+        """
+        ext = {dict: '.json', tuple: '.npz', list: '.npz'}.get(type(value),
+                                                               '.npy')
+        try:
+            old = self._file(name)
+            if (old is not None) and not old.endswith(ext):
+                os.remove(old)
+            self._write(os.path.join(self.folder, name + ext), value)
+        except OSError as e:
+            logger.warning("Session cache entry %r can't be saved (%s)" % (
+                name, e))
+
+    def get(self, name, fcn, mmap_mode=None, **params):
+        """Get an entry keyed by content.
+
+        Parameters
+        ----------
+        name : string
+            Name of the entry.
+        fcn : callable
+            Function called without arguments to compute the entry if it is
+            missing.
+        mmap_mode : {None, 'r', 'r+', 'c'}
+            Memory-map mode used for array entries.
+        params : dict
+            Parameters of the entry (hashed by content, see the hash method).
+
+        Returns
+        -------
+        value : array_like | tuple | dict
+            The cached or computed entry.
+        """
+        entry = '%s-%s' % (name, self.hash(**params)) if params else name
+        if entry in self:
+            self.hits += 1
+            logger.debug("Load %s from the session cache" % entry)
+            return self.load(entry, mmap_mode=mmap_mode)
+        self.misses += 1
+        value = fcn()
+        self.save(entry, value)
+        return value
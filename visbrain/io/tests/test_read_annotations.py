@@ -2,7 +2,7 @@
 import numpy as np
 
 from visbrain.io.read_annotations import (annotations_to_array,
-                                          merge_annotations)
+                                          merge_annotations, AnnotationStore)
 from visbrain.io.write_data import (write_csv, write_txt)
 from visbrain.tests._tests_visbrain import _TestVisbrain
 
@@ -44,3 +44,46 @@ class TestReadAnnotations(_TestVisbrain):
     def test_merge_annotations(self):
         """Test function merge_annotations."""
         merge_annotations(*(None, *self._get_annotation_type()))
+
+    def test_annotation_store(self):
+        """Test class AnnotationStore."""
+        store = AnnotationStore(None, *self._get_annotation_type())
+        start, end, text = merge_annotations(*self._get_annotation_type())
+        assert len(store) == len(start)
+        assert np.all(np.diff(store.start) >= 0)
+        # Merge keeps every (start, end, text) annotation :
+        sort = np.lexsort((text, end, start))
+        s_start, s_end, s_text = store.to_array()
+        s_sort = np.lexsort((s_text, s_end, s_start))
+        np.testing.assert_array_equal(s_start[s_sort], start[sort])
+        np.testing.assert_array_equal(s_end[s_sort], end[sort])
+        np.testing.assert_array_equal(s_text[s_sort], text[sort])
+        assert len(store._texts) == len(np.unique(text))
+
+    def test_annotation_store_edition(self):
+        """Test adding and removing annotations."""
+        store = AnnotationStore(np.c_[[10., 30.], [20., 40.], ['a', 'b']])
+        assert store.add(25., 26., 'c') == 1
+        assert store.add(5.) == 0
+        np.testing.assert_array_equal(store.text, ['enter annotations', 'a',
+                                                   'c', 'b'])
+        store.set_text(1, 'b')
+        assert store.text[1] == 'b'
+        assert store.remove_range(10., 30.) == 2
+        np.testing.assert_array_equal(store.start, [5., 30.])
+        store.remove(0)
+        np.testing.assert_array_equal(store.middle, [35.])
+        assert (store.find(30.) == -1) and (store.find(31., -1) == 0)
+
+    def test_annotation_store_query(self):
+        """Test time-window queries."""
+        rng = np.random.RandomState(0)
+        start = rng.uniform(0., 1000., 5000)
+        end = start + rng.exponential(5., 5000)
+        store = AnnotationStore(np.c_[start, end, ['x'] * 5000])
+        for tmin in rng.uniform(0., 1000., 20):
+            tmax = tmin + rng.uniform(0., 50.)
+            rows = store.query(tmin, tmax)
+            good = (store.start <= tmax) & (store.end >= tmin)
+            np.testing.assert_array_equal(rows, np.flatnonzero(good))
+        assert not AnnotationStore().query(0., 10.).size
@@ -0,0 +1,54 @@
+"""Test functions in read_sleep.py."""
+import os
+
+import numpy as np
+
+from visbrain.io.read_sleep import _read_scaled, read_bva
+from visbrain.io import path_to_tmp
+
+
+class TestReadSleep(object):
+    """Test functions in read_sleep.py."""
+
+    @staticmethod
+    def _write_bva(n_chan=3, n_times=1003):
+        """Write a small BrainVision file."""
+        folder = path_to_tmp(folder='read_sleep')
+        ints = np.random.randint(-3000, 3000, (n_times, n_chan)).astype('<i2')
+        ints.tofile(os.path.join(folder, 'bva.eeg'))
+        res = np.random.rand(n_chan)
+        hdr = ['DataFile=bva.eeg', 'MarkerFile=bva.vmrk',
+               'DataFormat=BINARY', 'DataOrientation=MULTIPLEXED',
+               'NumberOfChannels=%i' % n_chan, 'SamplingInterval=4000',
+               'BinaryFormat=INT_16']
+        hdr += ['Ch%i=C%i,,%r,uV' % (k + 1, k + 1, r) for k, r in enumerate(
+            res)]
+        with open(os.path.join(folder, 'bva.vhdr'), 'w') as f:
+            f.write('\n'.join(hdr) + '\n')
+        with open(os.path.join(folder, 'bva.vmrk'), 'w') as f:
+            f.write('[Marker Infos]\n'
+                    'Mk1=New Segment,,1,1,0,20170101223015000000\n')
+        return os.path.join(folder, 'bva.vhdr'), ints.T, res
+
+    def test_read_scaled(self):
+        """Test function _read_scaled."""
+        raw = np.random.randint(-100, 100, (4, 1001)).astype(np.int16)
+        gain, offset = np.random.rand(4), np.random.rand(4)
+        for dsf in [1, 3]:
+            ref = (raw[[0, 2], ::dsf] - offset[[0, 2], np.newaxis]) * gain[
+                [0, 2], np.newaxis]
+            for max_bytes in [None, 100]:
+                data = _read_scaled(raw, gain, offset, chans=[0, 2],
+                                    dsf=dsf, max_bytes=max_bytes)
+                assert data.dtype == np.float32
+                np.testing.assert_allclose(data, ref, rtol=1e-6)
+
+    def test_read_bva(self):
+        """Test function read_bva."""
+        path, ints, res = self._write_bva()
+        for downsample, dsf in [(None, 1), (50., 5)]:
+            sf, _, _dsf, data, chan, n, _, _ = read_bva(path, downsample)
+            assert (sf == 250.) and (_dsf == dsf) and (n == ints.shape[1])
+            assert chan == ['C1', 'C2', 'C3']
+            ref = ints[:, ::dsf] * res.astype(np.float32)[:, np.newaxis]
+            np.testing.assert_allclose(data, ref, rtol=1e-6)
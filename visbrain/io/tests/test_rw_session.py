@@ -0,0 +1,111 @@
+"""Test functions in rw_session.py."""
+import os
+
+import numpy as np
+
+from visbrain.io import SessionCache, path_to_tmp, ReadSleepData
+from visbrain.io.tests.test_read_sleep import TestReadSleep
+
+
+def _data_file(name='session.dat'):
+    """Create a small data file."""
+    file = os.path.join(path_to_tmp(folder='rw_session'), name)
+    np.random.rand(10).tofile(file)
+    return file
+
+
+class TestRwSession(object):
+    """Test functions in rw_session.py."""
+
+    def test_save_load(self):
+        """Test saving and loading entries."""
+        cache = SessionCache(_data_file())
+        x = np.random.rand(3, 10).astype(np.float32)
+        tup = (np.arange(4), np.array(['a', 'b']))
+        cache.save('x', x)
+        cache.save('tup', tup)
+        cache.save('meta', {'sf': 100., 'channels': ['Cz']})
+        assert ('x' in cache) and ('y' not in cache)
+        np.testing.assert_array_equal(cache.load('x'), x)
+        assert isinstance(cache.load('x', mmap_mode='r'), np.memmap)
+        for k, i in zip(cache.load('tup'), tup):
+            np.testing.assert_array_equal(k, i)
+        assert cache.load('meta') == {'sf': 100., 'channels': ['Cz']}
+        assert cache.load('y') is None
+        cache.clear()
+        assert 'x' not in cache
+
+    def test_get(self):
+        """Test getting entries keyed by content."""
+        cache = SessionCache(_data_file())
+        x = np.random.rand(10)
+        calls = []
+
+        def fcn():
+            calls.append(1)
+            return x * 2.
+        for _ in range(2):
+            np.testing.assert_array_equal(cache.get('y', fcn, x=x), x * 2.)
+        assert (len(calls) == 1) and (cache.hits == 1)
+        cache.get('y', fcn, x=x + 1.)
+        assert (len(calls) == 2) and (cache.misses == 2)
+
+    def test_invalidation(self):
+        """Test invalidation of the cache."""
+        file = _data_file('invalidation.dat')
+        SessionCache(file, downsample=100.).save('x', np.arange(3))
+        assert 'x' in SessionCache(file, downsample=100.)
+        assert 'x' not in SessionCache(file, downsample=200.)
+        # Modified file :
+        cache = SessionCache(file)
+        cache.save('x', np.arange(3))
+        np.random.rand(20).tofile(file)
+        assert 'x' not in SessionCache(file)
+
+    def test_hash(self):
+        """Test function hash."""
+        from scipy.sparse import csr_matrix
+        x = np.random.rand(3, 3)
+        assert SessionCache.hash(x) == SessionCache.hash(x.copy())
+        assert SessionCache.hash(x) != SessionCache.hash(x.astype(np.float32))
+        assert SessionCache.hash(a=1, b=[x]) == SessionCache.hash(b=[x], a=1)
+        assert SessionCache.hash(csr_matrix(x)) == SessionCache.hash(
+            csr_matrix(x.copy()))
+
+    def test_read_sleep_cache(self):
+        """Test reloading sleep data from the session cache."""
+        path = TestReadSleep._write_bva()[0]
+        href = ['art', 'wake', 'rem', 'n1', 'n2', 'n3']
+        reads = []
+        for _ in range(2):
+            read = ReadSleepData.__new__(ReadSleepData)
+            ReadSleepData.__init__(read, path, None, None, np.zeros(1003),
+                                   href, True, False, 50., {}, None,
+                                   cache=True)
+            reads.append(read)
+        first, second = reads
+        assert 'data' in second._cache
+        assert isinstance(second._data, np.memmap)
+        np.testing.assert_array_equal(first._data, second._data)
+        assert first._channels == second._channels
+        assert (first._sf == second._sf) and (first._N == second._N)
+        assert first._toffset == second._toffset
+
+    def test_read_sleep_hypno_edited(self):
+        """Test reloading the hypnogram edited during the last session."""
+        path = TestReadSleep._write_bva()[0]
+        href = ['art', 'wake', 'rem', 'n1', 'n2', 'n3']
+
+        def _read(hypno):
+            read = ReadSleepData.__new__(ReadSleepData)
+            ReadSleepData.__init__(read, path, None, None, hypno, href, True,
+                                   False, 50., {}, None, cache=True)
+            return read
+        first = _read(np.zeros(1003))
+        assert first._dsf > 1
+        # Sleep.closeEvent saves the down-sampled hypnogram :
+        edited = np.random.randint(-1, 5, (first._data.shape[1],))
+        first._cache.save('hypno-edited', edited.astype(np.float32))
+        second = _read(None)
+        np.testing.assert_array_equal(second._hypno, edited)
+        first._cache.clear()
@@ -5,6 +5,8 @@ import pytest
 from visbrain.utils import generate_eeg
 from visbrain.io import (write_fig_hyp, write_fig_spindles,  # noqa
                          write_fig_canvas, write_fig_pyqt)
+from visbrain.io.write_image import (_tile_grid, _render_tiles,
+                                     _write_png_bands, _FrameWriter)
 from visbrain.tests._tests_visbrain import _TestVisbrain
 
 
@@ -39,6 +41,60 @@ class TestWriteImage(_TestVisbrain):
         """Test function write_fig_canvas."""
         pass
 
+    def test_render_tiles(self):
+        """Test rendering a canvas by tiles."""
+        class _FakeCanvas(object):
+            """Canvas rendering pixel coordinates."""
+
+            size = (40, 30)
+
+            def render(self, region, size):
+                x = region[0] + (np.arange(size[0]) + .5) * region[2] / size[0]
+                y = region[1] + (np.arange(size[1]) + .5) * region[3] / size[1]
+                img = np.zeros((size[1], size[0], 4), dtype=np.uint8)
+                img[..., 0] = np.floor(x)[np.newaxis, :]
+                img[..., 1] = np.floor(y)[:, np.newaxis]
+                img[..., 3] = 255
+                return img
+
+        canvas = _FakeCanvas()
+        full = canvas.render((0, 0, 40, 30), (120, 90))
+        # Tiles :
+        tiles = _tile_grid(120, 90, 50)
+        assert len(tiles) == 2 and len(tiles[0]) == 3
+        assert tiles[-1][-1] == (100, 50, 20, 40)
+        bands = list(_render_tiles(canvas, (120, 90), tile_size=50))
+        assert [k.shape[0] for k in bands] == [50, 40]
+        assert np.array_equal(np.concatenate(bands), full)
+        # Region :
+        bands = _render_tiles(canvas, (120, 90), (10, 20, 70, 60), 32)
+        assert np.array_equal(np.concatenate(list(bands)),
+                              full[20:80, 10:80, :])
+        # Write tiles directly into a png :
+        from vispy.io import read_png
+        file = self.to_tmp_dir('tiles.png')
+        _write_png_bands(file, _render_tiles(canvas, (120, 90), tile_size=32),
+                         120, 90)
+        assert np.array_equal(read_png(file), full)
+
+    def test_frame_writer(self):
+        """Test writing frames in a background thread."""
+        from vispy.io import read_png
+        frames = np.random.randint(0, 255, (5, 20, 30, 4)).astype(np.uint8)
+        writer = _FrameWriter(self.to_tmp_dir('frame.png'), (30, 20))
+        for k in frames:
+            writer.write(k)
+        writer.close()
+        assert writer.n_frames == 5
+        for k in range(5):
+            img = read_png(self.to_tmp_dir('frame_%05i.png' % k))
+            assert np.array_equal(img, frames[k])
+        # Errors are raised in the main thread :
+        writer = _FrameWriter(self.to_tmp_dir('frame_%i.png'), (30, 20))
+        writer.write(frames[0, 0:10, ...])
+        with pytest.raises(AssertionError):
+            writer.close()
+
     @pytest.mark.skip('Should be tested inside modules.')
     def test_write_fig_pyqt(self):
         """Test function write_fig_pyqt."""
@@ -6,8 +6,10 @@
 """
 import os
 import logging
+import threading
 import numpy as np
-from ..utils.color import color2vb
+
+from ..utils.profiling import TRACER
 
 logger = logging.getLogger('visbrain')
 
@@ -271,9 +273,127 @@ def write_fig_spindles(data, sf, hypno=None, file=None, start_s=0.,
         plt.show()
 
 
+def _tile_grid(width, height, tile_size):
+    """Split an image into tiles.
+
+    Parameters
+    ----------
+    width, height : int
+        Size of the image.
+    tile_size : int
+        Maximum width and height of a tile.
+
+    Returns
+    -------
+    tiles : list
+        List of rows of tiles. Each tile is a tuple (x, y, w, h).
+    """
+    assert tile_size > 0
+    x = np.arange(0, width, tile_size)
+    y = np.arange(0, height, tile_size)
+    w, h = np.minimum(tile_size, width - x), np.minimum(tile_size, height - y)
+    return [[(int(i), int(j), int(k), int(l)) for i, k in zip(x, w)]
+            for j, l in zip(y, h)]
+
+
+def _max_render_size(canvas, default=4096):
+    """Get the maximum size of an offscreen framebuffer."""
+    from vispy.gloo import gl
+    try:
+        canvas.set_current()
+        return int(gl.glGetParameter(gl.GL_MAX_RENDERBUFFER_SIZE))
+    except Exception:
+        return default
+
+
+def _render_tiles(canvas, size, region=None, tile_size=2048):
+    """Render a canvas, tile by tile, without resizing it.
+
+    Each tile is rendered in an offscreen framebuffer that covers a
+    sub-region of the canvas.
+
+    Parameters
+    ----------
+    canvas : VisPy canvas
+        The vispy canvas to render.
+    size : tuple
+        The (width, height) of the full image.
+    region : tuple | None
+        The region to render (x_start, y_start, width, height), in pixels of
+        the full image.
+    tile_size : int | 2048
+        Maximum width and height of a tile.
+
+    Returns
+    -------
+    bands : generator
+        Generator of horizontal bands of the image of shape
+        (tile_height, width, 4), from top to bottom.
+    """
+    region = (0, 0) + tuple(size) if region is None else region
+    r_x, r_y, r_w, r_h = [int(k) for k in region]
+    # Canvas pixels per image pixels :
+    sx = canvas.size[0] / float(size[0])
+    sy = canvas.size[1] / float(size[1])
+    for row in _tile_grid(r_w, r_h, tile_size):
+        band = np.empty((row[0][3], r_w, 4), dtype=np.uint8)
+        for (x, y, w, h) in row:
+            c_reg = ((r_x + x) * sx, (r_y + y) * sy, w * sx, h * sy)
+            band[:, x:x + w, :] = canvas.render(region=c_reg, size=(w, h))
+        yield band
+
+
+def _write_png_bands(filename, bands, width, height, n_channels=4):
+    """Write a PNG file from horizontal bands of pixels.
+
+    Bands are compressed as soon as they are received so that the full image
+    is never in memory.
+
+    Parameters
+    ----------
+    filename : string
+        Name of the PNG file.
+    bands : iterable
+        Horizontal bands of shape (band_height, width, n_channels) of type
+        uint8.
+    width, height : int
+        Size of the image.
+    n_channels : {3, 4}
+        Number of channels (RGB or RGBA).
+    """
+    import struct
+    import zlib
+
+    def _chunk(f, tag, data):
+        f.write(struct.pack('>I', len(data)) + tag + data)
+        f.write(struct.pack('>I', zlib.crc32(tag + data) & 0xffffffff))
+
+    assert n_channels in [3, 4]
+    color_type = 6 if n_channels == 4 else 2
+    comp = zlib.compressobj()
+    n_rows = 0
+    with open(filename, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n')
+        _chunk(f, b'IHDR', struct.pack('>IIBBBBB', width, height, 8,
+                                       color_type, 0, 0, 0))
+        for band in bands:
+            band = np.asarray(band, dtype=np.uint8)[..., 0:n_channels]
+            assert band.shape[1:] == (width, n_channels)
+            n_rows += band.shape[0]
+            # Each row starts with the filter type (0=None) :
+            raw = np.zeros((band.shape[0], width * n_channels + 1),
+                           dtype=np.uint8)
+            raw[:, 1:] = band.reshape(band.shape[0], -1)
+            _chunk(f, b'IDAT', comp.compress(raw.tobytes()))
+        _chunk(f, b'IDAT', comp.flush())
+        _chunk(f, b'IEND', b'')
+    assert n_rows == height, "Expected %i rows, got %i" % (height, n_rows)
+
+
 def write_fig_canvas(filename, canvas, widget=None, autocrop=False,
                      region=None, print_size=None, unit='centimeter', dpi=300.,
-                     factor=1., bgcolor=None, transparent=False):
+                     factor=1., bgcolor=None, transparent=False,
+                     tile_size=None):
     """Export a canvas as a figure.
 
     Parameters
@@ -306,6 +426,12 @@ def write_fig_canvas(filename, canvas, widget=None, autocrop=False,
         Background color of the canvas.
     transparent : bool | False
         Use transparent background.
+    tile_size : int | None
+        Render the image by tiles of (tile_size, tile_size) pixels, without
+        resizing the canvas. Use it for images larger than what the graphic
+        card can render at once. Tiles are directly written in the file for
+        png images that are not cropped. If None, tiles are only used if the
+        image exceed the maximum framebuffer size.
     """
     from ..utils import piccrop
     from vispy.io import imsave
@@ -368,11 +494,24 @@ def write_fig_canvas(filename, canvas, widget=None, autocrop=False,
         # Note that the min or the max can also be used instead.
         factor = np.mean(print_size * dpi * mult / np.asarray(s_output))
 
-    # Multply the original canvas size :
+    # Size of the exported image :
     if factor is not None:
-        # Get the new width and height :
         new_width = int(b_size[0] * factor)
         new_height = int(b_size[1] * factor)
+    else:
+        new_width, new_height = b_size
+    # Use tiles if the image is too large to be rendered at once :
+    if tile_size is None:
+        max_size = _max_render_size(canvas)
+        if max(new_width, new_height) > max_size:
+            tile_size = max_size
+            logger.info("Image larger than %ipx. Rendered by tiles of "
+                        "(%i, %i)px" % (max_size, max_size, max_size))
+    assert (tile_size is None) or (isinstance(tile_size, int) and
+                                   tile_size > 0)
+
+    # Multply the original canvas size :
+    if (factor is not None) and (tile_size is None):
         # Set it to the canvas, backend and the widget :
         canvas._backend._vispy_set_physical_size(new_width, new_height)
         canvas.size = (new_width, new_height)
@@ -381,29 +520,49 @@ def write_fig_canvas(filename, canvas, widget=None, autocrop=False,
 
     # Background color and transparency :
     if bgcolor is not None:
+        from ..utils.color import color2vb
         canvas.bgcolor = color2vb(bgcolor, alpha=1.)
     if transparent:
         canvas.bgcolor = [0.] * 4
 
     # Render the canvas :
+    ext = os.path.splitext(filename)[1]
     try:
-        img = canvas.render(region=region)
-    except:
+        with TRACER.span('io.render_canvas', size=(new_width, new_height),
+                         tile_size=tile_size):
+            if tile_size is None:
+                img = canvas.render(region=region)
+            else:
+                bands = _render_tiles(canvas, (new_width, new_height), region,
+                                      tile_size)
+                if (ext == '.png') and not autocrop:  # stream tiles to file
+                    px = (new_width, new_height) if region is None else tuple(
+                        int(k) for k in region[2:])
+                    _write_png_bands(filename, bands, *px)
+                    logger.info("Image of size %rpx successfully saved "
+                                "(%s)" % (px, filename))
+                    img = None
+                else:
+                    img = np.concatenate(list(bands), axis=0)
+    except Exception:
+        canvas.bgcolor = backup_bgcolor
         raise ValueError("Can not render the canvas. Try to decrease the "
-                         "resolution")
+                         "resolution or use the tile_size input")
 
-    # Remove alpha for files that are not png or tiff :
-    if os.path.splitext(filename)[1] not in ['.png', '.tiff']:
-        img = img[..., 0:-1]
+    if img is not None:
+        # Remove alpha for files that are not png or tiff :
+        if ext not in ['.png', '.tiff']:
+            img = img[..., 0:-1]
 
-    # Apply auto-cropping to the image :
-    if autocrop:
-        img = piccrop(img)
-        logger.info("Image cropped to closest non-backround pixels")
-    # Save it :
-    imsave(filename, img)
-    px = tuple(img[:, :, 0].T.shape)
-    logger.info("Image of size %rpx successfully saved (%s)" % (px, filename))
+        # Apply auto-cropping to the image :
+        if autocrop:
+            img = piccrop(img)
+            logger.info("Image cropped to closest non-backround pixels")
+        # Save it :
+        imsave(filename, img)
+        px = tuple(img[:, :, 0].T.shape)
+        logger.info("Image of size %rpx successfully saved (%s)" % (
+            px, filename))
 
     # Set to the canvas it's previous size :
     canvas._backend._physical_size = backup_size
@@ -411,6 +570,96 @@ def write_fig_canvas(filename, canvas, widget=None, autocrop=False,
     canvas.bgcolor = backup_bgcolor
 
 
+class _FrameWriter(object):
+    """Write frames of an animation in a background thread.
+
+    Frames are either saved as a sequence of png files or piped to ffmpeg.
+
+    Parameters
+    ----------
+    filename : string
+        For png files, a pattern like 'frame_%04i.png' (if no pattern is
+        provided, the frame number is added before the extension). Other
+        extensions (e.g .mp4, .avi, .gif) are encoded using ffmpeg.
+    size : tuple
+        The (width, height) of the frames.
+    framerate : float | 25.
+        Number of frames per second (ffmpeg only).
+    n_buffers : int | 2
+        Maximum number of frames waiting to be written.
+    ffmpeg : string | 'ffmpeg'
+        Path to the ffmpeg executable.
+    """
+
+    def __init__(self, filename, size, framerate=25., n_buffers=2,
+                 ffmpeg='ffmpeg'):
+        """Init."""
+        import queue
+        assert isinstance(n_buffers, int) and n_buffers >= 1
+        self._size = tuple(int(k) for k in size)
+        name, ext = os.path.splitext(filename)
+        self._proc, self._error, self.n_frames = None, None, 0
+        if ext == '.png':
+            self._pattern = filename if '%' in filename else (
+                name + '_%05i' + ext)
+        else:
+            import subprocess
+            w, h = self._size
+            cmd = [ffmpeg, '-y', '-loglevel', 'error', '-f', 'rawvideo',
+                   '-pix_fmt', 'rgba', '-s', '%ix%i' % (w, h), '-r',
+                   str(framerate), '-i', '-', '-an']
+            if ext != '.gif':
+                # Most codecs require an even size :
+                cmd += ['-pix_fmt', 'yuv420p', '-vf',
+                        'crop=%i:%i:0:0' % (w - w % 2, h - h % 2)]
+            self._proc = subprocess.Popen(cmd + [filename],
+                                          stdin=subprocess.PIPE)
+        self._queue = queue.Queue(maxsize=n_buffers)
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        """Write frames until None is received."""
+        while True:
+            img = self._queue.get()
+            if img is None:
+                break
+            if self._error is not None:  # consume without writing
+                continue
+            try:
+                self._write(img)
+            except Exception as e:
+                self._error = e
+
+    def _write(self, img):
+        """Write a single frame."""
+        assert img.shape[0:2] == self._size[::-1]
+        if self._proc is None:
+            _write_png_bands(self._pattern % self.n_frames, [img],
+                             *self._size, n_channels=img.shape[-1])
+        else:
+            self._proc.stdin.write(np.ascontiguousarray(img).tobytes())
+        self.n_frames += 1
+
+    def write(self, img):
+        """Add a frame of shape (height, width, 4) to the queue."""
+        if self._error is not None:
+            self.close()
+        self._queue.put(img)
+
+    def close(self):
+        """Wait until all frames are written."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._proc is not None:
+            self._proc.stdin.close()
+            self._proc.wait()
+        if self._error is not None:
+            raise self._error
+
+
 def write_fig_pyqt(self, filename):
     """Export a GUI window as a figure.
 
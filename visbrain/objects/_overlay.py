@@ -0,0 +1,157 @@
+"""Stack of colored layers (activations, parcellations) over a mesh."""
+import logging
+
+import numpy as np
+
+logger = logging.getLogger('visbrain')
+
+
+class _OverlayStack(object):
+    """Incremental compositor of sparse overlays.
+
+    Each layer only stores the index of the vertices it touches and the
+    associated RGBA colors. Layers are blended into running accumulators so
+    that adding, removing or toggling a layer only costs the number of
+    vertices touched by this layer.
+
+    Two blend modes are supported :
+
+        * 'mean' : the color of a vertex is the average color of the visible
+          'mean' layers touching it (default for activations)
+        * 'add' : the color is added to the color of the other layers
+
+    Parameters
+    ----------
+    n_vertices : int
+        Number of vertices of the mesh.
+    """
+
+    def __init__(self, n_vertices):
+        """Init."""
+        self._n = n_vertices
+        self._layers, self._order = {}, []
+        self._n_created = 0
+        # Accumulators :
+        self._sum_mean = np.zeros((n_vertices, 4), dtype=np.float32)
+        self._count = np.zeros((n_vertices,), dtype=np.int32)
+        self._sum_add = np.zeros((n_vertices, 4), dtype=np.float32)
+        self._n_add = np.zeros((n_vertices,), dtype=np.int32)
+        # Composited color and mask :
+        self.color = np.ones((n_vertices, 4), dtype=np.float32)
+        self.mask = np.zeros((n_vertices,), dtype=np.float32)
+
+    def __len__(self):
+        """Get the number of layers."""
+        return len(self._order)
+
+    def __iter__(self):
+        """Iterate over layer names."""
+        for k in self._order:
+            yield k
+
+    def __contains__(self, name):
+        """Test if a layer exist."""
+        return name in self._layers
+
+    def add(self, index, color, name=None, blend='mean'):
+        """Add a layer.
+
+        Parameters
+        ----------
+        index : array_like
+            Index of the vertices of shape (n_index,). If an index is
+            repeated, the last color is used.
+        color : array_like
+            RGBA colors of shape (n_index, 4).
+        name : string | None
+            Name of the layer. If None, a default name is used.
+        blend : {'mean', 'add'}
+            Blend mode of the layer.
+
+        Returns
+        -------
+        name : string
+            Name of the layer.
+        """
+        assert blend in ['mean', 'add']
+        index = np.asarray(index, dtype=np.int64).ravel()
+        color = np.asarray(color, dtype=np.float32).reshape(-1, 4)
+        assert len(index) == color.shape[0]
+        # Remove duplicated index (keep the last one, like an assignment) :
+        _, u_idx = np.unique(index[::-1], return_index=True)
+        u_idx = len(index) - 1 - u_idx
+        index, color = index[u_idx], color[u_idx, :]
+        # Layer name :
+        if name is None:
+            name = 'layer_%i' % self._n_created
+        if name in self._layers:
+            logger.warning("Layer %s replaced" % name)
+            self.remove(name)
+        self._n_created += 1
+        self._layers[name] = dict(index=index, color=color, blend=blend,
+                                  visible=True)
+        self._order.append(name)
+        self._accumulate(name, 1)
+        logger.debug("Layer %s added (%i vertices)" % (name, len(index)))
+        return name
+
+    def remove(self, name):
+        """Remove a layer.
+
+        Parameters
+        ----------
+        name : string
+            Name of the layer.
+        """
+        assert name in self._layers, "No layer %s" % name
+        if self._layers[name]['visible']:
+            self._accumulate(name, -1)
+        self._layers.pop(name)
+        self._order.pop(self._order.index(name))
+
+    def set_visible(self, name, visible=True):
+        """Toggle the visibility of a layer.
+
+        Parameters
+        ----------
+        name : string
+            Name of the layer.
+        visible : bool | True
+            Display or hide the layer.
+        """
+        assert name in self._layers, "No layer %s" % name
+        assert isinstance(visible, bool)
+        layer = self._layers[name]
+        if layer['visible'] != visible:
+            layer['visible'] = visible
+            self._accumulate(name, 1 if visible else -1)
+
+    def is_visible(self, name):
+        """Get if a layer is visible."""
+        return self._layers[name]['visible']
+
+    def _accumulate(self, name, sign):
+        """Add (sign=1) or subtract (sign=-1) a layer from accumulators."""
+        layer = self._layers[name]
+        idx, color = layer['index'], layer['color']
+        if layer['blend'] == 'mean':
+            self._sum_mean[idx, :] += sign * color
+            self._count[idx] += sign
+        else:
+            self._sum_add[idx, :] += sign * color
+            self._n_add[idx] += sign
+        self._composite(idx)
+
+    def _composite(self, idx):
+        """Update the color and the mask of a subset of vertices."""
+        count = self._count[idx]
+        touched = (count + self._n_add[idx]) > 0
+        color = self._sum_mean[idx, :] / np.maximum(count, 1)[:, np.newaxis]
+        color += self._sum_add[idx, :]
+        np.clip(color, 0., 1., out=color)
+        color[~touched, :] = 1.
+        # Reset accumulators of untouched vertices (avoid rounding drift) :
+        self._sum_mean[idx[count == 0], :] = 0.
+        self._sum_add[idx[self._n_add[idx] == 0], :] = 0.
+        self.color[idx, :] = color
+        self.mask[idx] = touched
@@ -1,36 +1,77 @@
 """Projection of a source object onto a brain object."""
 import numpy as np
+from scipy.spatial import cKDTree, ConvexHull
 from scipy.spatial.distance import cdist
 
-from ..utils import (normalize, array2colormap, color2vb)
+from ..utils import normalize, color2vb, traced
 
 import logging
 logger = logging.getLogger('visbrain')
 PROJ_STR = "%i sources visibles and not masked used for the %s"
 
 
-def _get_eucl_mask(v, xyz, radius, contribute, xsign):
-    # Compute euclidian distance and get sources under radius :
-    eucl = cdist(v, xyz)
-    eucl = eucl.astype(np.float32, copy=False)
-    mask = eucl <= radius
+def _get_eucl_mask(v, xyz, radius, contribute, xsign, tree=None):
+    """Get the (vertex, source) pairs under radius.
+
+    Parameters
+    ----------
+    v : array_like
+        The vertices of shape (nv, 3).
+    xyz : array_like
+        The source's coordinates of shape (n_sources, 3).
+    radius : float
+        The radius under which pairs are kept.
+    contribute: bool
+        Specify if sources contribute on both hemisphere.
+    xsign : array_like
+        Sign of the x coordinate of the sources of shape (1, n_sources).
+    tree : scipy.spatial.cKDTree | None
+        KD-tree of the vertices. If None, the tree is built.
+
+    Returns
+    -------
+    v_idx, s_idx : array_like
+        Index of the vertices and of the sources of each pair.
+    eucl : array_like
+        Euclidian distance of each pair.
+    """
+    # Get sources under radius using KD-trees :
+    tree = cKDTree(v) if tree is None else tree
+    pairs = tree.sparse_distance_matrix(cKDTree(xyz), radius,
+                                        output_type='ndarray')
+    v_idx, s_idx = pairs['i'], pairs['j']
+    eucl = pairs['v'].astype(np.float32, copy=False)
     # Contribute :
     if not contribute:
-        # Get vertices sign :
-        vsign = np.sign(v[:, 0]).reshape(-1, 1)
-        # Find where vsign and xsign are equals :
-        isign = np.logical_and(vsign != xsign, xsign != 0)
-        mask[isign] = False
-    return eucl, mask
+        # Find where vertices and sources sign are not equals :
+        vsign, xs = np.sign(v[v_idx, 0]), xsign.ravel()[s_idx]
+        keep = ~np.logical_and(vsign != xs, xs != 0)
+        v_idx, s_idx, eucl = v_idx[keep], s_idx[keep], eucl[keep]
+    return v_idx, s_idx, eucl
+
+
+def _get_max_distance(v, xyz):
+    """Get the maximum distance between vertices and sources.
+
+    The farthest vertex of a point is on the convex hull of the vertices.
+    """
+    try:
+        v = v[ConvexHull(v).vertices, :]
+    except Exception:  # flat or degenerated mesh
+        pass
+    return cdist(v, xyz).max()
 
 
-def _check_projection(s_obj, v, radius, contribute, not_masked=True):
+def _check_projection(s_obj, v, radius, contribute, not_masked=True,
+                      tree=None):
     # =============== CHECKING ===============
     assert isinstance(v, np.ndarray)
     assert isinstance(radius, (int, float))
     assert isinstance(contribute, bool)
     if v.ndim == 2:  # index faced vertices
         v = v[:, np.newaxis, :]
+    trees = [tree] if (tree is not None) and (v.shape[1] == 1) else [
+        None] * v.shape[1]
 
     # =============== PRE-ALLOCATION ===============
     if not_masked:  # get visible and not masked sources
@@ -41,10 +82,10 @@ def _check_projection(s_obj, v, radius, contribute, not_masked=True):
     # Get sign of the x coordinate :
     xsign = np.sign(xyz[:, 0]).reshape(1, -1)
 
-    return xyz, data, v, xsign
+    return xyz, data, v, xsign, trees
 
 
-def _project_modulation(s_obj, v, radius, contribute=False):
+def _project_modulation(s_obj, v, radius, contribute=False, tree=None):
     """Project source's data onto vertices.
 
     Parameters
@@ -57,6 +98,8 @@ def _project_modulation(s_obj, v, radius, contribute=False):
         The radius under which activity is projected on vertices.
     contribute: bool | False
         Specify if sources contribute on both hemisphere.
+    tree : scipy.spatial.cKDTree | None
+        KD-tree of the (nv, 3) vertices.
 
     Returns
     -------
@@ -66,7 +109,8 @@ def _project_modulation(s_obj, v, radius, contribute=False):
         radius.
     """
     # Check inputs :
-    xyz, data, v, xsign = _check_projection(s_obj, v, radius, contribute)
+    xyz, data, v, xsign, trees = _check_projection(s_obj, v, radius,
+                                                   contribute, tree=tree)
     logger.info(PROJ_STR % (len(data), 'projection'))
     index_faced = v.shape[1]
     # Modulation / proportion / (Min, Max) :
@@ -81,21 +125,22 @@ def _project_modulation(s_obj, v, radius, contribute=False):
     # For each triangle :
     for k in range(index_faced):
         # =============== EUCLIDIAN DISTANCE ===============
-        eucl, mask = _get_eucl_mask(v[:, k, :], xyz, radius, contribute, xsign)
-        # Invert euclidian distance for modulation and mask it :
-        np.multiply(eucl, -1. / eucl.max(), out=eucl)
+        v_idx, s_idx, eucl = _get_eucl_mask(v[:, k, :], xyz, radius,
+                                            contribute, xsign, trees[k])
+        # Invert euclidian distance for modulation :
+        np.multiply(eucl, -1. / _get_max_distance(v[:, k, :], xyz), out=eucl)
         np.add(eucl, 1., out=eucl)
-        eucl = np.ma.masked_array(eucl, mask=np.invert(mask),
-                                  dtype=np.float32)
 
         # =============== MODULATION ===============
         # Modulate data by distance (only for sources under radius) :
-        modulation[:, k] = np.ma.dot(eucl, data, strict=False)
+        modulation.data[:, k] = np.bincount(v_idx, eucl * data[s_idx],
+                                            minlength=v.shape[0])
 
         # =============== PROPORTIONS ===============
-        np.sum(mask, axis=1, dtype=np.float32, out=prop[:, k])
-        nnz = np.nonzero(mask.sum(0))
+        prop[:, k] = np.bincount(v_idx, minlength=v.shape[0])
+        nnz = np.unique(s_idx) if s_idx.size else slice(None)
         minmax[k, :] = np.array([data[nnz].min(), data[nnz].max()])
+    modulation.mask = prop == 0.
 
     # Divide modulations by the number of contributing sources :
     prop[prop == 0.] = 1.
@@ -107,7 +152,7 @@ def _project_modulation(s_obj, v, radius, contribute=False):
     return np.squeeze(modulation)
 
 
-def _project_repartition(s_obj, v, radius, contribute=False):
+def _project_repartition(s_obj, v, radius, contribute=False, tree=None):
     """Project source's repartition onto vertices.
 
     Parameters
@@ -120,6 +165,8 @@ def _project_repartition(s_obj, v, radius, contribute=False):
         The radius under which activity is projected on vertices.
     contribute: bool | False
         Specify if sources contribute on both hemisphere.
+    tree : scipy.spatial.cKDTree | None
+        KD-tree of the (nv, 3) vertices.
 
     Returns
     -------
@@ -129,11 +176,12 @@ def _project_repartition(s_obj, v, radius, contribute=False):
         radius.
     """
     # Check inputs :
-    xyz, _, v, xsign = _check_projection(s_obj, v, radius, contribute)
+    xyz, _, v, xsign, trees = _check_projection(s_obj, v, radius, contribute,
+                                                tree=tree)
     logger.info(PROJ_STR % (xyz.shape[0], 'repartition'))
     index_faced = v.shape[1]
     # Corticale repartition :
-    repartition = np.ma.zeros((v.shape[0], index_faced), dtype=np.int)
+    repartition = np.ma.zeros((v.shape[0], index_faced), dtype=int)
     if not xyz.size:
         logger.warn("Repartition ignored because no sources visibles and "
                     "not masked")
@@ -142,11 +190,12 @@ def _project_repartition(s_obj, v, radius, contribute=False):
     # For each triangle :
     for k in range(index_faced):
         # =============== EUCLIDIAN DISTANCE ===============
-        eucl, mask = _get_eucl_mask(v[:, k, :], xyz, radius, contribute, xsign)
+        v_idx, _, _ = _get_eucl_mask(v[:, k, :], xyz, radius, contribute,
+                                     xsign, trees[k])
 
         # =============== REPARTITION ===============
-        # Sum over sources dimension :
-        sm = np.sum(mask, 1, dtype=np.int)
+        # Number of sources under radius per vertex :
+        sm = np.bincount(v_idx, minlength=v.shape[0])
         smmask = np.invert(sm.astype(bool))
         repartition[:, k] = np.ma.masked_array(sm, mask=smmask)
     s_obj._minmax = (repartition.min(), repartition.max())
@@ -154,7 +203,7 @@ def _project_repartition(s_obj, v, radius, contribute=False):
     return np.squeeze(repartition)
 
 
-def _get_masked_index(s_obj, v, radius, contribute=False):
+def _get_masked_index(s_obj, v, radius, contribute=False, tree=None):
     """Get the index of masked source's under radius.
 
     Parameters
@@ -167,6 +216,8 @@ def _get_masked_index(s_obj, v, radius, contribute=False):
         The radius under which activity is projected on vertices.
     contribute: bool | False
         Specify if sources contribute on both hemisphere.
+    tree : scipy.spatial.cKDTree | None
+        KD-tree of the (nv, 3) vertices.
 
     Returns
     -------
@@ -174,25 +225,26 @@ def _get_masked_index(s_obj, v, radius, contribute=False):
         The repartition of shape (nv, 3) or (nv, 3, 3) if index faced.
     """
     # Check inputs and get masked xyz / data :
-    xyz, data, v, xsign = _check_projection(s_obj, v, radius, contribute,
-                                            False)
+    xyz, data, v, xsign, trees = _check_projection(s_obj, v, radius,
+                                                   contribute, False, tree)
     logger.info("%i sources visibles and masked found" % len(data))
-    # Predefined masked euclidian distance :
+    # Find where there's sources under radius and need to be masked :
     nv, index_faced = v.shape[0], v.shape[1]
-    fmask = np.ones((v.shape[0], index_faced, len(data)), dtype=bool)
+    idx = np.zeros((nv, index_faced), dtype=bool)
+    if not len(data):
+        return np.squeeze(idx)
 
     # For each triangle :
     for k in range(index_faced):
         # =============== EUCLIDIAN DISTANCE ===============
-        _, fmask[:, k, :] = _get_eucl_mask(v[:, k, :], xyz, radius, contribute,
-                                           xsign)
-    # Find where there's sources under radius and need to be masked :
-    m = fmask.reshape(fmask.shape[0] * index_faced, fmask.shape[2])
-    idx = np.dot(m, np.ones((len(data),), dtype=bool))
+        v_idx, _, _ = _get_eucl_mask(v[:, k, :], xyz, radius, contribute,
+                                     xsign, trees[k])
+        idx[v_idx, k] = True
 
-    return np.squeeze(idx.reshape(nv, index_faced))
+    return np.squeeze(idx)
 
 
+@traced('objects.project_sources')
 def _project_sources_data(s_obj, b_obj, project='modulation', radius=10.,
                           contribute=False, cmap='viridis', clim=None,
                           vmin=None, under='black', vmax=None, over='red',
@@ -218,10 +270,11 @@ def _project_sources_data(s_obj, b_obj, project='modulation', radius=10.,
     # Get mesh and vertices :
     mesh = b_obj.mesh
     vertices = mesh._vertices
+    tree = mesh.get_kdtree('both')
     mask = np.zeros((vertices.shape[0]), dtype=np.float32)
 
     # _____________________ GET MODULATION _____________________
-    mod = project_fcn(s_obj, vertices, radius, contribute)
+    mod = project_fcn(s_obj, vertices, radius, contribute, tree)
     # Update mesh color informations :
     b_obj._cbar_data = mod
     b_obj._minmax = (float(mod.min()), float(mod.max()))
@@ -230,7 +283,8 @@ def _project_sources_data(s_obj, b_obj, project='modulation', radius=10.,
         b_obj._clim = b_obj._minmax
     # Get where there's masked sources :
     if s_obj.is_masked:
-        mask_idx = _get_masked_index(s_obj, vertices, radius, contribute)
+        mask_idx = _get_masked_index(s_obj, vertices, radius, contribute,
+                                     tree)
         mask[mask_idx] = 2.
         mesh.mask_color = mask_color
         logger.info("Set masked sources cortical activity to the "
@@ -240,7 +294,8 @@ def _project_sources_data(s_obj, b_obj, project='modulation', radius=10.,
         mask[~mod.mask] = 1.
 
     # _____________________ MODULATION TO COLOR _____________________
+    # The colormap is applied on the GPU :
     mesh.mask = mask
-    mod_color = array2colormap(mod, cmap=cmap, clim=clim, vmin=vmin, vmax=vmax,
-                               under=under, over=over)
-    mesh.color = mod_color
+    mesh.set_scalars(mod)
+    mesh.set_cmap(cmap=cmap, clim=clim, vmin=vmin, vmax=vmax, under=under,
+                  over=over)
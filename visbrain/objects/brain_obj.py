@@ -6,6 +6,7 @@ import logging
 from vispy import scene
 
 from .visbrain_obj import VisbrainObject
+from ._overlay import _OverlayStack
 from ._projection import _project_sources_data
 from ..visuals import BrainMesh
 from ..utils import (mesh_edges, smoothing_matrix, array2colormap,
@@ -17,6 +18,55 @@ from ..io import (download_file, is_nibabel_installed, is_pandas_installed,
 
 logger = logging.getLogger('visbrain')
 
+# Parsed .annot files (see _AnnotFile). Keys are (path, size, mtime) :
+_ANNOT_CACHE = {}
+
+
+class _AnnotFile(object):
+    """Parsed .annot file with lookup tables.
+
+    Parameters
+    ----------
+    id_vert : array_like
+        Row of the color table of each vertex (-1 for no label).
+    color : array_like
+        Color table of shape (n_labels, 4).
+    names : array_like
+        Label names of shape (n_labels,).
+    u_idx : array_like
+        Label id of shape (n_labels,).
+    """
+
+    def __init__(self, id_vert, color, names, u_idx):
+        """Init."""
+        self.id_vert, self.color = id_vert, color
+        self.names, self.u_idx = names, u_idx
+        # Row of each vertex (-1 for vertices without a valid label) :
+        rows = np.asarray(id_vert, dtype=np.int64).copy()
+        rows[(rows < 0) | (rows >= len(u_idx))] = -1
+        self.vert_rows = rows
+        # Label id to row and label name to row lookup tables :
+        self._sorter = np.argsort(u_idx, kind='mergesort')
+        self._sorted_idx = np.asarray(u_idx)[self._sorter]
+        self.name_to_row = {}
+        for k, n in enumerate(names):
+            self.name_to_row.setdefault(n, k)
+
+    def id_to_row(self, ids):
+        """Get the row of label ids (-1 if not found)."""
+        ids = np.asarray(ids).ravel()
+        if not len(self._sorted_idx):
+            return np.full((len(ids),), -1, dtype=np.int64)
+        pos = np.searchsorted(self._sorted_idx, ids)
+        pos = np.clip(pos, 0, len(self._sorted_idx) - 1)
+        found = self._sorted_idx[pos] == ids
+        return np.where(found, self._sorter[pos], -1)
+
+    def name_to_rows(self, names):
+        """Get the row of label names (-1 if not found)."""
+        return np.array([self.name_to_row.get(k, -1) for k in names],
+                        dtype=np.int64)
+
 
 class BrainObj(VisbrainObject):
     """Create a brain object.
@@ -87,8 +137,6 @@ class BrainObj(VisbrainObject):
         self.set_data(name, vertices, faces, normals, lr_index, hemisphere,
                       invert_normals, sulcus)
         self.translucent = translucent
-        self._data_color = []
-        self._data_mask = []
 
     def __len__(self):
         """Get the number of vertices."""
@@ -136,8 +184,7 @@ class BrainObj(VisbrainObject):
         self.hemisphere = 'both'
         self.mask = 0.
         self.rotate('top')
-        self._data_color = []
-        self._data_mask = []
+        self._overlays = _OverlayStack(len(self.mesh))
         logger.info("Brain object %s cleaned." % self.name)
 
     def save(self, tmpfile=False):
@@ -175,6 +222,8 @@ class BrainObj(VisbrainObject):
         else:
             self.mesh.set_data(vertices=vertices, faces=faces, normals=normals,
                                lr_index=lr_index, hemisphere=hemisphere)
+        # Overlays (activations, parcellates) :
+        self._overlays = _OverlayStack(len(self.mesh))
 
     def _search_in_path(self):
         """Specify where to find brain templates."""
@@ -328,10 +377,28 @@ class BrainObj(VisbrainObject):
         _project_sources_data(s_obj, self, project, radius, contribute,
                               mask_color=mask_color, **kw)
 
+    def is_inside(self, xyz, hemisphere=None):
+        """Test if points are inside the brain surface.
+
+        Parameters
+        ----------
+        xyz : array_like
+            Array of coordinates of shape (n_points, 3).
+        hemisphere : {None, 'both', 'left', 'right'}
+            Hemisphere to use. If None, the displayed hemisphere is used.
+
+        Returns
+        -------
+        inside : array_like
+            Boolean array of shape (n_points,).
+        """
+        return self.mesh.is_inside(xyz, hemisphere)
+
     def add_activation(self, data=None, vertices=None, smoothing_steps=20,
                        file=None, hemisphere=None, hide_under=None,
                        n_contours=None, cmap='viridis', clim=None, vmin=None,
-                       vmax=None, under='gray', over='red'):
+                       vmax=None, under='gray', over='red', layer=None,
+                       blend='mean'):
         """Add activation to the brain template.
 
         This method can be used for :
@@ -370,11 +437,20 @@ class BrainObj(VisbrainObject):
             The color to use for values under vmin.
         over : string/tuple/array_like | 'red'
             The color to use for values over vmax.
+        layer : string | None
+            Name of the overlay layer. If None, a default name is used.
+        blend : {'mean', 'add'}
+            Blend mode of the activation with other overlays. Use 'mean' to
+            average colors of overlapping overlays or 'add' to sum them.
+
+        Returns
+        -------
+        layer : string
+            Name of the overlay layer. See `set_overlay_visible` and
+            `remove_overlay` methods.
         """
         col_kw = self._update_cbar_args(cmap, clim, vmin, vmax, under, over)
         is_under = isinstance(hide_under, (int, float))
-        color = np.zeros((len(self.mesh), 4), dtype=np.float32)
-        mask = np.zeros((len(self.mesh),), dtype=float)
         self._default_cblabel = "Activation"
         # ============================= METHOD =============================
         if isinstance(data, np.ndarray):
@@ -401,14 +477,12 @@ class BrainObj(VisbrainObject):
             _, idx = self._hemisphere_from_file(hemisphere, None)
             hemi_idx = np.where(idx)[0]
             # Convert into colormap :
-            smooth_map = array2colormap(sm_data, **col_kw)
-            color = np.ones((len(self.mesh), 4), dtype=np.float32)
-            color[hemi_idx[rows], :] = smooth_map
+            color = array2colormap(sm_data, **col_kw)
+            index = hemi_idx[rows]
             # Mask :
             if is_under:
-                mask[hemi_idx[rows[sm_data >= hide_under]]] = 1.
-            else:
-                mask[:] = 1.
+                keep = sm_data >= hide_under
+                index, color = index[keep], color[keep, :]
         elif isinstance(file, str):
             assert os.path.isfile(file)
             logger.info("Add overlay to the {} brain template "
@@ -428,26 +502,22 @@ class BrainObj(VisbrainObject):
             # Contour :
             sc = self._data_to_contour(sc, clim, n_contours)
             # Convert into colormap :
-            color[idx, :] = array2colormap(sc, **col_kw)
+            color = array2colormap(sc, **col_kw)
+            index = np.where(idx)[0]
             # Mask :
-            mask[idx] = 1.
             if is_under:
-                sub_idx = np.where(idx)[0][sc < hide_under]
-                mask[sub_idx] = 0.
+                keep = sc >= hide_under
+                index, color = index[keep], color[keep, :]
         else:
             raise ValueError("Unknown activation type.")
-        # Build mask color :
-        col_mask = ~np.tile(mask.reshape(-1, 1).astype(bool), (1, 4))
-        # Keep a copy of each overlay color and mask :
-        self._data_color.append(np.ma.masked_array(color, mask=col_mask))
-        self._data_mask.append(mask)
-        # Set color and mask to the mesh :
-        self.mesh.color = np.ma.array(self._data_color).mean(0)
-        self.mesh.mask = np.array(self._data_mask).max(0)
+        # Add the overlay layer and set color and mask to the mesh :
+        layer = self._overlays.add(index, color, name=layer, blend=blend)
+        self._update_overlays()
+        return layer
 
     def parcellize(self, file, select=None, hemisphere=None, data=None,
                    cmap='viridis', clim=None, vmin=None, under='gray',
-                   vmax=None, over='red'):
+                   vmax=None, over='red', layer=None, blend='add'):
         """Parcellize the brain surface using a .annot file.
 
         This method require the nibabel package to be installed.
@@ -475,9 +545,20 @@ class BrainObj(VisbrainObject):
             The color to use for values under vmin.
         over : string/tuple/array_like | 'red'
             The color to use for values over vmax.
+        layer : string | None
+            Name of the overlay layer. If None, a default name is used.
+        blend : {'add', 'mean'}
+            Blend mode of the parcellation with other overlays. Use 'add' to
+            sum colors of overlapping overlays or 'mean' to average them.
+
+        Returns
+        -------
+        layer : string
+            Name of the overlay layer. See `set_overlay_visible` and
+            `remove_overlay` methods.
         """
-        idx, u_colors, labels, u_idx = self._load_annot_file(file)
-        roi_labs = []
+        annot = self._get_annot(file)
+        u_colors, labels = annot.color, annot.names
         # Get the hemisphere and (left // right) boolean index :
         hemisphere, h_idx = self._hemisphere_from_file(hemisphere, file)
         # Select conversion :
@@ -486,69 +567,99 @@ class BrainObj(VisbrainObject):
             select = labels.tolist()
             if 'Unknown' in select:
                 select.pop(select.index('Unknown'))
+        select = np.asarray(select).ravel()
+        if not select.size:
+            raise ValueError("No parcellates found")
         # Manage color if data is an array :
         if isinstance(data, (np.ndarray, list, tuple)):
             data = np.asarray(data)
             assert data.ndim == 1 and len(data) == len(select)
             clim = (data.min(), data.max()) if clim is None else clim
             logger.info("Color inferred from data")
-            u_colors = np.zeros((len(u_idx), 4), dtype=float)
             kw = self._update_cbar_args(cmap, clim, vmin, vmax, under, over)
             data_color = array2colormap(data, **kw)
             self._default_cblabel = "Parcellates data"
         else:
             logger.info("Use default color included in the file")
-            u_colors = u_colors.astype(float) / 255.
-            data_color = None
-        # Build the select variable :
-        if isinstance(select, (np.ndarray, list)):
-            select = np.asarray(select)
-            if select.dtype != int:
-                logger.info('Search parcellates using labels')
-                select_str = select.copy()
-                select, bad_select = [], []
-                for k in select_str:
-                    label_idx = np.where(labels == k)[0]
-                    if label_idx.size:
-                        select.append(u_idx[label_idx])
-                    else:
-                        roi_labs.append('%s (ignored)' % k)
-                        bad_select.append(k)
-                if len(bad_select):
-                    logger.warning("%s ignored. Use `get_parcellates` method "
-                                   "to get the list of available "
-                                   "parcellates" % ', '.join(bad_select))
-                select = np.array(select).ravel()
-        if not select.size:
-            raise ValueError("No parcellates found")
-        # Prepare color variables :
-        color = np.zeros((len(self.mesh), 4))
-        mask = np.zeros((len(self.mesh),))
-        # Set roi color to the mesh :
-        sub_select = np.where(h_idx)[0]  # sub-hemisphere selection
-        no_parcellates = []
-        for i, k in enumerate(select):
-            sub_idx = np.where(u_idx == k)[0][0]  # index location in u_idx
-            if sub_idx:
-                color_index = sub_select[u_idx[idx] == k]
-                if data_color is None:
-                    color[color_index, :] = u_colors[sub_idx, :]
-                else:
-                    color[color_index, :] = data_color[i, :]
-                roi_labs.append(labels[sub_idx])
-                mask[color_index] = 1.
-            else:
-                no_parcellates.append(str(k))
-        if no_parcellates:
+            data_color = u_colors.astype(float) / 255.
+        # Get the row of each selected parcellate in the color table :
+        roi_labs = []
+        if select.dtype.kind in 'iu':
+            rows = annot.id_to_row(select)
+            no_parcellates = select[rows <= 0].astype(str)
+        else:
+            logger.info('Search parcellates using labels')
+            rows = annot.name_to_rows(select)
+            bad_select = select[rows < 0].astype(str).tolist()
+            roi_labs += ['%s (ignored)' % k for k in bad_select]
+            if len(bad_select):
+                logger.warning("%s ignored. Use `get_parcellates` method "
+                               "to get the list of available "
+                               "parcellates" % ', '.join(bad_select))
+            no_parcellates = select[rows == 0].astype(str)
+        if no_parcellates.size:
             logger.warning("No corresponding parcellates for index "
                            "%s" % ', '.join(np.unique(no_parcellates)))
+        # Row lookup tables (selection and color) :
+        is_sel = rows > 0
+        if not is_sel.any():
+            raise ValueError("No parcellates found")
+        row_select = np.zeros((len(labels),), dtype=bool)
+        row_color = np.zeros((len(labels), 4), dtype=np.float32)
+        row_select[rows[is_sel]] = True
+        if isinstance(data, np.ndarray):
+            row_color[rows[is_sel], :] = data_color[is_sel, :]
+        else:
+            row_color[rows[is_sel], :] = data_color[rows[is_sel], :]
+        roi_labs += labels[rows[is_sel]].tolist()
         logger.info("Selected parcellates : %s" % ", ".join(roi_labs))
-        # Keep an eye on data color and mask :
-        self._data_color.append(color)
-        self._data_mask.append(mask)
-        # Set color and mask to the mesh :
-        self.mesh.color = np.array(self._data_color).sum(0)
-        self.mesh.mask = np.array(self._data_mask).sum(0)
+        # Single gather over all of the vertices :
+        sub_select = np.where(h_idx)[0]  # sub-hemisphere selection
+        v_rows = annot.vert_rows
+        if len(v_rows) != len(sub_select):
+            raise ValueError("The number of vertices in the .annot file (%i) "
+                             "doesn't match the number of vertices of the "
+                             "%s hemisphere (%i)" % (len(v_rows), hemisphere,
+                                                     len(sub_select)))
+        is_vert = v_rows >= 0
+        is_vert[is_vert] = row_select[v_rows[is_vert]]
+        index = sub_select[is_vert]
+        color = row_color[v_rows[is_vert], :]
+        # Add the overlay layer and set color and mask to the mesh :
+        layer = self._overlays.add(index, color, name=layer, blend=blend)
+        self._update_overlays()
+        return layer
+
+    def set_overlay_visible(self, layer, visible=True):
+        """Display or hide an overlay layer.
+
+        Parameters
+        ----------
+        layer : string
+            Name of the overlay layer (returned by `add_activation` or
+            `parcellize`).
+        visible : bool | True
+            Display or hide the layer.
+        """
+        self._overlays.set_visible(layer, visible)
+        self._update_overlays()
+
+    def remove_overlay(self, layer):
+        """Remove an overlay layer.
+
+        Parameters
+        ----------
+        layer : string
+            Name of the overlay layer (returned by `add_activation` or
+            `parcellize`).
+        """
+        self._overlays.remove(layer)
+        self._update_overlays()
+
+    def _update_overlays(self):
+        """Send the composited overlays to the mesh."""
+        self.mesh.color = self._overlays.color
+        self.mesh.mask = self._overlays.mask
 
     def get_parcellates(self, file):
         """Get the list of supported parcellates names and index.
@@ -562,7 +673,8 @@ class BrainObj(VisbrainObject):
         """
         is_pandas_installed(raise_error=True)
         import pandas as pd
-        _, color, labels, u_idx = self._load_annot_file(file)
+        annot = self._get_annot(file)
+        color, labels, u_idx = annot.color, annot.names, annot.u_idx
         dico = dict(Index=u_idx, Labels=labels, Color=color.tolist())
         return pd.DataFrame(dico, columns=['Index', 'Labels', 'Color'])
 
@@ -596,6 +708,24 @@ class BrainObj(VisbrainObject):
             idx = np.ones((len(self.mesh),), dtype=bool)
         return hemisphere, idx
 
+    @staticmethod
+    def _get_annot(file):
+        """Get a parsed .annot file.
+
+        Parsed files are cached and only read again if the file changed.
+        """
+        file = os.path.abspath(file)
+        stat = os.stat(file)
+        key = (file, stat.st_size, stat.st_mtime)
+        if key not in _ANNOT_CACHE:
+            for k in [k for k in _ANNOT_CACHE if k[0] == file]:
+                _ANNOT_CACHE.pop(k)  # outdated version of the file
+            args = BrainObj._load_annot_file(file)
+            _ANNOT_CACHE[key] = _AnnotFile(*args)
+        else:
+            logger.debug("Use cached annot file (%s)" % file)
+        return _ANNOT_CACHE[key]
+
     @staticmethod
     def _load_annot_file(file):
         """Load a .annot file."""
@@ -626,7 +756,9 @@ class BrainObj(VisbrainObject):
     ###########################################################################
 
     def _update_cbar(self):
-        if isinstance(self._cbar_data, np.ndarray):
+        if self.mesh._use_cmap:  # colors are computed on the GPU
+            self.mesh.set_cmap(**self.to_kwargs())
+        elif isinstance(self._cbar_data, np.ndarray):
             color = array2colormap(self._cbar_data, **self.to_kwargs())
             self.mesh.color = color
         # else:
@@ -668,6 +800,12 @@ class BrainObj(VisbrainObject):
         """Get the normals value."""
         return self.__hemisphere_correction(self.mesh._normals)
 
+    # ----------- OVERLAYS -----------
+    @property
+    def overlays(self):
+        """Get the list of overlay layers."""
+        return list(self._overlays)
+
     # ----------- HEMISPHERE -----------
     @property
     def hemisphere(self):
@@ -1,12 +1,13 @@
 """Base class for objects of type connectivity."""
 import numpy as np
-from collections import Counter
+from scipy import sparse
 
 from vispy import scene
 from vispy.scene import visuals
 
 from .visbrain_obj import VisbrainObject, CombineObjects
-from ..utils import array2colormap, normalize, color2vb, wrap_properties
+from ..utils import (array2colormap, normalize, color2vb, wrap_properties,
+                     check_lazy_array, is_lazy_array, as_float32)
 
 
 class ConnectObj(VisbrainObject):
@@ -19,7 +20,9 @@ class ConnectObj(VisbrainObject):
     nodes : array_like
         Array of nodes coordinates of shape (n_nodes, 3).
     edges : array_like | None
-        Array of ponderations for edges of shape (n_nodes, n_nodes).
+        Array of ponderations for edges of shape (n_nodes, n_nodes). Can also
+        be a scipy sparse matrix (e.g COO or CSR) in which case only stored
+        values are considered as edges. Only the upper triangle is used.
     select : array_like | None
         Array to select edges to display. This should be an array of boolean
         values of shape (n_nodes, n_nodes).
@@ -54,6 +57,10 @@ class ConnectObj(VisbrainObject):
         VisPy transformation to set to the parent node.
     parent : VisPy.parent | None
         Line object parent.
+    max_edges : int | None
+        Only display the max_edges strongest edges (in absolute value).
+    threshold : float | None
+        Only display edges with an absolute strength over this threshold.
     verbose : string
         Verbosity level.
     _z : float | 10.
@@ -93,30 +100,30 @@ class ConnectObj(VisbrainObject):
                  color_by='strength', custom_colors=None, alpha=1.,
                  antialias=False, dynamic=None, cmap='viridis', clim=None,
                  vmin=None, vmax=None, under='gray', over='red',
-                 transform=None, parent=None, verbose=None, _z=-10., **kw):
+                 transform=None, parent=None, max_edges=None, threshold=None,
+                 verbose=None, _z=-10., **kw):
         """Init."""
         VisbrainObject.__init__(self, name, parent, transform, verbose, **kw)
         self._update_cbar_args(cmap, clim, vmin, vmax, under, over)
 
         # _______________________ CHECKING _______________________
         # Nodes :
-        assert isinstance(nodes, np.ndarray) and nodes.ndim == 2
+        nodes = check_lazy_array(nodes, ndim=[2])
         sh = nodes.shape
         self._n_nodes = sh[0]
         assert sh[1] >= 2
-        pos = nodes if sh[1] == 3 else np.c_[nodes, np.full((len(self),), _z)]
-        self._pos = pos.astype(np.float32)
-        # Edges :
+        pos = as_float32(nodes)
+        pos = pos if sh[1] == 3 else np.c_[pos, np.full((len(self),), _z)]
+        self._pos = pos.astype(np.float32, copy=False)
+        # Edges (memory-mapped edges are loaded) :
+        if is_lazy_array(edges) and not sparse.issparse(edges):
+            edges = np.asarray(edges)
         assert edges.shape == (len(self), len(self))
-        if not np.ma.isMA(edges):
-            mask = np.zeros(edges.shape, dtype=bool)
-            edges = np.ma.masked_array(edges, mask=mask)
-        # Select :
-        if isinstance(select, np.ndarray):
-            assert select.shape == edges.shape and select.dtype == bool
-            edges.mask = np.invert(select)
-        edges.mask[np.tril_indices(len(self), 0)] = True
-        self._edges = edges
+        self._row, self._col, self._values = self._get_edges(edges, select)
+        # Edges sorted by decreasing absolute strength (level of details) :
+        self._order = np.argsort(-np.abs(self._values), kind='stable')
+        self._max_edges, self._threshold = max_edges, threshold
+        self._line_pos = None
         # Colorby :
         assert color_by in ['strength', 'count']
         self._color_by = color_by
@@ -147,21 +154,62 @@ class ConnectObj(VisbrainObject):
         """Update the line."""
         self._connect.update()
 
+    def _get_edges(self, edges, select=None):
+        """Get the (row, col, values) of edges in the upper triangle."""
+        if sparse.issparse(edges):
+            edges = sparse.triu(edges, k=1, format='coo')
+            edges.sum_duplicates()
+            order = np.lexsort((edges.col, edges.row))
+            row, col = edges.row[order], edges.col[order]
+            values = edges.data[order]
+            if select is not None:
+                if sparse.issparse(select):
+                    keep = np.asarray(select.tocsr()[row, col]).ravel()
+                else:
+                    keep = np.asarray(select)[row, col]
+                keep = keep.astype(bool)
+                row, col, values = row[keep], col[keep], values[keep]
+        else:
+            # Masked values and values outside of select are ignored :
+            if isinstance(select, np.ndarray):
+                assert select.shape == edges.shape and select.dtype == bool
+                keep = select.copy()
+            else:
+                keep = ~np.ma.getmaskarray(edges)
+            row, col = np.nonzero(np.triu(keep, k=1))
+            values = np.ma.getdata(edges)[row, col]
+        return row, col, values
+
+    def _get_lod_index(self):
+        """Get the index of the displayed segments (level of details)."""
+        if (self._max_edges is None) and (self._threshold is None):
+            return 'segments'
+        visible = self._order
+        if self._threshold is not None:
+            n_th = np.sum(np.abs(self._values) >= self._threshold)
+            visible = visible[0:n_th]
+        if self._max_edges is not None:
+            visible = visible[0:self._max_edges]
+        visible = np.sort(visible).astype(np.uint32)
+        return np.c_[2 * visible, 2 * visible + 1]
+
     def _build_line(self):
-        """Build the connectivity line."""
-        # Build the line position (consecutive segments):
-        nnz_x, nnz_y = np.where(~self._edges.mask)
-        indices = np.c_[nnz_x, nnz_y].flatten()
-        line_pos = self._pos[indices, :]
+        """Build the connectivity line.
+
+        Positions are only sent once. Then, only colors are updated.
+        """
+        indices = np.c_[self._row, self._col].ravel()
 
         # Color either edges or nodes :
         if self._color_by == 'strength':
-            nnz_values = self._edges.compressed()
-            values = np.c_[nnz_values, nnz_values].flatten()
+            values = np.repeat(self._values, 2)
         elif self._color_by == 'count':
-            node_count = Counter(np.ravel([nnz_x, nnz_y]))
-            values = np.array([node_count[k] for k in indices])
-        self._minmax = (values.min(), values.max())
+            count = np.bincount(indices, minlength=len(self))
+            values = count[indices]
+        if values.size:
+            self._minmax = (values.min(), values.max())
+        else:
+            self._minmax = (0., 1.)
         if self._clim is None:
             self._clim = self._minmax
 
@@ -171,8 +219,16 @@ class ConnectObj(VisbrainObject):
                 color = color2vb(self._custom_colors[None], length=len(values))
             else:  # black by default
                 color = np.zeros((len(values), 4), dtype=np.float32)
-            for val, col in self._custom_colors.items():
-                color[values == val, :] = color2vb(col)
+            keys = [k for k in self._custom_colors.keys() if k is not None]
+            if keys:
+                k_val = np.array(keys, dtype=float)
+                k_col = np.vstack([color2vb(self._custom_colors[k])
+                                   for k in keys])
+                k_sort = np.argsort(k_val)
+                idx = np.searchsorted(k_val[k_sort], values)
+                idx = k_sort[np.clip(idx, 0, len(keys) - 1)]
+                is_key = k_val[idx] == values
+                color[is_key, :] = k_col[idx[is_key], :]
         else:
             color = array2colormap(values, **self.to_kwargs())
         color[:, -1] = self._alpha
@@ -183,7 +239,17 @@ class ConnectObj(VisbrainObject):
                                     tomax=self._dynamic[1])
 
         # Send data to the connectivity object :
-        self._connect.set_data(pos=line_pos, color=color)
+        if self._line_pos is None:
+            self._line_pos = self._pos[indices, :]
+            self._connect.set_data(pos=self._line_pos, color=color,
+                                   connect=self._get_lod_index())
+        else:
+            self._connect.set_data(color=color)
+
+    def _update_lod(self):
+        """Update displayed edges without rebuilding the line."""
+        self._connect.set_data(connect=self._get_lod_index())
+        self.update()
 
     def _get_camera(self):
         """Get the most adapted camera."""
@@ -239,6 +305,32 @@ class ConnectObj(VisbrainObject):
         self._dynamic = value
         self._build_line()
 
+    # ----------- MAX_EDGES -----------
+    @property
+    def max_edges(self):
+        """Get the max_edges value."""
+        return self._max_edges
+
+    @max_edges.setter
+    def max_edges(self, value):
+        """Set max_edges value."""
+        assert (value is None) or (isinstance(value, int) and value >= 0)
+        self._max_edges = value
+        self._update_lod()
+
+    # ----------- THRESHOLD -----------
+    @property
+    def threshold(self):
+        """Get the threshold value."""
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, value):
+        """Set threshold value."""
+        assert (value is None) or isinstance(value, (int, float))
+        self._threshold = value
+        self._update_lod()
+
     # ----------- ALPHA -----------
     @property
     def alpha(self):
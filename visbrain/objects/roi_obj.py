@@ -576,6 +576,24 @@ class RoiObj(_Volume):
             raise ValueError("Cannot project sources because no ROI selected. "
                              "Use the `select_roi` method before.")
 
+    def is_inside(self, xyz):
+        """Test if points are inside the selected ROI.
+
+        Parameters
+        ----------
+        xyz : array_like
+            Array of coordinates of shape (n_points, 3).
+
+        Returns
+        -------
+        inside : array_like
+            Boolean array of shape (n_points,).
+        """
+        if not self:
+            raise ValueError("No ROI selected. Use the `select_roi` method "
+                             "before.")
+        return self.mesh.is_inside(xyz, 'both')
+
     ###########################################################################
     ###########################################################################
     #                                PROPERTIES
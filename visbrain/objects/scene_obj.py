@@ -1,12 +1,14 @@
 """Create a basic scene for objects."""
 import sys
 import logging
+from time import time
 
 import numpy as np
-from vispy import scene
+from vispy import scene, gloo
 
 from ..io import write_fig_canvas
-from ..utils import color2vb, set_log_level, rotate_turntable
+from ..io.write_image import _FrameWriter
+from ..utils import color2vb, set_log_level, rotate_turntable, TRACER
 from ..visuals import CbarVisual
 from ..config import CONFIG, PROFILER
 
@@ -524,7 +526,8 @@ class SceneObj(object):
 
     def screenshot(self, saveas, print_size=None, dpi=300.,
                    unit='centimeter', factor=None, region=None, autocrop=False,
-                   bgcolor=None, transparent=False, line_width=1.):
+                   bgcolor=None, transparent=False, line_width=1.,
+                   tile_size=None):
         """Take a screeshot of the scene.
 
         By default, the rendered canvas will have the size of your screen.
@@ -569,14 +572,101 @@ class SceneObj(object):
         transparent : bool | False
             Specify if the exported figure have to contains a transparent
             background.
+        tile_size : int | None
+            Render the image by tiles of (tile_size, tile_size) pixels. Use it
+            for very large images (e.g posters). If None, tiles are only used
+            if the image is too large to be rendered at once.
         """
         kwargs = dict(print_size=print_size, dpi=dpi, factor=factor,
                       autocrop=autocrop, unit=unit, region=region,
-                      bgcolor=bgcolor, transparent=transparent)
+                      bgcolor=bgcolor, transparent=transparent,
+                      tile_size=tile_size)
         self._gl_uniform_transforms()
         write_fig_canvas(saveas, self.canvas,
                          widget=self.canvas.central_widget, **kwargs)
 
+    def record(self, saveas, camera_states=None, callback=None, n_frames=None,
+               subplot=(0, 0), size=None, framerate=25., n_buffers=2):
+        """Export the frames of an animation.
+
+        A single offscreen framebuffer is used for all of the frames. Pixels
+        are then written by a background thread so that writing a frame
+        overlaps with the rendering of the next one.
+
+        Parameters
+        ----------
+        saveas : str
+            The name of the file(s) to be saved. Use a .png extension to save
+            a sequence of pictures (e.g 'frame_%04i.png') or a movie extension
+            (e.g .mp4, .avi, .gif) to encode the frames using ffmpeg.
+        camera_states : list | None
+            List of camera states (one dict per frame) to apply to the camera
+            of the subplot. For example, use
+            `[dict(azimuth=k) for k in range(0, 360, 2)]` to rotate a brain.
+        callback : callable | None
+            Function called before the rendering of each frame with the index
+            of the frame as an input (e.g to update the data).
+        n_frames : int | None
+            Number of frames to export. By default, the number of camera
+            states is used.
+        subplot : tuple | (0, 0)
+            The (row, col) of the subplot where camera states are applied.
+        size : tuple | None
+            The (width, height) of the frames. By default, the size of the
+            canvas is used.
+        framerate : float | 25.
+            Number of frames per second of the movie.
+        n_buffers : int | 2
+            Number of frames that can be rendered before being written.
+
+        Returns
+        -------
+        fps : float
+            Number of frames exported per second.
+        """
+        if n_frames is None:
+            assert camera_states is not None, ("Use either the camera_states "
+                                               "or n_frames input.")
+            n_frames = len(camera_states)
+        assert (callback is None) or callable(callback)
+        self._gl_uniform_transforms()
+        canvas = self.canvas
+        backup_size = canvas.size
+        if size is not None:
+            canvas.size = tuple(size)
+        w, h = canvas.physical_size
+        camera = self[subplot].camera if camera_states is not None else None
+        writer = _FrameWriter(saveas, (w, h), framerate, n_buffers)
+        # Offscreen framebuffer (physical pixels) used for all of the frames :
+        fbo = gloo.FrameBuffer(color=gloo.RenderBuffer((h, w)),
+                               depth=gloo.RenderBuffer((h, w)))
+        logger.info("Export %i frames of (%i, %i)px" % (n_frames, w, h))
+        t_start = time()
+        try:
+            for k in range(n_frames):
+                if callback is not None:
+                    callback(k)
+                if camera is not None:
+                    camera.set_state(camera_states[k])
+                with TRACER.span('scene.record.frame', frame=k):
+                    canvas.set_current()
+                    canvas.push_fbo(fbo, (0, 0), (w, h))
+                    try:
+                        canvas.context.clear(color=canvas.bgcolor, depth=True)
+                        canvas.draw_visual(canvas.scene)
+                        img = fbo.read()
+                    finally:
+                        canvas.pop_fbo()
+                    writer.write(img)
+        finally:
+            writer.close()
+            fbo.delete()
+            canvas.size = backup_size
+        fps = n_frames / max(time() - t_start, 1e-9)
+        logger.info("%i frames exported in %s (%.1f fps)" % (
+            n_frames, saveas, fps))
+        return fps
+
     def preview(self):
         """Previsualize the result."""
         self._gl_uniform_transforms()
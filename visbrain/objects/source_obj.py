@@ -3,7 +3,7 @@ from warnings import warn
 import logging
 import numpy as np
 from itertools import product
-from scipy.spatial.distance import cdist
+from scipy.spatial import cKDTree
 
 from vispy import scene
 from vispy.scene import visuals
@@ -13,13 +13,35 @@ from .visbrain_obj import VisbrainObject, CombineObjects
 from ._projection import _project_sources_data
 from .roi_obj import RoiObj
 from ..utils import (tal2mni, color2vb, normalize, vispy_array,
-                     wrap_properties, array2colormap)
+                     wrap_properties, array2colormap, check_lazy_array,
+                     as_float32)
 
 
 logger = logging.getLogger('visbrain')
 PROJ_STR = "%i sources visibles and not masked used for the %s"
 
 
+def _get_vertices_tree(v):
+    """Get a KD-tree over vertices.
+
+    Parameters
+    ----------
+    v : array_like | object
+        The vertices of shape (nv, 3) or (nv, 3, 3) if index faced or an
+        object with a mesh (e.g BrainObj, RoiObj).
+
+    Returns
+    -------
+    tree : scipy.spatial.cKDTree
+        The KD-tree of the vertices (vertices are in tree.data).
+    """
+    mesh = getattr(v, 'mesh', None)
+    if hasattr(mesh, 'get_kdtree'):
+        return mesh.get_kdtree()
+    v = np.asarray(getattr(v, 'vertices', v))
+    return cKDTree(v.reshape(-1, 3))
+
+
 class SourceObj(VisbrainObject):
     """Create a source object.
 
@@ -122,10 +144,12 @@ class SourceObj(VisbrainObject):
         VisbrainObject.__init__(self, name, parent, transform, verbose, **kw)
         # _______________________ CHECKING _______________________
         # XYZ :
+        xyz = check_lazy_array(xyz, ndim=[2])
         sh = xyz.shape
         assert sh[1] in [2, 3]
         self._n_sources = sh[0]
-        pos = xyz if sh[1] == 3 else np.c_[xyz, np.full((len(self),), _z)]
+        pos = as_float32(xyz)
+        pos = pos if sh[1] == 3 else np.c_[pos, np.full((len(self),), _z)]
         # Radius min and max :
         assert all([isinstance(k, (int, float)) for k in (
             radius_min, radius_max)])
@@ -135,7 +159,7 @@ class SourceObj(VisbrainObject):
         if data is None:
             data = np.ones((len(self),))
         else:
-            data = np.asarray(data).ravel()
+            data = as_float32(check_lazy_array(data)).ravel()
             assert len(data) == len(self)
         self._data = vispy_array(data)
         # System :
@@ -480,8 +504,11 @@ class SourceObj(VisbrainObject):
             select sources that are closed to the surface (see the distance
             parameter below). Finally, use 'all' (or True), 'none' (or None,
             False) to show or hide all of the sources.
-        v : array_like | None
-            The vertices of shape (nv, 3) or (nv, 3, 3) if index faced.
+        v : array_like | BrainObj | RoiObj | None
+            The vertices of shape (nv, 3) or (nv, 3, 3) if index faced. If a
+            BrainObj or RoiObj is passed, 'inside' and 'outside' use an exact
+            point-in-mesh test. Otherwise, sources are compared with the
+            distance to the origin of the closest vertex.
         distance : float | 5.
             Distance between the source and the surface.
         """
@@ -492,26 +519,20 @@ class SourceObj(VisbrainObject):
         xyz = self._xyz
         if select in ['inside', 'outside', 'close']:
             logger.info("Select sources %s vertices" % select)
-            if v.ndim == 2:  # index faced vertices
-                v = v[:, np.newaxis, :]
-            # Predifined inside :
-            nv, index_faced = v.shape[0], v.shape[1]
-            v = v.reshape(nv * index_faced, 3)
-            inside = np.ones((xyz.shape[0],), dtype=bool)
-
-            # Loop over ALL oh the sources :
-            for i in range(len(self)):
-                # Get the euclidian distance :
-                eucl = cdist(v, xyz[[i], :])
-                # Get the closest vertex :
-                eucl_argmin = eucl.argmin()
+            if (select in ['inside', 'outside']) and hasattr(v, 'is_inside'):
+                # Exact point-in-mesh test :
+                inside = v.is_inside(xyz)
+            else:
+                tree = _get_vertices_tree(v)
+                # Get the closest vertex of each source (using the KD-tree) :
+                _, idx = tree.query(xyz)
                 # Get distance to zero :
-                xyz_t0 = np.sqrt((xyz[[i], :] ** 2).sum())
-                v_t0 = np.sqrt((v[eucl_argmin, :] ** 2).sum())
+                xyz_t0 = np.linalg.norm(xyz, axis=1)
+                v_t0 = np.linalg.norm(tree.data[idx, :], axis=1)
                 if select in ['inside', 'outside']:
-                    inside[i] = xyz_t0 <= v_t0
+                    inside = xyz_t0 <= v_t0
                 elif select == 'close':
-                    inside[i] = np.abs(xyz_t0 - v_t0) > distance
+                    inside = np.abs(xyz_t0 - v_t0) > distance
             self.visible = inside if select == 'inside' else np.invert(inside)
         elif select in ['all', 'none', None, True, False]:
             cond = select in ['all', True]
@@ -529,22 +550,18 @@ class SourceObj(VisbrainObject):
 
         Parameters
         ----------
-        v : array_like
-            The vertices of shape (nv, 3) or (nv, 3, 3) if index faced.
+        v : array_like | BrainObj | RoiObj
+            The vertices of shape (nv, 3) or (nv, 3, 3) if index faced. If an
+            object with a mesh is passed, the cached KD-tree of the mesh is
+            used.
         """
-        if v.ndim == 2:  # index faced vertices
-            v = v[:, np.newaxis, :]
-        # Predifined inside :
-        nv, index_faced = v.shape[0], v.shape[1]
-        v = v.reshape(nv * index_faced, 3)
-        new_pos = np.zeros_like(self._xyz)
-
-        # Loop over visible and not-masked sources :
-        for i, k in enumerate(self):
-            # Get the euclidian distance :
-            eucl = cdist(v, k)
-            # Set new coordinate using the closest vertex :
-            new_pos[i, :] = v[eucl.argmin(), :]
+        tree = _get_vertices_tree(v)
+        new_pos = self._sources._data['a_position'].copy()
+        # Move visible and not-masked sources to the closest vertex :
+        sl = self.visible_and_not_masked
+        if sl.any():
+            _, idx = tree.query(self._xyz[sl, :])
+            new_pos[sl, :] = tree.data[idx, :]
         # Finally update data sources and text :
         self._sources._data['a_position'] = new_pos
         self._sources_text.pos = new_pos
@@ -1,4 +1,5 @@
 """Test BrainObj."""
+import os
 import numpy as np
 
 from visbrain.objects import BrainObj, SourceObj
@@ -97,6 +98,35 @@ class TestBrainObj(_TestObjects):
         b_obj.add_activation(data=data, vertices=vertices, smoothing_steps=5,
                              clim=(13., 22.), hide_under=13., cmap='plasma')
 
+    def test_overlays(self):
+        """Test adding, toggling and removing overlay layers."""
+        b_ov = BrainObj('B1')
+        n = len(b_ov.mesh)
+        v_1, v_2 = np.arange(0, 200), np.arange(100, 300)
+        d_1, d_2 = np.random.rand(200), np.random.rand(200)
+        l_1 = b_ov.add_activation(data=d_1, vertices=v_1, smoothing_steps=None,
+                                  cmap='Reds')
+        l_2 = b_ov.add_activation(data=d_2, vertices=v_2, smoothing_steps=None,
+                                  cmap='Blues', layer='blue')
+        assert b_ov.overlays == [l_1, 'blue']
+        stack = b_ov._overlays
+        assert stack.mask.sum() == 300
+        # Overlapping vertices are averaged :
+        c_1 = stack._layers[l_1]['color']
+        c_2 = stack._layers[l_2]['color']
+        np.testing.assert_allclose(stack.color[150, :],
+                                   (c_1[150, :] + c_2[50, :]) / 2., rtol=1e-5)
+        # Hide then remove the first layer :
+        b_ov.set_overlay_visible(l_1, False)
+        assert stack.mask.sum() == 200
+        np.testing.assert_allclose(stack.color[150, :], c_2[50, :], rtol=1e-5)
+        b_ov.set_overlay_visible(l_1, True)
+        assert stack.mask.sum() == 300
+        b_ov.remove_overlay(l_1)
+        b_ov.remove_overlay('blue')
+        assert not b_ov.overlays and not stack.mask.any()
+        assert stack._sum_mean.shape == (n, 4)
+
     def test_parcellize(self):
         """Test function parcellize."""
         file_1 = self.need_file(NEEDED_FILES['PARCELLATES_1'])
@@ -106,11 +136,59 @@ class TestBrainObj(_TestObjects):
         data = np.arange(len(select))
         b_obj.parcellize(file_2, select=select, data=data, cmap='Spectral_r')
 
+    def test_parcellize_lut(self):
+        """Test parcellize and annotation caching on a synthetic file."""
+        import nibabel
+        from visbrain.io import path_to_tmp
+        b_par = BrainObj('B1')
+        n_left = int(b_par.mesh._lr_index.sum())
+        ctab = np.zeros((4, 5), dtype=np.int32)
+        ctab[:, 0:3] = [[25, 5, 25], [100, 20, 200], [40, 200, 10],
+                        [220, 180, 140]]
+        ctab[:, 4] = ctab[:, 0] + ctab[:, 1] * 2 ** 8 + ctab[:, 2] * 2 ** 16
+        names = [b'unknown', b'insula', b'precentral', b'cuneus']
+        labels = np.random.randint(-1, 4, (n_left,))
+        file = os.path.join(path_to_tmp(folder='annot'), 'lh.test.annot')
+        nibabel.freesurfer.write_annot(file, labels, ctab, names,
+                                       fill_ctab=False)
+        # Parsed file is cached :
+        assert b_par._get_annot(file) is b_par._get_annot(file)
+        # Default colors :
+        sub = np.where(b_par.mesh._lr_index)[0]
+        layer = b_par.parcellize(file, hemisphere='left')
+        index = b_par._overlays._layers[layer]['index']
+        assert np.array_equal(index, sub[labels > 0])
+        # Data-driven colors, selection with names and ids :
+        select = ['cuneus', 'bad_name', 'insula']
+        layer = b_par.parcellize(file, select=select, data=[0., 1., 2.],
+                                 hemisphere='left')
+        index = b_par._overlays._layers[layer]['index']
+        assert np.array_equal(index, sub[np.isin(labels, [1, 3])])
+        layer = b_par.parcellize(file, select=[ctab[2, 4]], hemisphere='left')
+        index = b_par._overlays._layers[layer]['index']
+        assert np.array_equal(index, sub[labels == 2])
+
     def test_projection(self):
         """Test cortical projection and repartition."""
         b_obj.project_sources(s_obj, 'modulation')
         b_obj.project_sources(s_obj, 'repartition')
 
+    def test_cmap_shading(self):
+        """Test coloring scalars using the GPU colormap."""
+        b_sc = BrainObj('B1')
+        b_sc.project_sources(s_obj, 'modulation', cmap='plasma', vmin=.1,
+                             under='gray')
+        assert b_sc.mesh._use_cmap
+        assert b_sc.mesh._cmap_name == ('plasma', 1024)
+        # Updating the colorbar should only update the colormap :
+        b_sc.cmap, b_sc._clim = 'inferno', (0., .5)
+        b_sc._update_cbar()
+        assert b_sc.mesh._cmap_name == ('inferno', 1024)
+        assert b_sc.mesh.shared_program.frag['u_clim'] == (0., .5)
+        # Setting RGBA colors disable the scalar mode :
+        b_sc.mesh.color = np.ones((len(b_sc.mesh), 4), dtype=np.float32)
+        assert not b_sc.mesh._use_cmap
+
     def test_properties(self):
         """Test BrainObj properties (setter and getter)."""
         self._tested_obj = b_obj
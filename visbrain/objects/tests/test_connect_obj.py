@@ -1,5 +1,6 @@
 """Test ConnectObj."""
 import numpy as np
+from scipy import sparse
 
 from visbrain.objects.connect_obj import ConnectObj, CombineConnect
 from visbrain.objects.tests._testing_objects import _TestObjects
@@ -53,6 +54,30 @@ class TestConnectObj(_TestObjects):
         self.assert_and_test('dynamic', (.2, .4))
         self.assert_and_test('alpha', 0.7)
 
+    def test_sparse(self):
+        """Test passing sparse edges."""
+        data = np.ma.getdata(edges).copy()
+        data[np.ma.getmaskarray(edges)] = 0.
+        c_dense = ConnectObj('C3', nodes, data, select=data != 0.)
+        c_sparse = ConnectObj('C3', nodes, sparse.csr_matrix(data))
+        np.testing.assert_array_equal(c_dense._row, c_sparse._row)
+        np.testing.assert_array_equal(c_dense._col, c_sparse._col)
+        np.testing.assert_array_equal(c_dense._values, c_sparse._values)
+
+    def test_lod(self):
+        """Test hiding weak edges."""
+        c = ConnectObj('C4', nodes, edges, max_edges=10)
+        pos = c._line_pos
+        assert c._get_lod_index().shape == (10, 2)
+        c.max_edges = None
+        assert isinstance(c._get_lod_index(), str)
+        c.threshold = 6.
+        idx = c._get_lod_index()[:, 0] // 2
+        assert np.all(np.abs(c._values[idx]) >= 6.)
+        assert len(idx) == np.sum(np.abs(c._values) >= 6.)
+        c.threshold, c.max_edges = None, 3
+        assert c._line_pos is pos
+
 
 class TestCombineConnect(object):
     """Test combine conectivity objects."""
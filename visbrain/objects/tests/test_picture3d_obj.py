@@ -26,6 +26,17 @@ class TestPicture3DObj(_TestObjects):
         """Test function definition."""
         Picture3DObj('P1', pic_data, pic_xyz, select=pic_select)
 
+    def test_geometry(self):
+        """Test the geometry of pictures."""
+        pic = Picture3DObj('P1', pic_data[0:3, 0:4, 0:5], pic_xyz[0:3, :])
+        vis = pic._pic
+        assert vis._faces.shape == (3 * 2 * 3 * 4, 3)
+        assert vis._faces.max() == 3 * 4 * 5 - 1
+        np.testing.assert_allclose(vis._a_offset.min(0), [-.5, -.5])
+        np.testing.assert_allclose(vis._a_offset.max(0), [.5, .5])
+        pic.pic_width = 2.
+        assert vis.shared_program.vert['u_size'] == (2., 7.)
+
     def test_builtin_methods(self):
         """Test function connect_builtin_methods."""
         assert len(p_obj) == n_sources
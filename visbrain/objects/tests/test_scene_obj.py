@@ -105,3 +105,13 @@ class TestSceneObj(_TestVisbrain):
         sc_obj_3d_1.screenshot(self.to_tmp_dir('SceneObj_3d1.png'))
         sc_obj_3d_2.screenshot(self.to_tmp_dir('SceneObj_3d2.png'))
         sc_obj_2d_1.screenshot(self.to_tmp_dir('SceneObj_2d2.png'))
+
+    @pytest.mark.xfail(reason="Failed if display not correctly configured",
+                       run=True, strict=False)
+    def test_record(self):
+        """Test function record."""
+        states = [dict(azimuth=k) for k in range(0, 90, 30)]
+        frames = []
+        sc_obj_3d_1.record(self.to_tmp_dir('SceneObj_%02i.png'),
+                           camera_states=states, callback=frames.append)
+        assert frames == [0, 1, 2]
@@ -112,7 +112,20 @@ class TestSourceObj(_TestObjects):
 
     def test_fit_to_vertices(self):
         """Test function source_fit_to_vertices."""
-        s_obj.fit_to_vertices(vertices_x3)
+        from scipy.spatial.distance import cdist
+        s_fit = SourceObj('S3', s_xyz, mask=s_mask)
+        s_fit.fit_to_vertices(vertices_x3)
+        v = vertices_x3.reshape(-1, 3)
+        closest = v[cdist(s_xyz, v).argmin(1), :]
+        new_pos = s_fit._sources._data['a_position']
+        np.testing.assert_allclose(new_pos[~s_mask, :], closest[~s_mask, :],
+                                   rtol=1e-5)
+        # Masked sources are not moved :
+        np.testing.assert_allclose(new_pos[s_mask, :], s_xyz[s_mask, :],
+                                   rtol=1e-5)
+        # Fit using the cached KD-tree of the mesh :
+        s_fit.fit_to_vertices(b_obj)
+        assert b_obj.mesh.get_kdtree() is b_obj.mesh.get_kdtree()
 
     def test_projection(self):
         """Test function source_projection."""
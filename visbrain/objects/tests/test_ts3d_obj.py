@@ -21,6 +21,29 @@ class TestTimeSeriesObj(_TestObjects):
         """Test function definition."""
         TimeSeries3DObj('TS1', ts_data, ts_xyz)
 
+    def test_memmap(self):
+        """Test passing memory-mapped time-series."""
+        import os
+        from visbrain.io import path_to_tmp
+        file = os.path.join(path_to_tmp(folder='memmap'), 'ts.dat')
+        mm = np.memmap(file, dtype=np.float64, mode='w+', shape=ts_data.shape)
+        mm[:] = ts_data
+        mm.flush()
+        mm = np.memmap(file, dtype=np.float64, mode='r', shape=ts_data.shape)
+        ts_mm = TimeSeries3DObj('TS1', mm, ts_xyz)
+        ts_ref = TimeSeries3DObj('TS1', ts_data, ts_xyz)
+        np.testing.assert_allclose(ts_mm._ts.pos, ts_ref._ts.pos, rtol=1e-5)
+
+    def test_resize(self):
+        """Test that resizing only scales the unit geometry."""
+        ts = TimeSeries3DObj('TS1', ts_data, ts_xyz, ts_amp=6., ts_width=20.)
+        offset = ts._offset
+        ts.ts_amp, ts.ts_width = 3., 10.
+        ts_ref = TimeSeries3DObj('TS1', ts_data, ts_xyz, ts_amp=3.,
+                                 ts_width=10.)
+        assert ts._offset is offset
+        np.testing.assert_allclose(ts._ts.pos, ts_ref._ts.pos, rtol=1e-5)
+
     def test_builtin_methods(self):
         """Test function builtin_methods."""
         assert len(ts_obj) == n_sources
@@ -6,7 +6,8 @@ from vispy.scene import visuals
 import vispy.visuals.transforms as vist
 
 from .visbrain_obj import VisbrainObject, CombineObjects
-from ..utils import normalize, color2vb, wrap_properties
+from ..utils import (color2vb, wrap_properties, check_lazy_array,
+                     chunked_stats, iter_chunks, as_float32)
 
 
 class TimeSeries3DObj(VisbrainObject):
@@ -17,7 +18,8 @@ class TimeSeries3DObj(VisbrainObject):
     name : string
         Name of the time-series object.
     data : array_like
-        Array of time-series of shape (n_sources, n_time_points)
+        Array of time-series of shape (n_sources, n_time_points). Memory-mapped
+        arrays are read by chunks.
     xyz : array_like
         The 3-D center location  of each time-series of shape (n_sources, 3).
     select : array_like | None
@@ -79,14 +81,14 @@ class TimeSeries3DObj(VisbrainObject):
         VisbrainObject.__init__(self, name, parent, transform, verbose, **kw)
         # _______________________ CHECKING _______________________
         # Data :
-        assert isinstance(data, np.ndarray) and data.ndim == 2
+        data = check_lazy_array(data, ndim=[2])
         self._n_nodes, self._n_pts = data.shape
         self._data = data
         # XYZ :
         sh = xyz.shape
         assert sh[1] in [2, 3]
         xyz = xyz if sh[1] == 3 else np.c_[xyz, np.full((len(self),), _z)]
-        self._xyz = xyz.astype(np.float32)
+        self._xyz = as_float32(xyz)
         # Select :
         select = np.arange(len(self)) if select is None else select
         assert isinstance(select, (list, np.ndarray))
@@ -120,22 +122,40 @@ class TimeSeries3DObj(VisbrainObject):
         self._ts.update()
 
     def _build_line(self):
+        """Build the line geometry for a unit width and amplitude."""
         # Get the number of sources :
-        n_nodes = len(self)
-        # Build the position vector :
-        pos = np.zeros((n_nodes, self._n_pts, 3), dtype=np.float32)
-        time = np.linspace(-self._ts_width / 2, self._ts_width / 2,
-                           self._n_pts)
-        data = normalize(self._data, -self._ts_amp / 2, self._ts_amp / 2)
-        for k in range(n_nodes):
-            pos[k, :, 0] = self._xyz[k, 0] + time
-            pos[k, :, 1] = self._xyz[k, 1] + data[k, :]
-            pos[k, :, 2] = self._xyz[k, 2]
-        pos = pos.reshape(n_nodes * self._n_pts, 3)
+        n_nodes, n_pts = len(self), self._n_pts
+        # Time-series offsets to their center (for ts_width=ts_amp=1) :
+        offset = np.zeros((n_nodes, n_pts, 2), dtype=np.float32)
+        offset[..., 0] = np.linspace(-.5, .5, n_pts).reshape(1, -1)
+        # Normalize time-series between (-.5, .5) by chunks :
+        stats = chunked_stats(self._data)
+        d_min, d_max = float(stats['min']), float(stats['max'])
+        if d_max != d_min:
+            coef = 1. / (d_max - d_min)
+            off = .5 - d_max * coef
+        else:  # constant time-series
+            coef, off = (.5 / d_max if d_max else 1.), 0.
+        for sl, c in iter_chunks(self._data, axis=0):
+            offset[sl[0], :, 1] = c * coef + off
+        self._offset = offset.reshape(n_nodes * n_pts, 2)
+        self._center = np.repeat(self._xyz, n_pts, axis=0)
         # Build the connection vector :
-        connect = np.zeros((n_nodes, self._n_pts), dtype=bool)
+        connect = np.zeros((n_nodes, n_pts), dtype=bool)
         connect[self._select, 0:-1] = True  # don't connect last point
-        self._ts.set_data(pos=pos, connect=connect.ravel())
+        self._ts.set_data(pos=self._get_pos(), connect=connect.ravel())
+
+    def _get_pos(self):
+        """Scale the unit geometry by (ts_width, ts_amp)."""
+        pos = self._center.copy()
+        pos[:, 0:2] += self._offset * np.array([self._ts_width, self._ts_amp],
+                                               dtype=np.float32)
+        return pos
+
+    def _update_pos(self):
+        """Update positions only (no data reading, same connections)."""
+        self._ts.set_data(pos=self._get_pos())
+        self.update()
 
     def _get_camera(self):
         """Get the most adapted camera."""
@@ -161,7 +181,7 @@ class TimeSeries3DObj(VisbrainObject):
         """Set ts_width value."""
         assert isinstance(value, (int, float))
         self._ts_width = value
-        self._build_line()
+        self._update_pos()
 
     # ----------- TS_AMP -----------
     @property
@@ -175,7 +195,7 @@ class TimeSeries3DObj(VisbrainObject):
         """Set ts_amp value."""
         assert isinstance(value, (int, float))
         self._ts_amp = value
-        self._build_line()
+        self._update_pos()
 
     # ----------- COLOR -----------
     @property
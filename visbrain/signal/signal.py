@@ -5,7 +5,7 @@ import numpy as np
 from .ui_elements import UiElements, UiInit
 from .visuals import Visuals
 from ..utils import (safely_set_cbox, color2tuple, color2vb, mpl_cmap,
-                     toggle_enable_tab)
+                     toggle_enable_tab, is_lazy_array, chunked_stats)
 from ..io import write_fig_canvas
 from ..pyqt_module import PyQtModule
 # get_screen_size
@@ -26,7 +26,9 @@ class Signal(PyQtModule, UiInit, UiElements, Visuals):
     Parameters
     ----------
     data : array_like
-        Array of data of shape (N,),
+        Array of data of shape (N,), (M, N) or (K, M, N). Memory-mapped
+        arrays (numpy.memmap) and arrays read by slices (e.g h5py datasets)
+        are not loaded in memory : only the displayed signals are read.
     axis : int | -1
         Specify where is located the time axis in data. By default, the last
         axis is considered as the time axis (-1).
@@ -145,14 +147,15 @@ class Signal(PyQtModule, UiInit, UiElements, Visuals):
         # ==================== DATA CHECKING ====================
         if isinstance(data, (list, tuple)):
             data = np.asarray(data)
-        if not isinstance(data, np.ndarray) or (data.ndim > 3):
+        is_array = isinstance(data, np.ndarray) or is_lazy_array(data)
+        if not is_array or (data.ndim > 3):
             raise TypeError("data must be an NumPy array with less than three "
                             "dimensions.")
         if data.ndim == 1 or not self._enable_grid:  # disable grid
             display_grid = self._enable_grid = False
             self.actionGrid.setEnabled(False)
             toggle_enable_tab(self.QuickSettings, 'Grid', False)
-        self._data = data.astype(np.float32, copy=False)
+        self._data = data  # converted to float32 when displayed
         self._axis = axis
 
         # ==================== VISUALS ====================
@@ -258,7 +261,8 @@ class Signal(PyQtModule, UiInit, UiElements, Visuals):
         self._sig_index.setMinimum(0)
         self._sig_index.setMaximum(len(self._signal._navidx) - 1)
         # Fix amplitude limits :
-        d_min, d_max = self._data.min(), self._data.max()
+        stats = chunked_stats(self._data)
+        d_min, d_max = float(stats['min']), float(stats['max'])
         step = (d_max - d_min) / 100.
         n = self._data.shape[self._axis]
         self._sig_amp_min.setMinimum(d_min)
@@ -1,4 +1,5 @@
 """Test Signal module and related methods."""
+import numpy as np
 from vispy.app.canvas import MouseEvent, KeyEvent
 
 from visbrain import Signal
@@ -201,6 +202,31 @@ class TestSignal(_TestVisbrain):
         sig._sig_noverlap.setValue(10)
         sig._fcn_set_signal()
 
+    ###########################################################################
+    #                                 CACHE
+    ###########################################################################
+    def test_cache(self):
+        """Test the cache and prefetching of surrounding signals."""
+        sig._sig_form.setCurrentIndex(3)  # tf
+        sig._fcn_set_signal(force=True)
+        assert sig._signal._prefetcher.wait(timeout=60.)
+        hits = sig._signal._cache.hits
+        sig._fcn_next_index()
+        assert sig._signal._cache.hits == hits + 1
+        sig._fcn_prev_index()
+        assert sig._signal._cache.hits == hits + 2
+
+    def test_cache_new_data(self):
+        """Test that computed signals of previous data are dropped."""
+        sig._fcn_set_signal(force=True)
+        assert sig._signal._prefetcher.wait(timeout=60.)
+        token = sig._signal._data_token
+        sig._data = sig._data.copy()
+        sig._fcn_set_signal(force=True)
+        assert sig._signal._prefetcher.wait(timeout=60.)
+        assert sig._signal._data_token == token + 1
+        assert all(k[0] == token + 1 for k in sig._signal._cache._data)
+
     ###########################################################################
     #                                 TOOLS
     ###########################################################################
@@ -276,3 +302,15 @@ class TestSignal(_TestVisbrain):
         """Test function mouse_double_click for grid."""
         ev = MouseEvent('mouse_double_click', pos=(200, 300))
         sig._grid_canvas.canvas.events.mouse_double_click(ev)
+
+    ###########################################################################
+    #                                 MEMMAP
+    ###########################################################################
+    def test_memmap(self):
+        """Test passing a memory-mapped array."""
+        mm = np.memmap(self.to_tmp_dir('signal.dat'), dtype=np.float64,
+                       mode='w+', shape=data.shape)
+        mm[:] = data
+        sig_mm = Signal(mm, sf=sf, axis=-1, time=time)
+        assert sig_mm._data is mm
+        np.testing.assert_array_equal(mm, data)
@@ -1,16 +1,42 @@
 """Visual object creation."""
+from copy import copy
+from functools import partial
+from itertools import product
+
 import numpy as np
 from scipy.signal import welch
-from itertools import product
 
 from vispy import scene
 import vispy.visuals.transforms as vist
 
 from ..visuals import GridSignal, TFmapsMesh
-from ..utils import color2vb, vispy_array, PrepareData
+from ..utils import (color2vb, PrepareData, LRUCache, Prefetcher,
+                     as_float32)
 
 __all__ = ('Visuals')
 
+# Parameters of set_data each form depends on (used for the cache keys) :
+_FORM_PARAMS = {'psd': ('nperseg', 'noverlap'), 'histogram': ('nbins',),
+                'tf': ('norm', 'baseline', 'window', 'overlap')}
+
+
+def _histogram_mesh(data, nbins):
+    """Get the vertices and faces of an horizontal histogram.
+
+    Same mesh as the one of scene.visuals.Histogram, without building a
+    visual.
+    """
+    raw, xvec = np.histogram(data, nbins)
+    vert = np.zeros((3 * len(xvec) - 2, 3), np.float32)
+    vert[:, 0] = np.repeat(xvec, 3)[1:-1]
+    vert[1::3, 1] = raw
+    vert[2::3, 1] = raw
+    faces = np.zeros((2 * len(xvec) - 2, 3), np.uint32)
+    offsets = 3 * np.arange(len(xvec) - 1, dtype=np.uint32)[:, np.newaxis]
+    faces[::2] = np.array([0, 2, 1]) + offsets
+    faces[1::2] = np.array([2, 0, 3]) + offsets
+    return vert, faces, raw, xvec
+
 
 class SignalAnnotations(object):
     """Add annotations to the signal layout."""
@@ -130,12 +156,17 @@ class SignalVisual(SignalAnnotations):
     line_rendering : {'gl', 'agg'}
         Specify the line rendering method. Use 'gl' for a fast but lower
         quality lines and 'agg', looks better but slower.
+    n_prefetch : int | 2
+        Number of next and previous signals computed in a background thread
+        while the current one is displayed. Use 0 to disable.
+    cache_size : int | 64
+        Maximum number of computed signals kept in memory.
     parent : VisPy.parent | None
         Parent of the mesh.
     """
 
     def __init__(self, time, sf, sh, axis, form='line', line_rendering='gl',
-                 parent=None):
+                 n_prefetch=2, cache_size=64, parent=None):
         """Init."""
         self.form = form
         self._time = time
@@ -144,6 +175,12 @@ class SignalVisual(SignalAnnotations):
         self._index = 0  # selected index of the 3-d array
         self.rect = (0., 0., 1., 1.)
         self._prep = PrepareData(way='filtfilt')
+        # Cache of computed signals (filtered data, PSD, histogram, TF) :
+        self.n_prefetch = n_prefetch
+        self._cache = LRUCache(maxsize=cache_size, max_bytes=256 * 2 ** 20)
+        self._prefetcher = Prefetcher(self._cache)
+        # Token of the data used in cache keys (bumped with new data) :
+        self._data, self._data_token = None, 0
         # Build navigation index :
         if len(sh) in [2, 3]:
             sh = list(sh)
@@ -215,32 +252,29 @@ class SignalVisual(SignalAnnotations):
         self._index = index
         color = color2vb(color)
 
-        # Get data index :
-        if data.ndim == 1:
-            idx = slice(None)
-        elif data.ndim in [2, 3]:
-            idx = list(self._navidx[index])
-            idx.insert(self._axis, slice(None))
+        # Computed signals of previous data are dropped :
+        if data is not self._data:
+            self.clear_cache()
+            self._data, self._data_token = data, self._data_token + 1
 
-        # Convert data to be compatible with VisPy and prepare data :
-        data_c = vispy_array(data[idx]).copy()
-        _data = self._prep._prepare_data(self._sf, data_c, self._time)
+        # Get the prepared data (or PSD, histogram, TF) from the cache :
+        params = dict(nbins=nbins, norm=norm, window=window, overlap=overlap,
+                      baseline=baseline, nperseg=nperseg, noverlap=noverlap)
+        if form != 'butterfly':
+            prep = copy(self._prep)
+            _data = self._cache.get(self._get_key(data, index, form, params),
+                                    partial(self._compute, data, index, form,
+                                            prep, params))
 
         # Set data :
         if form in ['line', 'marker', 'psd', 'butterfly']:  # line and marker
             # Get position array :
-            pos = np.c_[self._time, _data]
+            if form in ['line', 'marker']:
+                pos = np.c_[self._time, _data]
+            elif form == 'psd':
+                pos = _data
             # Send position :
             if form in ['line', 'psd']:
-                if form == 'psd':
-                    fmax = self._sf / 4.
-                    f, pxx = welch(_data, self._sf, nperseg=nperseg,
-                                   noverlap=noverlap)
-                    f_sf4 = abs(f - fmax)
-                    f_1 = abs(f - 1.)
-                    fidx_sf4 = np.where(f_sf4 == f_sf4.min())[0][0]
-                    fidx_1 = np.where(f_1 == f_1.min())[0][0]
-                    pos = np.c_[f[fidx_1:-fidx_sf4], pxx[fidx_1:-fidx_sf4]]
                 # Threshold :
                 is_th = isinstance(th, (tuple, list, np.ndarray))
                 col = color2vb(color, length=pos.shape[0])
@@ -252,8 +286,8 @@ class SignalVisual(SignalAnnotations):
                     self._th.set_data(pos_th, connect='segments',
                                       color=color2vb('#ab4642'))
                     # Build line color :
-                    col = color2vb(color, length=len(_data))
-                    cond = np.logical_or(_data < th[0], _data > th[1])
+                    col = color2vb(color, length=pos.shape[0])
+                    cond = np.logical_or(pos[:, 1] < th[0], pos[:, 1] > th[1])
                     col[cond, :] = color2vb('#ab4642')
                 self._th.visible = is_th
                 self._line.set_data(pos, width=lw, color=col)
@@ -266,7 +300,7 @@ class SignalVisual(SignalAnnotations):
                 # Get soe shape related variables :
                 n, m = len(self._time), int(np.prod(data.shape))
                 n_rep = int(m / n)
-                data = vispy_array(data)
+                data = as_float32(data)
                 # Build position :
                 pos = np.c_[np.tile(self._time.ravel(), n_rep), data.ravel()]
                 # Disconnect some points :
@@ -288,15 +322,9 @@ class SignalVisual(SignalAnnotations):
             self.rect = (t_min, d_min - off, t_max - t_min,
                          d_max - d_min + 2 * off)
         elif form == 'histogram':  # histogram
-            # Compute the mesh :
-            mesh = scene.visuals.Histogram(_data, nbins)
-            # Get the vertices and faces of the mesh :
-            vert = mesh.mesh_data.get_vertices()
-            faces = mesh.mesh_data.get_faces()
+            vert, faces, raw, xvec = _data
             # Pass vertices and faces to the histogram :
             self._hist.set_data(vert, faces, color=color)
-            # Compute the histogram :
-            raw, xvec = np.histogram(_data, nbins)
             # Get camera rectangle :
             t_min, t_max = xvec.min(), xvec.max()
             d_min, d_max = 0.9 * raw[np.nonzero(raw)].min(), 1.01 * raw.max()
@@ -304,9 +332,7 @@ class SignalVisual(SignalAnnotations):
             # Update object :
             self._hist.update()
         elif form == 'tf':  # time-frequency map
-            self._tf.set_data(_data, self._sf, cmap=cmap, contrast=.5,
-                              norm=norm, baseline=baseline, n_window=window,
-                              overlap=overlap, window='hanning', clim=clim)
+            self._tf._set_tf(*_data, cmap=cmap, contrast=.5, clim=clim)
             self._tf.interpolation = interpolation
             self.rect = self._tf.rect
 
@@ -316,6 +342,67 @@ class SignalVisual(SignalAnnotations):
         # Update annotations :
         self.update_annotations(str(self))
 
+        # Compute the surrounding signals in the background :
+        self._prefetch(data, index, form, params)
+
+    def _get_key(self, data, index, form, params):
+        """Get the cache key of a signal."""
+        sub = tuple(params[k] for k in _FORM_PARAMS.get(form, ()))
+        return (self._data_token, index, form, self._prep._get_key()) + sub
+
+    def _compute(self, data, index, form, prep, params):
+        """Compute the prepared data, PSD, histogram or TF of a signal.
+
+        This method doesn't modify any visual and can be called from a
+        background thread.
+        """
+        # Get data index :
+        idx = list(self._navidx[index]) if data.ndim in [2, 3] else []
+        idx.insert(self._axis, slice(None))
+        # Convert data to be compatible with VisPy and prepare data :
+        data_c = np.array(data[tuple(idx)], dtype=np.float32)
+        _data = prep._prepare_data(self._sf, data_c, self._time)
+        if form == 'psd':
+            fmax = self._sf / 4.
+            f, pxx = welch(_data, self._sf, nperseg=params['nperseg'],
+                           noverlap=params['noverlap'])
+            f_sf4 = abs(f - fmax)
+            f_1 = abs(f - 1.)
+            fidx_sf4 = np.where(f_sf4 == f_sf4.min())[0][0]
+            fidx_1 = np.where(f_1 == f_1.min())[0][0]
+            return np.c_[f[fidx_1:-fidx_sf4], pxx[fidx_1:-fidx_sf4]]
+        elif form == 'histogram':
+            return _histogram_mesh(_data, params['nbins'])
+        elif form == 'tf':
+            return self._tf._compute_tf(_data, self._sf, norm=params['norm'],
+                                        baseline=params['baseline'],
+                                        n_window=params['window'],
+                                        overlap=params['overlap'],
+                                        window='hanning')
+        return _data
+
+    def _prefetch(self, data, index, form, params):
+        """Compute the next and previous signals in a background thread."""
+        if not self.n_prefetch or (form == 'butterfly'):
+            self._prefetcher.cancel()
+            return
+        prep, jobs = copy(self._prep), []
+        for k in range(1, self.n_prefetch + 1):
+            for i in [index + k, index - k]:
+                if 0 <= i < len(self._navidx):
+                    key = self._get_key(data, i, form, params)
+                    fcn = partial(self._compute, data, i, form, prep, params)
+                    jobs.append((key, fcn))
+        self._prefetcher.schedule(jobs)
+
+    def clear_cache(self):
+        """Remove computed signals from the cache.
+
+        This method should be called if data are modified inplace.
+        """
+        self._prefetcher.cancel()
+        self._cache.clear()
+
     def update_annotations(self, name):
         """Update annotations."""
         is_annotated = self.is_event_annotated(name)
@@ -1,56 +1,74 @@
 """Enable to annotate a Sleep file."""
 
-from PyQt5 import QtWidgets
-import numpy as np
+from ....utils import ArrayTableModel
 
 
 class UiAnnotate(object):
-    """Interactions with annotations."""
+    """Interactions with annotations.
+
+    Rows of the annotation table follow the rows of the annotation store
+    (sorted by starting time).
+    """
 
     def __init__(self):
         """Init."""
         # Add/remove line :
         self._AnnotateAdd.clicked.connect(self._fcn_annotate_add)
         self._AnnotateRm.clicked.connect(self._fcn_annotate_rm)
-        self._AnnotateTable.itemSelectionChanged.connect(
+        # Table model :
+        self._annotModel = ArrayTableModel(
+            ['Start (seconds)', 'End (seconds)', 'Text'],
+            dtypes=[float, float, object], parent=self._AnnotateTable)
+        self._annotModel.attach(self._AnnotateTable)
+        self._annotModel.edited.connect(self._fcn_annotate_edited)
+        self._AnnotateTable.selectionModel().currentRowChanged.connect(
             self._fcn_annotate_goto)
 
+    def _fcn_annotate_fill(self):
+        """Fill the annotation table with the annotation store."""
+        self._annotModel.set_columns(list(self._annot.to_array()))
+
     def _fcn_annotate_add(self, _, xlim=None, txt="Enter your annotation"):
         """Add a ligne to the annotation table."""
-        # Add a ligne :
-        self._AnnotateTable.setRowCount(self._AnnotateTable.rowCount() + 1)
-        rw = self._AnnotateTable.rowCount() - 1
         if xlim is None:
             # Get the current window :
             val = self._SlVal.value()
             step = self._SigSlStep.value()
             win = self._SigWin.value()
             xlim = (val * step, val * step + win)
-        # Automatically set the window :
-        self._AnnotateTable.setItem(rw, 0, QtWidgets.QTableWidgetItem(
-            str(xlim[0])))
-        self._AnnotateTable.setItem(rw, 1, QtWidgets.QTableWidgetItem(
-            str(xlim[1])))
+        # Add a ligne at the row of the annotation :
+        row = self._annot.add(xlim[0], xlim[1], txt)
+        model = self._annotModel
+        model.insert_rows(row, [[xlim[0]], [xlim[1]], [txt]])
         # Select the text item :
-        self._AnnotateTable.setCurrentCell(rw, 2)
-        item = QtWidgets.QTableWidgetItem()
-        item.setText(txt)
-        self._AnnotateTable.setItem(rw, 2, item)
-        self._AnnotateTable.editItem(self._AnnotateTable.item(rw, 2))
+        index = model.select_row(self._AnnotateTable, row, 2)
+        self._AnnotateTable.edit(index)
         # Send marker annotation to the time-axis :
-        self._annot_mark = np.append(self._annot_mark, np.array(xlim).mean())
         self._fcn_slider_move()
 
     def _fcn_annotate_rm(self):
         """Remove a line to the annotation table."""
-        row = self._AnnotateTable.currentRow()
-        self._AnnotateTable.removeRow(row)
-        self._annot_mark = np.delete(self._annot_mark, row, 0)
-        self._fcn_slider_move()
+        row = self._annotModel.current_row(self._AnnotateTable)
+        if row >= 0:
+            self._annotModel.removeRows(row, 1)
+            self._annot.remove(row)
+            self._fcn_slider_move()
+
+    def _fcn_annotate_edited(self, row, col, old):
+        """Report an edition of the table into the annotation store."""
+        start, end, text = [c[row] for c in self._annotModel.columns]
+        if col == 2:
+            self._annot.set_text(row, text)
+        else:
+            # The annotation is moved to keep rows sorted :
+            self._annot.remove(row)
+            self._annot.add(start, end, text)
+            self._fcn_annotate_fill()
+            self._fcn_slider_move()
 
-    def _fcn_annotate_goto(self):
+    def _fcn_annotate_goto(self, *args):
         """Go to the annotation location."""
-        row = self._AnnotateTable.currentRow()
+        row = self._annotModel.current_row(self._AnnotateTable)
         if row >= 0:
-            sta = float(str(self._AnnotateTable.item(row, 0).text()))
+            sta = float(self._annotModel.columns[0][row])
             self._SlGoto.setValue(sta)
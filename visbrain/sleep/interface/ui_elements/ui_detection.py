@@ -1,11 +1,12 @@
 """Main class for sleep tools managment."""
 import numpy as np
-from PyQt5 import QtWidgets, QtCore
+from PyQt5 import QtWidgets
 import logging
 
 from ....utils import (remdetect, spindlesdetect, slowwavedetect, kcdetect,
-                       peakdetect, mtdetect)
+                       peakdetect, mtdetect, ArrayTableModel)
 from ....utils.sleep.event import _events_to_index
+from ....io import SessionCache
 
 logger = logging.getLogger('visbrain')
 
@@ -41,9 +42,15 @@ class UiDetection(object):
         self._DetectRm.clicked.connect(self._fcn_rm_location)
         self._DetectViz.clicked.connect(self._fcn_viz_location)
         self._DetecRmEvent.clicked.connect(self._fcn_rm_selected_event)
-        self._DetectLocations.itemSelectionChanged.connect(
+        ref = ['Wake', 'N1', 'N2', 'N3', 'REM', 'ART']
+        self._detectModel = ArrayTableModel(
+            ['Start (sec)', 'End (sec)', 'Duration (ms)', 'Stage'],
+            editable=[0, 1, 2], fmt={3: lambda k: ref[int(k)]},
+            parent=self._DetectLocations)
+        self._detectModel.attach(self._DetectLocations)
+        self._DetectLocations.selectionModel().currentRowChanged.connect(
             self._fcn_goto_location)
-        self._DetectLocations.cellChanged.connect(self._fcn_edit_detection)
+        self._detectModel.edited.connect(self._fcn_edit_detection)
         self._DetectionTab.setTabEnabled(1, False)
 
     # =====================================================================
@@ -77,8 +84,7 @@ class UiDetection(object):
 
         # Visible channels :
         elif self._ToolRdViz.isChecked():
-            idx = [
-                k for k in range(len(self)) if self._chanWidget[k].isVisible()]
+            idx = [k for k in range(len(self)) if self._canvas_is_visible(k)]
 
         # All channels :
         elif self._ToolRdAll.isChecked():
@@ -99,12 +105,15 @@ class UiDetection(object):
         if user_method in self._custom_detections.keys():
             logger.warning("Custom method used for %s detection" % method)
             fcn = self._custom_detections[user_method]
+            # Custom functions can't be keyed in the session cache :
+            params = None
         else:
             logger.info("Default method used for %s detection" % method)
             # Switch between detection types :
             if method == 'REM':
                 th = self._ToolRemTh.value()
                 rem_only = self._ToolRemOnly.isChecked()
+                params = dict(th=th, rem_only=rem_only)
                 def fcn(data, sf, time, hypno):  # noqa
                     return remdetect(data, sf, hypno, rem_only, th)
             elif method == 'Spindles':
@@ -114,11 +123,14 @@ class UiDetection(object):
                 tmin = self._ToolSpinTmin.value()
                 tmax = self._ToolSpinTmax.value()
                 nrem_only = self._ToolSpinRemOnly.isChecked()
+                params = dict(thr=thr, fmin=fmin, fmax=fmax, tmin=tmin,
+                              tmax=tmax, nrem_only=nrem_only)
                 def fcn(data, sf, time, hypno):  # noqa
                     return spindlesdetect(data, sf, thr, hypno, nrem_only,
                                           fmin, fmax, tmin, tmax)
             elif method == 'Slow waves':
                 thr = self._ToolWaveTh.value()
+                params = dict(thr=thr)
                 def fcn(data, sf, time, hypno):  # noqa
                     return slowwavedetect(data, sf, thr)
             elif method == 'K-complexes':
@@ -129,18 +141,23 @@ class UiDetection(object):
                 min_amp = self._ToolKCMinAmp.value()
                 max_amp = self._ToolKCMaxAmp.value()
                 nrem_only = self._ToolKCNremOnly.isChecked()
+                params = dict(proba_thr=proba_thr, amp_thr=amp_thr, tmin=tmin,
+                              tmax=tmax, min_amp=min_amp, max_amp=max_amp,
+                              nrem_only=nrem_only)
                 def fcn(data, sf, time, hypno):  # noqa
                     return kcdetect(data, sf, proba_thr, amp_thr, hypno,
                                     nrem_only, tmin, tmax, min_amp, max_amp)
             elif method == 'Muscle twitches':
                 th = self._ToolMTTh.value()
                 rem_only = self._ToolMTOnly.isChecked()
+                params = dict(th=th, rem_only=rem_only)
                 def fcn(data, sf, time, hypno):  # noqa
                     return mtdetect(data, sf, th, hypno, rem_only)
             elif method == 'Peaks':
                 look = int(self._ToolPeakLook.value() * self._sf)
                 _disp = self._ToolPeakMinMax.currentIndex()
                 disp = ['max', 'min', 'minmax'][_disp]
+                params = dict(look=look, disp=disp)
                 def fcn(data, sf, time, hypno):  # noqa
                     return peakdetect(sf, data, self._time, look, 1., disp,
                                       'auto')
@@ -165,6 +182,8 @@ class UiDetection(object):
                                  ", 2) array or a boolean array of shape "
                                  "(n_time_points,) or an array with "
                                  "consecutive detected events.")
+        # Parameters used to key detections in the session cache :
+        fcn_check.params = params
 
         return fcn_check
 
@@ -177,6 +196,18 @@ class UiDetection(object):
 
         fcn = self._fcn_get_detection_function(method)
 
+        def _detect(k):
+            """Run the detection on a channel (or get it from the cache)."""
+            def _run():
+                return fcn(self._data[k, :], self._sf, self._time, self._hypno)
+            if (self._cache is None) or (fcn.params is None):
+                return _run()
+            return self._cache.get(
+                'detect', _run, data=self._data_key, chan=k, method=method,
+                hypno=hypno_key, sf=self._sf, **fcn.params)
+        if self._cache is not None:
+            hypno_key = SessionCache.hash(self._hypno)
+
         ############################################################
         # RUN DETECTION
         ############################################################
@@ -186,7 +217,7 @@ class UiDetection(object):
                 self._ToolDetectProgress.show()
 
             # Run detection :
-            index = fcn(self._data[k, :], self._sf, self._time, self._hypno)
+            index = _detect(k)
             nb = index.shape[0]
             dty = nb / (len(self._time) / self._sf / 60.)
             # dur = (index[:, 1] - index[:, 0]) * (1000. / self._sf)
@@ -294,7 +325,7 @@ class UiDetection(object):
             pos = np.full((1, 3), -10., dtype=np.float32)
             self._chan.loc[self._channels.index(chan)].set_data(pos=pos)
             # Clean table :
-            self._DetectLocations.setRowCount(0)
+            self._detectModel.clear()
             # Update GUI :
             self._loc_line_report()
         else:
@@ -330,87 +361,57 @@ class UiDetection(object):
 
     def _fcn_fill_locations(self, channel, kind, index, duration):
         """Fill the location table."""
-        # Disconnect location table :
-        self._DetectLocations.disconnect()
-        ref = ['Wake', 'N1', 'N2', 'N3', 'REM', 'ART']
-        # Clean table :
-        self._DetectLocations.setRowCount(0)
-        # Get starting index:
-        sta_ind, end_ind = index[:, 0], index[:, 1]
-        # Define the length of the table:
-        self._DetectLocations.setRowCount(min(len(sta_ind), len(duration)))
-        # Fill the table :
-        for num, (k, j, i) in enumerate(zip(sta_ind, end_ind, duration)):
-            # Starting :
-            self._DetectLocations.setItem(num, 0, QtWidgets.QTableWidgetItem(
-                str(self._time[k])))
-            # Ending :
-            self._DetectLocations.setItem(num, 1, QtWidgets.QTableWidgetItem(
-                str(self._time[j])))
-            # Duration :
-            self._DetectLocations.setItem(num, 2, QtWidgets.QTableWidgetItem(
-                str(i)))
-            # Type :
-            item = QtWidgets.QTableWidgetItem(ref[int(self._hypno[k])])
-            item.setFlags(QtCore.Qt.ItemIsEnabled)
-            self._DetectLocations.setItem(num, 3, item)
+        model = self._detectModel
+        n = min(len(index), len(duration))
+        sta_ind, end_ind = index[:n, 0], index[:n, 1]
+        model.set_columns([self._time[sta_ind], self._time[end_ind],
+                           duration[:n], self._hypno[sta_ind]])
         # Go to the first detected event :
-        self._DetectLocations.selectRow(0)
-        self._fcn_goto_location()
-        # Reconnect :
-        self._DetectLocations.itemSelectionChanged.connect(
-            self._fcn_goto_location)
-        self._DetectLocations.cellChanged.connect(self._fcn_edit_detection)
+        if n:
+            model.select_row(self._DetectLocations, 0)
 
     # =====================================================================
     # GO TO THE LOCATION
     # =====================================================================
-    def _fcn_goto_location(self):
+    def _fcn_goto_location(self, *args):
         """Go to the selected row REM / spindles / peak."""
         # Get the currently selected channel and type :
         chan, types = self._get_current_chan_type()
         # Get selected row and channel :
-        row = self._DetectLocations.currentRow()
-        ix = self._channels.index(chan)
-        if row >= 0:
+        row = self._detectModel.current_row(self._DetectLocations)
+        if (row >= 0) and chan:
+            ix = self._channels.index(chan)
             # Get starting and ending point :
-            sta = float(str(self._DetectLocations.item(row, 0).text()))
-            end = float(str(self._DetectLocations.item(row, 1).text()))
+            sta = float(self._detectModel.columns[0][row])
+            end = float(self._detectModel.columns[1][row])
             # Go to :
             self._SlGoto.setValue(sta)
             # Set vertical lines to the location :
             self._chan.set_location(self._sf, self._data[ix, :], ix, sta, end)
 
-    def _fcn_edit_detection(self):
-        """Executed function when the item is edited."""
+    def _fcn_edit_detection(self, row, col, old):
+        """Executed function when a cell is edited."""
         # Get the currently selected channel and type :
         chan, types = self._get_current_chan_type()
-        # Get selected row and col :
-        row = self._DetectLocations.currentRow()
-        col = self._DetectLocations.currentColumn()
-        val = self._DetectLocations.item(row, col).text()
+        index = self._detect[(chan, types)]['index']
+        val = self._detectModel.columns[col][row]
         if col in [0, 1]:  # Edit starting/ending point
-            val = int(np.round(float(val) * self._sf))
-            self._detect[(chan, types)]['index'][row, col] = val
+            index[row, col] = int(np.round(val * self._sf))
         elif col == 2:  # Edit duration
-            val = int(np.round(float(val) * self._sf / 1000.))
-            start = self._detect[(chan, types)]['index'][row, 0]
-            self._detect[(chan, types)]['index'][row, 1] = start + val
-        elif col == 3:  # Avoid stage editing
-            self._DetectLocations
-            self._DetectLocations.setItem(row, 3,
-                                          QtWidgets.QTableWidgetItem(val))
+            val = int(np.round(val * self._sf / 1000.))
+            index[row, 1] = index[row, 0] + val
         # Update :
         self._loc_line_report(refresh=False)
-        self._DetectLocations.selectRow(row)
+        self._detectModel.select_row(self._DetectLocations, row)
 
     def _fcn_rm_selected_event(self):
         """Remove the selected event in the table and update detections."""
         # Get selected row :
-        row = self._DetectLocations.currentRow()  # return -1 when no more row
+        model = self._detectModel
+        row = model.current_row(self._DetectLocations)  # -1 if no more row
         if row + 1:
             # Remove row :
-            self._DetectLocations.removeRow(row)
+            model.removeRows(row, 1)
             # Get the currently selected channel and type :
             chan, types = self._get_current_chan_type()
             # Delete the selected event :
@@ -422,4 +423,5 @@ class UiDetection(object):
             else:
                 self._detect[(chan, types)]['index'] = np.delete(index, row, 0)
                 self._loc_line_report(refresh=False)
-                self._DetectLocations.selectRow(row)
+                model.select_row(self._DetectLocations,
+                                 min(row, len(model) - 1))
@@ -2,7 +2,7 @@
 
 from PyQt5 import QtWidgets
 
-from ....utils import sleepstats
+from ....utils import HypnoTally
 from os import path
 
 
@@ -13,11 +13,20 @@ class UiInfo(object):
         """Init."""
         pass
 
-    def _fcn_info_update(self):
-        """Complete the table sleep info."""
+    def _fcn_info_update(self, rebuild=True):
+        """Complete the table sleep info.
+
+        Parameters
+        ----------
+        rebuild : bool | True
+            Rebuild the sleep stats tally from the hypnogram. If False, the
+            tally is expected to be already up to date with the last edits.
+        """
         table = self._infoTable
         # Get sleep stats :
-        stats = sleepstats(self._hyp.gui_to_hyp(), self._sf)
+        if rebuild or (getattr(self, '_hypno_tally', None) is None):
+            self._hypno_tally = HypnoTally(self._hyp.gui_to_hyp(), self._sf)
+        stats = self._hypno_tally.stats()
 
         # Add global informations to stats dict
         is_file = isinstance(self._file, str)
@@ -7,7 +7,7 @@ from PyQt5 import QtWidgets
 
 from ....utils import HelpMenu
 from ....io import (dialog_save, dialog_load, write_fig_hyp, write_csv,
-                    write_txt, write_hypno, read_hypno, annotations_to_array,
+                    write_txt, write_hypno, read_hypno, AnnotationStore,
                     oversample_hypno, save_config_json)
 
 
@@ -157,12 +157,9 @@ class UiMenu(HelpMenu):
     def _save_scoring_table(self, *args, filename=None):
         """Export score info."""
         # Read Table
-        row_count = self._scoreTable.rowCount()
-        sta_ind, end_ind, stage = [], [], []
-        for row in np.arange(row_count):
-            sta_ind.append(str(self._scoreTable.item(row, 0).text()))
-            end_ind.append(str(self._scoreTable.item(row, 1).text()))
-            stage.append(str(self._scoreTable.item(row, 2).text()))
+        model = self._scoreModel
+        sta_ind, end_ind, stage = [[model.text(row, k) for row in range(len(
+            model))] for k in range(3)]
         # Get file name :
         if filename is None:
             filename = dialog_save(self, 'Save file', 'scoring_info',
@@ -194,16 +191,13 @@ class UiMenu(HelpMenu):
         """Export selected detection."""
         channel, method = self._get_current_chan_type()
         # Read Table
-        row_count = self._DetectLocations.rowCount()
+        model = self._detectModel
         sta_ind = [channel, '', 'Time index (s)']
         end_ind = [method, '', 'Time index (s)']
         duration = ['', '', 'Duration (s)']
         stage = ['', '', 'Sleep stage']
-        for row in np.arange(row_count):
-            sta_ind.append(str(self._DetectLocations.item(row, 0).text()))
-            end_ind.append(str(self._DetectLocations.item(row, 1).text()))
-            duration.append(str(self._DetectLocations.item(row, 2).text()))
-            stage.append(str(self._DetectLocations.item(row, 3).text()))
+        for k, col in enumerate([sta_ind, end_ind, duration, stage]):
+            col += [model.text(row, k) for row in range(len(model))]
         # Get file name :
         saveas = "locinfo" + '_' + channel + '-' + method
         if filename is None:
@@ -275,12 +269,9 @@ class UiMenu(HelpMenu):
     def _save_annotation_table(self, *args, filename=None):
         """Export annotation table."""
         # Read Table
-        row_count = self._AnnotateTable.rowCount()
-        sta_ind, end_ind, annot = [], [], []
-        for row in np.arange(row_count):
-            sta_ind.append(str(self._AnnotateTable.item(row, 0).text()))
-            end_ind.append(str(self._AnnotateTable.item(row, 1).text()))
-            annot.append(str(self._AnnotateTable.item(row, 2).text()))
+        model = self._annotModel
+        sta_ind, end_ind, annot = [[model.text(row, k) for row in range(len(
+            model))] for k in range(3)]
         # Get file name :
         if filename is None:
             filename = dialog_save(self, 'Save annotations', 'annotations',
@@ -461,28 +452,12 @@ class UiMenu(HelpMenu):
             filename = dialog_load(self, "Import annotations", '',
                                    "CSV file (*.csv);;Text file (*.txt);;"
                                    "All files (*.*)")
-        # Clean annotations :
-        self._AnnotateTable.setRowCount(0)
-        start, end, annot = annotations_to_array(filename)
-
+        self._annot = AnnotationStore(filename)
         # Fill table :
-        self._AnnotateTable.setRowCount(len(start))
-        # File the table :
-        for k, (s, e, a) in enumerate(zip(start, end, annot)):
-            # Starting index :
-            self._AnnotateTable.setItem(
-                k, 0, QtWidgets.QTableWidgetItem(str(s)))
-            # Ending index :
-            self._AnnotateTable.setItem(
-                k, 1, QtWidgets.QTableWidgetItem(str(e)))
-            # Text :
-            self._AnnotateTable.setItem(
-                k, 2, QtWidgets.QTableWidgetItem(str(a)))
+        self._fcn_annotate_fill()
+        if len(self._annot):
             # Set the current tab to the annotation tab :
             self.QuickSettings.setCurrentIndex(5)
-        # Set markers :
-        middle = (start.astype(np.float32) + end.astype(np.float32)) / 2
-        self._annot_mark = middle
         self._fcn_slider_move()
 
     ###########################################################
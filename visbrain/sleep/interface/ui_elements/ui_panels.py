@@ -5,7 +5,7 @@ import numpy as np
 
 from visbrain.io.dependencies import is_lspopt_installed
 
-from ..ui_init import AxisCanvas, TimeAxis
+from ..ui_init import AxisCanvas, ChannelCanvas, TimeAxis
 from ....utils import mpl_cmap, color2vb
 from ....config import PROFILER
 
@@ -71,12 +71,13 @@ class UiPanels(object):
         self._SpecW, self._SpecLayout = self._create_compatible_w("SpecW",
                                                                   "SpecL")
         self._SpecLayout.addWidget(self._specCanvas.canvas.native)
-        self._chanGrid.addWidget(self._SpecW, len(self) + 1, 1, 1, 1)
+        self._chanGrid.addWidget(self._SpecW, 1, 1, 1, 1)
+        self._chanGrid.setRowStretch(1, 1)
         # Add label :
         self._specLabel = QtWidgets.QLabel(self.centralwidget)
         self._specLabel.setText(self._addspace + self._channels[0])
         self._specLabel.setFont(self._font)
-        self._chanGrid.addWidget(self._specLabel, len(self) + 1, 0, 1, 1)
+        self._chanGrid.addWidget(self._specLabel, 1, 0, 1, 1)
         # Add list of colormaps :
         self._cmap_lst = mpl_cmap()
         self._PanSpecCmap.addItems(self._cmap_lst)
@@ -108,7 +109,8 @@ class UiPanels(object):
                                      fcn=[self.on_mouse_wheel], use_pad=True)
         self._HypW, self._HypLayout = self._create_compatible_w("HypW", "HypL")
         self._HypLayout.addWidget(self._hypCanvas.canvas.native)
-        self._chanGrid.addWidget(self._HypW, len(self) + 2, 1, 1, 1)
+        self._chanGrid.addWidget(self._HypW, 2, 1, 1, 1)
+        self._chanGrid.setRowStretch(2, 1)
         # Add label :
         self._hypLabel = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout(self._hypLabel)
@@ -120,7 +122,7 @@ class UiPanels(object):
             label.setFont(self._font)
             layout.addWidget(label)
             self._hypYLabels.append(label)
-        self._chanGrid.addWidget(self._hypLabel, len(self) + 2, 0, 1, 1)
+        self._chanGrid.addWidget(self._hypLabel, 2, 0, 1, 1)
         PROFILER("Hypnogram", level=2)
         # Connect :
         self._PanHypnoReset.clicked.connect(self._fcn_hypno_clean)
@@ -164,12 +166,13 @@ class UiPanels(object):
         self._TimeLayout.addWidget(self._TimeAxis.canvas.native)
         self._TimeAxisW.setMaximumHeight(400)
         self._TimeAxisW.setMinimumHeight(50)
-        self._chanGrid.addWidget(self._TimeAxisW, len(self) + 3, 1, 1, 1)
+        self._chanGrid.addWidget(self._TimeAxisW, 3, 1, 1, 1)
+        self._chanGrid.setRowStretch(3, 1)
         # Add label :
         self._timeLabel = QtWidgets.QLabel(self.centralwidget)
         self._timeLabel.setText(self._addspace + 'Time')
         self._timeLabel.setFont(self._font)
-        self._chanGrid.addWidget(self._timeLabel, len(self) + 3, 0, 1, 1)
+        self._chanGrid.addWidget(self._timeLabel, 3, 0, 1, 1)
         PROFILER("Time axis", level=2)
 
     # =====================================================================
@@ -199,16 +202,31 @@ class UiPanels(object):
         return Widget, Layout
 
     def _fcn_chan_check_and_create_w(self):
-        """Create one checkbox and one widget/layout per channel."""
-        # Empty list of checkbox and widgets/layouts :
+        """Create one checkbox and one lane of the channel canvas per channel.
+
+        Every channel is drawn in a single canvas (see ChannelCanvas).
+        """
+        # Empty list of checkbox :
         self._chanChecks = [0] * len(self)
         self._yminSpin, self._ymaxSpin = [0] * len(self), [0] * len(self)
-        self._chanWidget = [0] * len(self)
-        self._chanLayout = [0] * len(self)
-        self._chanCanvas = [0] * len(self)
         self._chanLabels = []
         self._amplitudeTxt = []
 
+        # ============ CANVAS ============
+        # Create a single canvas for every channel :
+        self._chanCanvas = ChannelCanvas(self._channels, axis=self._ax,
+                                         fcn=[self.on_mouse_wheel])
+        self._chanWidget, self._chanLayout = self._create_compatible_w(
+            "_widgetChan", "_LayoutChan")
+        self._chanLayout.addWidget(self._chanCanvas.canvas.native)
+        self._chanGrid.addWidget(self._chanWidget, 0, 1, 1, 1)
+        # Labels are stacked as lanes of the canvas :
+        self._chanLabelW = QtWidgets.QWidget()
+        label_layout = QtWidgets.QVBoxLayout(self._chanLabelW)
+        label_layout.setContentsMargins(0, 0, 0, 0)
+        label_layout.setSpacing(0)
+        self._chanGrid.addWidget(self._chanLabelW, 0, 0, 1, 1)
+
         # Define a vertical and horizontal spacers :
         vspacer = QtWidgets.QSpacerItem(20, 40,
                                         QtWidgets.QSizePolicy.Expanding,
@@ -259,29 +277,16 @@ class UiPanels(object):
             self._yminSpin[i].valueChanged.connect(self._fcn_chan_amplitude)
             self._ymaxSpin[i].valueChanged.connect(self._fcn_chan_amplitude)
 
-            # ============ WIDGETS / LAYOUTS ============
-            # Create a widget :
-            (self._chanWidget[i],
-             self._chanLayout[i]) = self._create_compatible_w(
-                "_widgetChan" + k, "_LayoutChan" + k)
-            self._chanGrid.addWidget(self._chanWidget[i], i, 1, 1, 1)
+            # ============ LABEL ============
             # Add channel label :
-            self._chanLabels.append(QtWidgets.QLabel(self.centralwidget))
+            self._chanLabels.append(QtWidgets.QLabel(self._chanLabelW))
             self._chanLabels[i].setText(self._addspace + k)
             self._chanLabels[i].setFont(self._font)
             self._chanLabels[i].setVisible(False)
-            self._chanGrid.addWidget(self._chanLabels[i], i, 0, 1, 1)
-
-            # ============ CANVAS ============
-            # Create canvas :
-            self._chanCanvas[i] = AxisCanvas(axis=self._ax,
-                                             name='Canvas_' + k,
-                                             fcn=[self.on_mouse_wheel])
-            # Add the canvas to the layout :
-            self._chanLayout[i].addWidget(self._chanCanvas[i].canvas.native)
+            label_layout.addWidget(self._chanLabels[i])
 
         self._PanChanLay.addItem(vspacer, i + 1, 0, 1, 1)
-        self._chanGrid.addItem(hspacer, i + 4, 1, 1, 1)
+        self._chanGrid.addItem(hspacer, 4, 1, 1, 1)
 
     # =====================================================================
     # AMPLITUDES
@@ -375,13 +380,22 @@ class UiPanels(object):
         """Control visible panels of channels."""
         for i, k in enumerate(self._chanChecks):
             viz = k.isChecked()
-            self._chanWidget[i].setVisible(viz)
             self._chanLabels[i].setVisible(viz)
             self._chan.visible[i] = viz
             if viz:
                 self._chanCanvas[i].set_camera(self._chanCam[i])
+        self._fcn_chan_stack()
         self._chan.update()
 
+    def _fcn_chan_stack(self):
+        """Stack lanes of visible channels in the channel canvas."""
+        visible = [k.isChecked() for k in self._chanChecks]
+        self._chanCanvas.set_visible(visible)
+        self._chanWidget.setVisible(any(visible))
+        self._chanLabelW.setVisible(any(visible))
+        # Channels share the height with other panels :
+        self._chanGrid.setRowStretch(0, sum(visible))
+
     def _fcn_select_all_chan(self):
         """Select all channels."""
         for k in self._chanChecks:
@@ -407,7 +421,7 @@ class UiPanels(object):
         visible : bool
             A boolean value indicating if the canvas is visible.
         """
-        return self._chanWidget[k].isVisible()
+        return bool(self._chanCanvas.visible[k])
 
     def _canvas_set_visible(self, k, value):
         """Set the visibility of the canvas k to value.
@@ -420,9 +434,9 @@ class UiPanels(object):
             Boolean value if the canvas has to be visible.
         """
         self._chanChecks[k].setChecked(value)
-        self._chanWidget[k].setVisible(value)
         self._chanLabels[k].setVisible(value)
         self._chanCanvas[k].set_camera(self._chanCam[k])
+        self._fcn_chan_stack()
 
     # =====================================================================
     # SPECTROGRAM
@@ -453,7 +467,8 @@ class UiPanels(object):
         self._spec.set_data(self._sf, self._data[chan, ...], self._time,
                             nfft=nfft, overlap=over, fstart=fstart, fend=fend,
                             cmap=cmap, contrast=contrast, interp=interp,
-                            norm=norm, method=method)
+                            norm=norm, method=method, cache=self._cache,
+                            cache_key=(self._data_key, chan))
         # Set apply button disable :
         self._PanSpecApply.setEnabled(False)
 
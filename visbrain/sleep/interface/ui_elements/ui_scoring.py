@@ -1,8 +1,23 @@
 """Main class for settings managment."""
 import numpy as np
-from PyQt5 import QtWidgets
 
-from ....utils import transient
+from ....utils import transient, ArrayTableModel
+
+
+STAGES = {'art': -1., 'wake': 0., 'n1': 1., 'n2': 2., 'n3': 3., 'rem': 4.}
+ITEMS = ['Wake', 'N1', 'N2', 'N3', 'REM', 'Art']
+
+
+def _stage_to_text(stage):
+    """Convert a stage value into a text."""
+    return '' if np.isnan(stage) else ITEMS[int(stage)]
+
+
+def _text_to_stage(text):
+    """Convert a text into a stage value."""
+    if text.lower() not in STAGES.keys():
+        raise ValueError("Stage must be Wake, N1, N2, N3, REM or Art")
+    return STAGES[text.lower()]
 
 
 class UiScoring(object):
@@ -14,61 +29,163 @@ class UiScoring(object):
         self._scoreAdd.clicked.connect(self._fcn_add_score_row)
         self._scoreRm.clicked.connect(self._fcn_rm_score_row)
 
+        # Table model :
+        self._scoreModel = ArrayTableModel(
+            ['From (minutes)', 'To (minutes)', 'Stage'],
+            fmt={2: _stage_to_text}, parse={2: _text_to_stage},
+            parent=self._scoreTable)
+        self._scoreModel.attach(self._scoreTable)
         # Table edited :
-        self._scoreTable.cellChanged.connect(self._fcn_score_to_hypno)
+        self._scoreModel.edited.connect(self._fcn_score_to_hypno)
 
     ##########################################################################
     # UPDATE SCORE <=> HYPNO
     ##########################################################################
-    def _fcn_hypno_to_score(self):
-        """Update hypno table from hypno data."""
-        self._hypno = self._hyp.gui_to_hyp()
-        # Avoid updating data while setting cell :
-        self._scoreSet = False
-        items = ['Wake', 'N1', 'N2', 'N3', 'REM', 'Art']
-        # Remove every info in the table :
-        self._scoreTable.setRowCount(0)
+    def _set_hypno_stage(self, start, stop, stage):
+        """Set a stage between two samples of the hypnogram.
+
+        The hypnogram data, the hypnogram visual and the sleep stats tally
+        are only updated over the edited span.
+
+        Parameters
+        ----------
+        start : int
+            The index where the stage start.
+        stop : int
+            The index where the stage end (excluded).
+        stage : int
+            Stage value.
+        """
+        self._hypno[start:stop] = stage
+        self._hyp.set_stage(start, stop, stage)
+        self._hypno_tally.set_stage(start, stop, stage)
+
+    def _fcn_hypno_to_score(self, start=None, stop=None):
+        """Update hypno table from hypno data.
+
+        Parameters
+        ----------
+        start, stop : int | None
+            If both are given, only the rows of the table overlapping the
+            edited span [start, stop) of the hypnogram are replaced. Otherwise,
+            the whole table is rebuilt.
+        """
+        model = self._scoreModel
+        sidx = getattr(self, '_score_idx', None)
+        partial = (start is not None) and (stop is not None) and (
+            sidx is not None) and (len(sidx) == len(model))
+        # ============= FULL REBUILD =============
+        if not partial:
+            self._hypno = self._hyp.gui_to_hyp()
+            _, idx, stages = transient(self._hypno)
+            self._score_idx = np.c_[idx, stages]
+            model.set_columns(self._get_score_columns(self._score_idx))
+            return
+        # ============= PARTIAL UPDATE =============
+        start, stop = max(int(start), 0), min(int(stop), len(self._hypno))
+        if start >= stop:
+            return
+        # Rows touching the span (neighbours may be merged / split) :
+        r0 = max(np.searchsorted(sidx[:, 1], start - 1), 0)
+        r1 = min(np.searchsorted(sidx[:, 0], stop, side='right') - 1,
+                 len(sidx) - 1)
+        lo, hi = sidx[r0, 0], sidx[r1, 1]
+        _, idx, stages = transient(self._hypno[lo:hi + 1])
+        new = np.c_[idx + lo, stages]
+        self._score_idx = np.r_[sidx[:r0], new, sidx[r1 + 1:]]
+        # Replace rows :
+        model.removeRows(r0, r1 - r0 + 1)
+        model.insert_rows(r0, self._get_score_columns(new))
+
+    def _get_score_columns(self, idx):
+        """Get the columns of the table.
+
+        Parameters
+        ----------
+        idx : array_like
+            Array of shape (n_rows, 3) with the first sample, the last sample
+            and the stage of each row.
+
+        Returns
+        -------
+        columns : list
+            Starting time, ending time and stage of each row.
+        """
         # Find unit conversion :
         fact = self._get_fact_from_unit()
-        # Find transients :
-        _, idx, stages = transient(self._hypno, self._time / fact)
-        idx = np.round(10. * idx) / 10.
-        # Set length of the table :
-        self._scoreTable.setRowCount(len(stages))
-        # Fill the table :
-        for k in range(len(stages)):
-            # Add stage start / end :
-            self._scoreTable.setItem(k, 0, QtWidgets.QTableWidgetItem(
-                str(idx[k, 0])))
-            self._scoreTable.setItem(k, 1, QtWidgets.QTableWidgetItem(
-                str(idx[k, 1])))
-            # Add stage :
-            self._scoreTable.setItem(k, 2, QtWidgets.QTableWidgetItem(
-                items[stages[k]]))
-        self._scoreSet = True
-
-    def _fcn_score_to_hypno(self):
-        """Update hypno data from hypno score."""
-        if self._scoreSet:
+        time = self._time[idx[:, 0:2]].astype(float)
+        time = np.round(10. * time / fact) / 10.
+        return [time[:, 0], time[:, 1], idx[:, 2]]
+
+    def _get_score_spans(self):
+        """Get the span of each row of the table.
+
+        Returns
+        -------
+        spans : array_like
+            Array of shape (n_rows, 3) with the starting sample, the ending
+            sample and the stage of each row (NaN for incomplete rows).
+        """
+        start, end, stage = self._scoreModel.columns
+        fact = self._get_fact_from_unit() * self._sf
+        spans = np.c_[np.trunc(start * fact), np.trunc(end * fact), stage]
+        spans[np.isnan(spans).any(1), :] = np.nan
+        return spans
+
+    def _fcn_score_to_hypno(self, row=None, col=None, old=None):
+        """Update hypno data from hypno score.
+
+        Parameters
+        ----------
+        row, col : int | None
+            The edited cell. If the row is given, only the part of the
+            hypnogram covered by the old and new span of this row is replayed.
+            Otherwise, the hypnogram is rebuilt from the whole table.
+        old : float | None
+            The value of the cell before edition.
+        """
+        spans = self._get_score_spans()
+        if row is None:
             # Reset hypnogram :
             self._hypno = np.zeros((len(self._time)), dtype=np.float32)
             # Loop over table row :
-            for k in range(self._scoreTable.rowCount()):
-                # Get tstart / tend / stage :
-                tstart, tend, stage = self._get_score_marker(k)
-                # Update pos if not None :
-                if tstart is not None:
-                    self._hypno[tstart:tend] = stage
-                    self._hyp.set_stage(tstart, tend, stage)
+            for k in np.flatnonzero(~np.isnan(spans[:, 0])):
+                tstart, tend, stage = spans[k, :]
+                self._hypno[int(tstart):int(tend)] = stage
+            self._hyp.set_data(self._sf, self._hypno, self._time)
             self._hyp.edit.update()
             # Update sleep info :
             self._fcn_info_update()
+        else:
+            start, end, _ = [c[row] for c in self._scoreModel.columns]
+            bounds = np.array([start, end, start, end], dtype=float)
+            if col in [0, 1]:
+                bounds[col] = old
+            fact = self._get_fact_from_unit() * self._sf
+            bounds = np.trunc(bounds[~np.isnan(bounds)] * fact)
+            if not bounds.size:
+                return
+            lo = int(max(bounds.min(), 0))
+            hi = int(min(bounds.max(), len(self._hypno)))
+            if lo >= hi:
+                return
+            # Replay rows intersecting the span :
+            hypno = np.zeros((hi - lo,), dtype=np.float32)
+            inter = (spans[:, 0] < hi) & (spans[:, 1] > lo)
+            for k in np.flatnonzero(inter):
+                a, b = max(int(spans[k, 0]), lo), min(int(spans[k, 1]), hi)
+                hypno[a - lo:b - lo] = spans[k, 2]
+            _, idx, stages = transient(hypno)
+            for (a, b), stage in zip(idx + lo, stages):
+                self._set_hypno_stage(a, b + 1, stage)
+            self._hyp.edit.update()
+            # Update sleep info :
+            self._fcn_info_update(rebuild=False)
+        # The table may not be a partition of the hypnogram anymore :
+        self._score_idx = None
 
     def _get_score_marker(self, idx):
-        """Get a specific row dat.
-
-        This function insure that the edited line is complete and is properly
-        formated.
+        """Get a specific row data.
 
         Parameters
         ----------
@@ -77,45 +194,18 @@ class UiScoring(object):
 
         Returns
         -------
-        tstart : float
-            Time start (in sample)
-        tend : float
-            Time end (in sample).
-        stage : int
-            The stage.
+        tstart : int
+            Time start (in sample). None if the row is incomplete.
+        tend : int
+            Time end (in sample). None if the row is incomplete.
+        stage : float
+            The stage. None if the row is incomplete.
         """
-        it = {'art': -1., 'wake': 0., 'n1': 1., 'n2': 2., 'n3': 3., 'rem': 4.}
-        # Get unit :
-        fact = self._get_fact_from_unit()
-        # Get selected row :
-        # idx = self._scoreTable.currentRow()
-        # ============= NON EMPTY ITEM =============
-        # Define error message if bad editing :
-        errmsg = "\nTable score error. Starting and ending time must be " + \
-                 "float numbers (with time start < time end) and stage " + \
-                 "must be Wake, N1, N2, N3, REM or Art"
-        # Get row data and update if possible:
-        tstart_item = self._scoreTable.item(idx, 0)
-        tend_item = self._scoreTable.item(idx, 1)
-        stage_item = self._scoreTable.item(idx, 2)
-        if tstart_item and tend_item and stage_item:
-            # ============= PROPER FORMAT =============
-            if all([bool(str(tstart_item.text())), bool(str(tend_item.text())),
-                    str(stage_item.text()).lower() in it.keys()]):
-                try:
-                    # Get start / end / stage :
-                    tstart = int(float(str(tstart_item.text(
-                    ))) * fact * self._sf)
-                    tend = int(float(str(tend_item.text())) * fact * self._sf)
-                    stage = it[str(stage_item.text()).lower()]
-
-                    return tstart, tend, stage
-                except:
-                    raise ValueError(errmsg)
-            else:
-                raise ValueError(errmsg)
-        else:
+        tstart, tend, stage = [c[idx] for c in self._scoreModel.columns]
+        if np.isnan([tstart, tend, stage]).any():
             return None, None, None
+        fact = self._get_fact_from_unit() * self._sf
+        return int(tstart * fact), int(tend * fact), stage
 
     ##########################################################################
     # EDITING TABLE
@@ -123,11 +213,14 @@ class UiScoring(object):
     def _fcn_add_score_row(self):
         """Add a row to the table."""
         # Increase length :
-        self._scoreTable.setRowCount(self._scoreTable.rowCount() + 1)
+        self._scoreModel.append_rows([[np.nan]] * 3)
+        self._score_idx = None
 
     def _fcn_rm_score_row(self):
         """Remove selected row."""
         # Remove row :
-        self._scoreTable.removeRow(self._scoreTable.currentRow())
-        # Update hypnogram from table :
-        self._fcn_score_to_hypno()
+        row = self._scoreModel.current_row(self._scoreTable)
+        if row >= 0:
+            self._scoreModel.removeRows(row, 1)
+            # Update hypnogram from table :
+            self._fcn_score_to_hypno()
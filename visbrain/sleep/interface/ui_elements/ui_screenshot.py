@@ -1,4 +1,6 @@
 """Screenshot window and related functions."""
+import numpy as np
+
 from ....io import write_fig_pyqt, write_fig_canvas, dialog_save
 from ....utils import ScreenshotPopup
 
@@ -63,6 +65,14 @@ class UiScreenshot(object):
                 # Force the channel to be displayed :
                 self._chanChecks[kc].setChecked(True)
                 self._fcn_chan_viz()
-                canvas = self._chanCanvas[kc].canvas
+                # Only stack the lane of the channel :
+                visible = self._chanCanvas.visible.copy()
+                self._chanCanvas.set_visible(np.arange(len(self)) == kc)
+                try:
+                    write_fig_canvas(filename, canvas=self._chanCanvas.canvas,
+                                     **kwargs)
+                finally:
+                    self._chanCanvas.set_visible(visible)
+                return
             # Finally, render the canvas :
             write_fig_canvas(filename, canvas=canvas, **kwargs)
@@ -103,7 +103,7 @@ class UiSettings(object):
         # Update Time indicator :
         if is_indic_checked:
             self._TimeAxis.set_data(xlim[0], win, self._time, unit=unit,
-                                    markers=self._annot_mark)
+                                    markers=self._annot.middle)
 
         # ================= GUI =================
         # Update Go to :
@@ -118,8 +118,11 @@ class UiSettings(object):
             self._speccam.rect = (xlim[0], self._spec.freq[0], xlim_diff,
                                   self._spec.freq[-1] - self._spec.freq[0])
             # Time axis :
+            # Only annotations of the window are displayed :
+            rows = self._annot.query(xlim[0], xlim[1])
             self._TimeAxis.set_data(xlim[0], win, np.array([xlim[0], xlim[1]]),
-                                    unit='seconds', markers=self._annot_mark)
+                                    unit='seconds',
+                                    markers=self._annot.middle[rows])
             self._timecam.rect = (xlim[0], 0., win, 1.)
 
         # ================= TEXT INFO =================
@@ -244,13 +247,11 @@ class UiSettings(object):
         t[0] = int(round(np.abs(self._time - xlim[0]).argmin()))
         t[1] = int(round(np.abs(self._time - xlim[1]).argmin()))
         # Set the stage :
-        self._hypno[t[0]:t[1]] = stage
-        self._hyp.set_stage(t[0], t[1], stage)
-        # # Update info table :
-        self._fcn_info_update()
+        self._set_hypno_stage(t[0], t[1], stage)
+        # Update info table :
+        self._fcn_info_update(rebuild=False)
         # Update scoring table :
-        self._fcn_hypno_to_score()
-        # self._fcn_score_to_hypno()
+        self._fcn_hypno_to_score(t[0], t[1])
 
     # =====================================================================
     # Annotate
@@ -273,8 +274,7 @@ class UiSettings(object):
         self._infoTable.setRowCount(0)
 
         # Detection :
-        self._DetectLocations.clear()
-        self._DetectLocations.setRowCount(0)
+        self._detectModel.clear()
 
         # -------------- LIST BOX --------------
         # Disconnect :
@@ -293,11 +293,11 @@ class UiSettings(object):
             # Delete elements :
             self._chanChecks[k].deleteLater()
             self._yminSpin[k].deleteLater(), self._ymaxSpin[k].deleteLater()
-            self._chanWidget[k].deleteLater()
-            self._chanLayout[k].deleteLater()
             self._chanLabels[k].deleteLater()
             self._amplitudeTxt[k].deleteLater()
-            self._chanCanvas[k].parent = None
+        self._chanCanvas.close()
+        self._chanWidget.deleteLater(), self._chanLayout.deleteLater()
+        self._chanLabelW.deleteLater()
         QObjectCleanupHandler().add(self._chanGrid)
         QObjectCleanupHandler().clear()
         # Spectrogram :
@@ -2,8 +2,8 @@
 
 import numpy as np
 from PyQt5 import QtWidgets
-from ....utils import (rereferencing, bipolarization, find_non_eeg,
-                       commonaverage)
+from ....utils import find_non_eeg, montage_matrix, Montage
+from ....io import SessionCache
 
 
 class UiTools(object):
@@ -93,17 +93,19 @@ class UiTools(object):
             # Get selected channel :
             idchan = idx = self._ToolsRefLst.currentIndex()
             # Re-referencing :
-            self._data, self._channels, consider = rereferencing(
-                self._data, self._channels, idchan,
-                to_ignore)
+            matrix, self._channels, consider = montage_matrix(
+                'reference', self._channels, idchan, to_ignore)
             self._chanChecks[idx].setChecked(False)
         elif idx == 1:  # Common average
-            self._data, self._channels, consider = commonaverage(
-                self._data, self._channels, to_ignore)
+            matrix, self._channels, consider = montage_matrix(
+                'average', self._channels, to_ignore=to_ignore)
         elif idx == 2:  # Bipolarization
-            self._data, self._channels, consider = bipolarization(
-                self._data, self._channels,
-                to_ignore)
+            matrix, self._channels, consider = montage_matrix(
+                'bipolar', self._channels, to_ignore=to_ignore)
+        # Raw data are kept untouched. Only the displayed window (or data sent
+        # to detections) is re-referenced :
+        self._data = Montage(self._data, matrix)
+        self._data_key = SessionCache.hash(self._data_key, matrix)
 
         # ____________________ Update ____________________
         a_max = np.argmax(consider)
@@ -111,7 +113,7 @@ class UiTools(object):
         self._get_data_info()
 
         # Update and clear detections :
-        self._DetectLocations.setRowCount(0)
+        self._detectModel.clear()
         self._DetectChanSw.clear()
         self._detect.update_keys(self._channels)
         self._detect.reset()
@@ -62,6 +62,7 @@ class TimeAxis(object):
         pos = np.full((1, 3), -10, dtype=np.float32)
         self.markers = Markers(pos=pos, parent=self.wc.scene)
         self.markers.set_gl_state('translucent')
+        self._markers = (None, None)
 
     def set_data(self, tox=None, width=None, time=None, unit='seconds',
                  markers=None):
@@ -79,8 +80,11 @@ class TimeAxis(object):
             self.mesh.transform.scale = width / fact
             # Update camera :
             self.wc.camera.rect = (0, 0, (time.max() - time.min()) / fact, 1)
-        # Set markers :
-        if markers is not None:
+        # Set markers (only if markers or unit have changed) :
+        last, last_fact = self._markers
+        if (markers is not None) and ((fact != last_fact) or (
+                not np.array_equal(markers, last))):
+            self._markers = (np.array(markers), fact)
             if markers.size:
                 pos = np.zeros((len(markers), 3), dtype=np.float32)
                 pos[:, 0] = markers / fact
@@ -157,3 +161,121 @@ class AxisCanvas(object):
         self._axis = visible
         self.yaxis.visible = visible
         self._rpad.visible = visible
+
+
+class ChannelLane(object):
+    """Lane of a channel inside a ChannelCanvas.
+
+    A lane has the same interface as an AxisCanvas (canvas, wc and
+    set_camera) but the canvas is shared by every lane.
+    """
+
+    def __init__(self, canvas, parent, axis=True):
+        """Init."""
+        self.canvas = canvas
+        self.wc = scene.ViewBox(border_color='white', parent=parent)
+        if axis:
+            self.yaxis = scene.AxisWidget(orientation='left',
+                                          text_color='black')
+            self.yaxis.width_max = 50
+            self.yaxis.parent = parent
+
+    def set_camera(self, camera):
+        """Set a camera and link all objects inside."""
+        self.wc.camera = camera
+        if hasattr(self, 'yaxis'):
+            self.yaxis.link_view(self.wc)
+
+    @property
+    def widgets(self):
+        """Get the (y-axis, viewbox) widgets of the lane."""
+        return (self.yaxis, self.wc) if hasattr(self, 'yaxis') else (
+            self.wc,)
+
+
+class ChannelCanvas(object):
+    """Create a single canvas with one lane per channel.
+
+    Visible lanes are stacked in a grid. Hidden lanes are moved to an
+    invisible widget so that y-axis stay linked to their viewbox. Indexing
+    the canvas returns the lane of a channel.
+
+    Parameters
+    ----------
+    channels : list
+        List of channel names.
+    axis : bool | True
+        Add a y-axis to each lane.
+    """
+
+    def __init__(self, channels, axis=True, bgcolor='white', fcn=[]):
+        """Init."""
+        self.canvas = scene.SceneCanvas(keys=None, bgcolor=bgcolor, show=False,
+                                        title='Channels')
+        _ = [self.canvas.connect(k) for k in fcn]  # noqa
+        self._grid = self.canvas.central_widget.add_grid(margin=10,
+                                                         spacing=20)
+        self._hidden = scene.Widget(parent=self.canvas.central_widget)
+        self._hidden.visible = False
+        self._lanes = [ChannelLane(self.canvas, self._hidden, axis)
+                       for k in channels]
+        self.visible = np.zeros((len(channels),), dtype=bool)
+
+    def __len__(self):
+        """Get the number of lanes."""
+        return len(self._lanes)
+
+    def __getitem__(self, key):
+        """Get the lane of a channel."""
+        return self._lanes[key]
+
+    def __iter__(self):
+        """Iterate over lanes."""
+        return iter(self._lanes)
+
+    def set_visible(self, visible):
+        """Stack visible lanes.
+
+        Parameters
+        ----------
+        visible : array_like
+            Boolean array of shape (n_channels,).
+        """
+        visible = np.asarray(visible, dtype=bool)
+        if np.array_equal(visible, self.visible):
+            return
+        for lane in self._lanes:
+            for w in lane.widgets:
+                self._grid.remove_widget(w)
+                w.parent = self._hidden
+        for row, k in enumerate(np.flatnonzero(visible)):
+            for col, w in enumerate(self._lanes[k].widgets):
+                self._grid.add_widget(w, row=row, col=col)
+        self.visible = visible.copy()
+        self.canvas.update()
+
+    def close(self):
+        """Close the canvas and release its GL context."""
+        self.canvas.close()
+
+    def lane_at(self, pos):
+        """Get the channel under a position.
+
+        Parameters
+        ----------
+        pos : array_like
+            The (x, y) position in the canvas (e.g. event.pos).
+
+        Returns
+        -------
+        idx : int
+            Index of the channel (-1 if there's no visible lane).
+        """
+        # Lanes are in grid coordinates and share the spacing between them :
+        y = pos[1] - self._grid.pos[1]
+        half = self._grid.spacing / 2.
+        for k in np.flatnonzero(self.visible):
+            wc = self._lanes[k].wc
+            if wc.pos[1] - half <= y < wc.pos[1] + wc.size[1] + half:
+                return int(k)
+        return -1
@@ -1,15 +1,13 @@
 """Top level Sleep class."""
 import logging
 
-import numpy as np
-
 import vispy.scene.cameras as viscam
 
 from .interface import UiInit, UiElements
 from .visuals import Visuals
 from ..pyqt_module import PyQtModule
-from ..utils import (FixedCam, color2vb, MouseEventControl)
-from ..io import ReadSleepData
+from ..utils import (FixedCam, color2vb, MouseEventControl, chunked_stats)
+from ..io import ReadSleepData, AnnotationStore
 from ..config import PROFILER
 
 logger = logging.getLogger('visbrain')
@@ -62,6 +60,12 @@ class Sleep(PyQtModule, ReadSleepData, UiInit, Visuals, UiElements,
         Force to load the file using mne.io functions.
     kwargs_mne : dict | {}
         Dictionary to pass to the mne.io loading function.
+    cache : bool | string | False
+        Use an on-disk session cache when data is a path to a file. The
+        decimated data, the hypnogram, spectrograms and detections are saved
+        in a '.vbcache' folder next to the file (or in the folder given as a
+        string) and reloaded on the next opening. The cache is invalidated if
+        the file or the loading parameters change.
 
     Notes
     -----
@@ -81,7 +85,8 @@ class Sleep(PyQtModule, ReadSleepData, UiInit, Visuals, UiElements,
     def __init__(self, data=None, hypno=None, config_file=None,
                  annotations=None, channels=None, sf=None, downsample=100.,
                  axis=True, href=['art', 'wake', 'rem', 'n1', 'n2', 'n3'],
-                 preload=True, use_mne=False, kwargs_mne={}, verbose=None):
+                 preload=True, use_mne=False, kwargs_mne={}, cache=False,
+                 verbose=None):
         """Init."""
         PyQtModule.__init__(self, verbose=verbose, icon='sleep_icon.svg')
         # ====================== APP CREATION ======================
@@ -97,12 +102,12 @@ class Sleep(PyQtModule, ReadSleepData, UiInit, Visuals, UiElements,
         PROFILER("Import file", as_type='title')
         ReadSleepData.__init__(self, data, channels, sf, hypno, href, preload,
                                use_mne, downsample, kwargs_mne,
-                               annotations)
+                               annotations, cache)
 
         # ====================== VARIABLES ======================
         # Check all data :
         self._config_file = config_file
-        self._annot_mark = np.array([])
+        self._annot = AnnotationStore()
         self._hconvinv = {v: k for k, v in self._hconv.items()}
         self._ax = axis
         # ---------- Default line width ----------
@@ -160,6 +165,15 @@ class Sleep(PyQtModule, ReadSleepData, UiInit, Visuals, UiElements,
         self._fcns_on_creation()
         PROFILER("Functions on creation")
 
+    def closeEvent(self, event):  # noqa
+        """Save the edited hypnogram in the session cache and close.
+
+        The hypnogram is saved down-sampled (as displayed).
+        """
+        if self._cache is not None:
+            self._cache.save('hypno-edited', self._hyp.gui_to_hyp())
+        PyQtModule.closeEvent(self, event)
+
     def __len__(self):
         """Return the number of channels."""
         return len(self._channels)
@@ -223,9 +237,9 @@ class Sleep(PyQtModule, ReadSleepData, UiInit, Visuals, UiElements,
     ###########################################################################
     def _get_data_info(self):
         """Get some info about data (min, max, std, mean, dist)."""
-        self._datainfo = {'min': self._data.min(1), 'max': self._data.max(1),
-                          'std': self._data.std(1), 'mean': self._data.mean(1),
-                          'dist': self._data.max(1) - self._data.min(1)}
+        stats = ('min', 'max', 'std', 'mean', 'ptp')
+        self._datainfo = chunked_stats(self._data, axis=1, stats=stats)
+        self._datainfo['dist'] = self._datainfo.pop('ptp')
 
     def _set_default_state(self):
         """Set the default window state."""
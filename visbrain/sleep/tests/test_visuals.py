@@ -0,0 +1,113 @@
+"""Test visuals of the Sleep module."""
+import numpy as np
+from vispy import scene
+
+from visbrain.sleep.visuals.events import Events, TEX_WIDTH
+from visbrain.sleep.visuals.visuals import _line_set_subdata
+from visbrain.sleep.interface.ui_init import ChannelCanvas, TimeAxis
+
+
+def _create_events():
+    """Create events over a channel line."""
+    time = np.arange(10000) / 100.
+    pos = np.c_[time, np.random.rand(len(time)), np.zeros_like(time)]
+    line = scene.visuals.Line(pos.astype(np.float32), method='gl')
+    return Events(line, time, color='red')
+
+
+class TestVisuals(object):
+    """Test visuals of the Sleep module."""
+
+    def test_events(self):
+        """Test setting events."""
+        ev = _create_events()
+        events = np.array([[300, 400], [10, 20], [15, 50]])
+        ev.set_events(events)
+        np.testing.assert_array_equal(ev.index, events)
+        # Bounds are sorted and overlapping events are merged :
+        bounds = ev._bounds.ravel()[0:6].reshape(-1, 2)
+        np.testing.assert_array_equal(bounds, [[10, 20], [15, 50],
+                                               [300, 400]])
+        ev.clear()
+        assert not len(ev.index)
+
+    def test_events_append(self):
+        """Test appending events."""
+        ev = _create_events()
+        n = TEX_WIDTH
+        events = np.c_[np.arange(n) * 4, np.arange(n) * 4 + 2]
+        ev.set_events(events[0:n // 2])
+        ev.set_events(events)
+        assert ev._bounds.shape == (2, TEX_WIDTH)
+        np.testing.assert_array_equal(ev._bounds.ravel()[0:2 * n],
+                                      events.ravel())
+        ev.color = 'blue'
+        np.testing.assert_array_equal(ev.color, (0., 0., 1., 1.))
+
+    def test_line_set_subdata(self):
+        """Test sending a part of a line to the GPU."""
+        pos = np.random.rand(100, 2).astype(np.float32)
+        line = scene.visuals.Line(pos, color=np.ones((100, 4)), method='gl')
+        line._changed.update(pos=False, color=False)
+        line._line_visual._pos_vbo.set_data(line.pos)
+        line._line_visual._color_vbo.set_data(line.color.astype(np.float32))
+        line.pos[10:20, 1] = 2.
+        _line_set_subdata(line, 10, 20)
+        assert not line._changed['pos'] and not line._changed['color']
+        # Lines without VisPy buffers are entirely updated :
+
+        class _Line(object):
+            def set_data(self, pos=None, color=None):
+                self.updated = (pos, color)
+        fake = _Line()
+        fake.pos, fake.color = pos, 'red'
+        _line_set_subdata(fake, 10, 20)
+        assert fake.updated == (pos, 'red')
+
+    def test_channel_canvas(self):
+        """Test stacking lanes of channels in a single canvas."""
+        cc = ChannelCanvas(['Cz', 'Fz', 'Pz'])
+        assert len(cc) == 3
+        assert all(lane.canvas is cc.canvas for lane in cc)
+        cc.set_visible([True, False, True])
+        assert cc[0].wc.parent is cc._grid
+        assert cc[1].wc.parent is cc._hidden
+        assert cc[2].yaxis.parent is cc._grid
+        # Axis stay linked to hidden lanes :
+        cc[1].set_camera(scene.PanZoomCamera())
+        cc.set_visible([False, True, False])
+        assert cc[1].wc.parent is cc._grid
+        assert cc[0].wc.parent is cc._hidden
+        assert cc.lane_at((0., -100.)) == -1
+
+    def test_channel_canvas_lane_at(self):
+        """Test getting the channel under a position."""
+        cc = ChannelCanvas(['Cz', 'Fz', 'Pz', 'Oz'])
+        cc.set_visible([True, False, True, True])
+        cc.canvas.size = (800, 600)
+        cc.canvas.events.resize(size=(800, 600))
+        cc._grid._update_child_widget_dim()  # the grid is solved on draw
+        # Lanes of 180px separated by 20px :
+        for k, y in zip([0, 2, 3], [0., 200., 400.]):
+            assert cc[k].wc.pos[1] == y and cc[k].wc.size[1] == 180.
+            assert cc.lane_at((400., y + 90.)) == k
+        # The spacing between lanes is shared :
+        assert cc.lane_at((400., 185.)) == 0
+        assert cc.lane_at((400., 195.)) == 2
+        assert cc.lane_at((400., 395.)) == 3
+        assert cc.lane_at((400., 595.)) == -1
+        cc.close()
+
+    def test_time_axis_markers(self):
+        """Test that markers are only sent when they have changed."""
+        ax = TimeAxis()
+        middle = np.array([1., 5., 8.])
+        ax.set_data(markers=middle[0:2])
+        last = ax._markers[0]
+        ax.set_data(markers=middle[0:2])  # same values, new array
+        assert ax._markers[0] is last
+        middle[0] = 2.  # inplace edit
+        ax.set_data(markers=middle[0:2])
+        np.testing.assert_array_equal(ax._markers[0], [2., 5.])
+        ax.set_data(markers=middle[0:2], unit='minutes')
+        assert ax._markers[1] == 60.
@@ -0,0 +1,209 @@
+"""Events visual and shader definitions.
+
+Events are highlighted over the line of a channel. Instead of building the
+position and connectivity of every sample covered by events, the (start, stop)
+samples of events are stored in a small float texture and the vertex shader
+draws the position buffer that is already uploaded for the channel line,
+keeping only samples that fall inside an event. GPU memory scales with the
+number of events rather than the number of samples covered by events.
+
+Sample indices are float32 on the GPU (texture of bounds and time of the
+line), so they are exact up to 2 ** 24 samples (e.g 46h at 100Hz or 4.6h at
+1000Hz). Events of longer channels can be drawn a few samples off.
+"""
+import logging
+
+import numpy as np
+
+from vispy.color import Color
+from vispy.gloo import Texture2D
+from vispy.visuals.visual import Visual
+from vispy.scene import visuals
+
+__all__ = ['Events']
+
+TEX_WIDTH = 1024
+N_SEARCH = 24  # up to 2 ** 24 events
+MAX_SAMPLES = 2 ** 24  # exact float32 sample indices
+
+logger = logging.getLogger('visbrain')
+
+
+vert = """
+uniform sampler2D u_events;
+uniform vec2 u_shape;
+uniform float u_n_events;
+uniform vec2 u_time;
+uniform float u_z;
+attribute vec3 a_position;
+varying float v_inside;
+
+float get_bound(float i) {
+    // Events are stored as interleaved (start, stop) in the texture :
+    float row = floor(i / u_shape.y);
+    float col = i - row * u_shape.y;
+    return texture2D(u_events, vec2((col + .5) / u_shape.y,
+                                    (row + .5) / u_shape.x)).r;
+}
+
+void main (void) {
+    float idx = floor((a_position.x - u_time.x) / u_time.y + .5);
+    // Binary search of the last event starting before the sample :
+    float lo = 0.;
+    float hi = u_n_events;
+    for (int k = 0; k < $n_search; k++) {
+        float mid = floor((lo + hi) / 2.);
+        if (hi - lo > 1.) {
+            if (get_bound(2. * mid) <= idx)
+                lo = mid;
+            else
+                hi = mid;
+        }
+    }
+    v_inside = float((get_bound(2. * lo) <= idx) &&
+                     (idx <= get_bound(2. * lo + 1.)));
+    gl_Position = $transform(vec4(a_position.xy, u_z, 1.));
+}
+"""
+
+
+frag = """
+uniform vec4 u_color;
+varying float v_inside;
+void main() {
+    // Discard segments that join a sample outside events :
+    if (v_inside < .99)
+        discard;
+    gl_FragColor = u_color;
+}
+"""
+
+
+class EventsVisual(Visual):
+    """Visual highlighting events over the line of a channel.
+
+    Parameters
+    ----------
+    line : Line
+        The line of the channel (with method='gl'). The position buffer of
+        the line is shared with events.
+    time : array_like
+        Time vector of the channel (evenly spaced).
+    color : string | tuple
+        Color of events.
+    width : float | 4.
+        Line width.
+    z : float | 2.
+        Depth of events.
+
+    Notes
+    -----
+    Sample indices are exact up to MAX_SAMPLES (2 ** 24) samples.
+    """
+
+    def __init__(self, line, time, color='red', width=4., z=2.):
+        self._events = np.zeros((0, 2), dtype=int)
+        self._bounds = np.zeros((1, TEX_WIDTH), dtype=np.float32)
+        self._texture = Texture2D(self._bounds, format='luminance',
+                                  internalformat='r32f',
+                                  interpolation='nearest')
+        Visual.__init__(self, vcode=vert, fcode=frag)
+        self.set_gl_state('translucent', line_width=width)
+        self._draw_mode = 'line_strip'
+        self.shared_program.vert['n_search'] = str(N_SEARCH)
+        self.shared_program['u_events'] = self._texture
+        self.shared_program['u_shape'] = self._bounds.shape
+        self.shared_program['u_n_events'] = 0.
+        self.shared_program['u_z'] = z
+        if len(time) > MAX_SAMPLES:
+            logger.warning("Events of channels longer than %i samples can be "
+                           "drawn a few samples off" % MAX_SAMPLES)
+        dt = time[1] - time[0] if len(time) > 1 else 1.
+        self.shared_program['u_time'] = (float(time[0]), float(dt))
+        self.shared_program['a_position'] = line._line_visual._pos_vbo
+        self.color = color
+        self.freeze()
+
+    def set_events(self, events):
+        """Set events.
+
+        Only the texels of new events are uploaded when events are appended
+        (i.e if old events are the first new events).
+
+        Parameters
+        ----------
+        events : array_like
+            Array of (start, stop) samples (stop included) of shape
+            (n_events, 2).
+        """
+        events = np.asarray(events, dtype=int).reshape(-1, 2)
+        n_old = len(self._events)
+        appended = (len(events) >= n_old) and np.array_equal(
+            events[0:n_old], self._events)
+        if appended and (len(events) == n_old):
+            return
+        # Events are sorted by starting sample and the stop of each event is
+        # the furthest stop of previous events. Hence, a sample is inside an
+        # event if the stop of the last event starting before it is after :
+        start = 0
+        bounds = events[np.argsort(events[:, 0], kind='mergesort')]
+        bounds[:, 1] = np.maximum.accumulate(bounds[:, 1]) if len(
+            bounds) else bounds[:, 1]
+        if appended and n_old:
+            # Check that the sorted bounds of old events are unchanged :
+            old = self._bounds.ravel()[0:2 * n_old].reshape(-1, 2)
+            if np.array_equal(bounds[0:n_old], old):
+                start = n_old
+        self._upload(bounds.ravel(), 2 * start)
+        self._events = events
+        self.shared_program['u_n_events'] = float(len(events))
+        self.update()
+
+    def _upload(self, bounds, start):
+        """Upload bounds from the index start."""
+        n_rows = max(int(np.ceil(len(bounds) / TEX_WIDTH)), 1)
+        if n_rows > len(self._bounds):
+            # Grow the texture by doubling its number of rows :
+            data = np.zeros((max(n_rows, 2 * len(self._bounds)), TEX_WIDTH),
+                            dtype=np.float32)
+            data.ravel()[0:len(bounds)] = bounds
+            self._bounds = data
+            self._texture.set_data(data)
+            self.shared_program['u_shape'] = data.shape
+        else:
+            self._bounds.ravel()[start:len(bounds)] = bounds[start:]
+            rows = slice(start // TEX_WIDTH, n_rows)
+            self._texture.set_data(self._bounds[rows], offset=(rows.start, 0))
+
+    def clear(self):
+        """Remove every events."""
+        self.set_events(np.zeros((0, 2), dtype=int))
+
+    @property
+    def color(self):
+        """Get the color value."""
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        """Set color value."""
+        self._color = Color(value).rgba
+        self.shared_program['u_color'] = self._color
+        self.update()
+
+    @property
+    def index(self):
+        """Get the (start, stop) samples of events."""
+        return self._events
+
+    def _prepare_transforms(self, view):
+        view.view_program.vert['transform'] = view.transforms.get_transform()
+
+    def _prepare_draw(self, view):
+        return bool(len(self._events))
+
+    def _compute_bounds(self, axis, view):
+        return None
+
+
+Events = visuals.create_visual_node(EventsVisual)  # noqa
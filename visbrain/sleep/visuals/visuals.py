@@ -12,8 +12,8 @@ from vispy import scene
 import vispy.visuals.transforms as vist
 
 from .marker import Markers
+from .events import Events
 from ...utils import (array2colormap, color2vb, PrepareData)
-from ...utils.sleep.event import _index_to_events
 from ...visuals import TopoMesh, TFmapsMesh
 from ...config import PROFILER
 
@@ -33,13 +33,54 @@ Classes below are used to create visual objects, display on sevral canvas :
 """
 
 
+def _line_set_subdata(line, start, stop):
+    """Send positions and colors of a line between start and stop to the GPU.
+
+    The pos and color arrays of the line should have been modified inplace.
+    Buffers that are not uploaded yet are entirely sent on the next draw. If
+    the line doesn't expose VisPy buffers (e.g other VisPy version), the
+    line is entirely updated.
+
+    Parameters
+    ----------
+    line : vispy.scene.visuals.Line
+        The line (with method='gl') to update.
+    start, stop : int
+        Indices of the first and last (excluded) vertices to update.
+    """
+    visual = getattr(line, '_line_visual', None)
+    changed = getattr(line, '_changed', None)
+    if not (isinstance(changed, dict) and
+            all(hasattr(visual, k) for k in ('_pos_vbo', '_color_vbo'))):
+        line.set_data(pos=line.pos, color=line.color)
+        return
+    n = len(line.pos)
+    sl = slice(start, min(stop, n))
+    if not changed.get('pos') and visual._pos_vbo.size == n:
+        pos = np.ascontiguousarray(line.pos[sl], dtype=np.float32)
+        visual._pos_vbo.set_subdata(pos, offset=start)
+    else:
+        changed['pos'] = True
+    if not changed.get('color') and visual._color_vbo.size == n:
+        color = np.ascontiguousarray(line.color[sl], dtype=np.float32)
+        visual._color_vbo.set_subdata(color, offset=start)
+    else:
+        changed['color'] = True
+    line.update()
+
+
 class Detection(object):
-    """Create a detection object."""
+    """Create a detection object.
+
+    Detections (except peaks) are highlighted over the line of each channel
+    (see Events).
+    """
 
     def __init__(self, channels, time, spincol=None, remcol=None,
                  kccol=None, swcol=None, peakcol=None, mtcol=None,
                  spinsym=None, remsym=None, kcsym=None, swsym=None,
-                 peaksym=None, mtsym=None, parent=None, parent_hyp=None):
+                 peaksym=None, mtsym=None, parent=None, parent_hyp=None,
+                 lines=None):
         """Init."""
         self.items = ['Spindles', 'REM', 'K-complexes', 'Slow waves', 'Peaks',
                       'Muscle twitches']
@@ -58,11 +99,11 @@ class Detection(object):
         for num, k in enumerate(self):
             self[k] = {'index': np.array([]), 'color': col[k[1]],
                        'connect': np.array([]), 'sym': sym[k[1]]}
-            par = parent[self.chans.index(k[0])]
+            nb = self.chans.index(k[0])
+            par = parent[nb]
             if k[1] is not 'Peaks':
-                self.line[k] = scene.visuals.Line(method='gl', parent=par,
-                                                  color=col[k[1]])
-                self.line[k].set_gl_state('translucent')
+                self.line[k] = Events(lines[nb], time, color=col[k[1]],
+                                      parent=par)
             else:
                 pos = np.full((1, 3), -10., dtype=np.float32)
                 self.peaks[k] = Markers(pos=pos, parent=par,
@@ -92,27 +133,18 @@ class Detection(object):
             Data vector for a spcefic channel.
         """
         for num, k in enumerate(self):
-            if self[k]['index'].size:
+            if k[1] is not 'Peaks':
+                # Only new events are uploaded :
+                self.line[k].set_events(self[k]['index'])
+            elif self[k]['index'].size:
                 # Get the channel number :
                 nb = self.chans.index(k[0])
-                # Send data :
-                if k[1] is 'Peaks':
-                    # Get index and channel number :
-                    index = self[k]['index'][:, 0]
-                    z = np.full(len(index), 2., dtype=np.float32)
-                    pos = np.vstack((self.time[index], data[nb, index], z)).T
-                    self.peaks[k].set_data(pos=pos, edge_width=0.,
-                                           face_color=self[k]['color'])
-                else:
-                    # Get index and channel number :
-                    index = _index_to_events(self[k]['index'])
-                    z = np.full(index.shape, 2., dtype=np.float32)
-                    # Build position vector :
-                    pos = np.vstack((self.time[index], data[nb, index], z)).T
-                    # Build connections :
-                    connect = np.gradient(index) == 1.
-                    connect[0], connect[-1] = True, False
-                    self.line[k].set_data(pos=pos, width=4., connect=connect)
+                # Get index and channel number :
+                index = self[k]['index'][:, 0]
+                z = np.full(len(index), 2., dtype=np.float32)
+                pos = np.vstack((self.time[index], data[nb, index], z)).T
+                self.peaks[k].set_data(pos=pos, edge_width=0.,
+                                       face_color=self[k]['color'])
 
     def build_hyp(self, chan, types):
         """Build hypnogram report.
@@ -164,8 +196,7 @@ class Detection(object):
         if types == 'Peaks':
             self.peaks[(chan, types)].set_data(pos=pos)
         else:
-            self.line[(chan, types)].set_data(pos=pos,
-                                              connect=np.array([False]))
+            self.line[(chan, types)].clear()
         # Remove data from hypnogram :
         self.hyp.set_data(pos=pos)
 
@@ -433,7 +464,8 @@ class Spectrogram(PrepareData):
 
     def set_data(self, sf, data, time, method='Fourier transform',
                  cmap='rainbow', nfft=30., overlap=0., fstart=.5, fend=20.,
-                 contrast=.5, interp='nearest', norm=0):
+                 contrast=.5, interp='nearest', norm=0, cache=None,
+                 cache_key=None):
         """Set data to the spectrogram.
 
         Use this method to change data, colormap, spectrogram settings, the
@@ -465,18 +497,23 @@ class Spectrogram(PrepareData):
             Interpolation method.
         norm : int | 0
             Normalization method for TF.
+        cache : SessionCache | None
+            Session cache in which spectrograms are saved (the wavelet method
+            is not cached).
+        cache_key : tuple | None
+            Key of the data in the session cache.
         """
         # =================== PREPARE DATA ===================
-        # Prepare data (only if needed)
-        if self:
-            data = self._prepare_data(sf, data.copy(), time)
+        def _prepare():
+            # Prepare data (only if needed)
+            return self._prepare_data(sf, data.copy(), time) if self else data
 
         nperseg = int(round(nfft * sf))
 
         # =================== TF // SPECTRO ===================
         if method == 'Wavelet':
-            self.tf.set_data(data, sf, f_min=fstart, f_max=fend, cmap=cmap,
-                             contrast=contrast, n_window=nperseg,
+            self.tf.set_data(_prepare(), sf, f_min=fstart, f_max=fend,
+                             cmap=cmap, contrast=contrast, n_window=nperseg,
                              overlap=overlap, window='hamming', norm=norm)
             self.tf._image.interpolation = interp
             self.rect = self.tf.rect
@@ -485,18 +522,28 @@ class Spectrogram(PrepareData):
             # =================== CONVERSION ===================
             overlap = int(round(overlap * nperseg))
 
-            if method == 'Multitaper':
-                from lspopt import spectrogram_lspopt
-                freq, _, mesh = spectrogram_lspopt(data, fs=sf,
-                                                   nperseg=nperseg,
-                                                   c_parameter=20,
-                                                   noverlap=overlap)
-            elif method == 'Fourier transform':
-                freq, _, mesh = scpsig.spectrogram(data, fs=sf,
-                                                   nperseg=nperseg,
-                                                   noverlap=overlap,
-                                                   window='hamming')
-            mesh = 20 * np.log10(mesh)
+            def _spectrogram():
+                x = _prepare()
+                if method == 'Multitaper':
+                    from lspopt import spectrogram_lspopt
+                    freq, _, mesh = spectrogram_lspopt(x, fs=sf,
+                                                       nperseg=nperseg,
+                                                       c_parameter=20,
+                                                       noverlap=overlap)
+                elif method == 'Fourier transform':
+                    freq, _, mesh = scpsig.spectrogram(x, fs=sf,
+                                                       nperseg=nperseg,
+                                                       noverlap=overlap,
+                                                       window='hamming')
+                return freq, 20 * np.log10(mesh)
+
+            if cache is None:
+                freq, mesh = _spectrogram()
+            else:
+                prep = self._get_key() if self else None
+                freq, mesh = cache.get('spec', _spectrogram, key=cache_key,
+                                       method=method, nperseg=nperseg,
+                                       overlap=overlap, prep=prep, sf=sf)
 
             # =================== FREQUENCY SELECTION ===================
             # Find where freq is [fstart, fend] :
@@ -626,10 +673,9 @@ class Hypnogram(object):
         if (self._hconv != self._hconvinv) and convert:
             data = self.hyp_to_gui(data)
         # Build color array :
-        color = np.zeros((len(data), 4), dtype=np.float32)
-        for k, v in zip(self.color.keys(), self.color.values()):
-            # Set the stage color :
-            color[data == k, :] = v
+        stages = list(self.color.keys())
+        colors = np.vstack([self.color[k] for k in stages] + [np.zeros(4)])
+        color = colors[self._lookup(data, stages)].astype(np.float32)
         # Avoid gradient color :
         color[1::, :] = color[0:-1, :]
         # Set data to the mesh :
@@ -658,7 +704,11 @@ class Hypnogram(object):
         self.mesh.color[stfrom + 1:stend + 1, :] = self.color[stagec]
         # Only update the needed part :
         self.mesh.pos[stfrom:stend, 1] = -float(stagec)
-        self.mesh.update()
+        self._update_buffers(stfrom, stend + 1)
+
+    def _update_buffers(self, start, stop):
+        """Send positions and colors between start and stop to the GPU."""
+        _line_set_subdata(self.mesh, start, stop)
 
     def set_grid(self, time, length=30., y=1.):
         """Set grid lentgh."""
@@ -684,13 +734,9 @@ class Hypnogram(object):
         datac : array_like
             Converted data
         """
-        # Backup copy :
-        datac = data.copy()
-        data = np.zeros_like(datac)
-        # Fill new data :
-        for k in self._hconv.keys():
-            data[datac == k] = self._hconv[k]
-        return data
+        keys = list(self._hconv.keys())
+        values = np.array([self._hconv[k] for k in keys] + [0])
+        return values[self._lookup(data, keys)].astype(data.dtype)
 
     def gui_to_hyp(self):
         """Convert GUI hypnogram into data.
@@ -702,11 +748,33 @@ class Hypnogram(object):
         """
         # Get latest data version :
         datac = -self.mesh.pos[:, 1]
-        data = np.zeros_like(datac)
-        # Fill new data :
-        for k in self._hconvinv.keys():
-            data[datac == k] = self._hconvinv[k]
-        return data
+        keys = list(self._hconvinv.keys())
+        values = np.array([self._hconvinv[k] for k in keys] + [0])
+        return values[self._lookup(datac, keys)].astype(datac.dtype)
+
+    @staticmethod
+    def _lookup(data, keys):
+        """Get the index of each value of data in keys (len(keys) if absent).
+
+        Parameters
+        ----------
+        data : array_like
+            Row vector of stages.
+        keys : list
+            List of stages.
+
+        Returns
+        -------
+        index : array_like
+            Index of the same shape as data.
+        """
+        keys = np.asarray(keys, dtype=float)
+        order = np.argsort(keys)
+        pos = np.searchsorted(keys[order], data)
+        pos = np.clip(pos, 0, len(keys) - 1)
+        index = order[pos]
+        index[keys[index] != data] = len(keys)
+        return index
 
     def clean(self, sf, time):
         """Clean indicators."""
@@ -945,18 +1013,13 @@ class CanvasShortcuts(object):
         def on_mouse_release(event):
             """Executed function when the mouse is pressed over canvas.
 
-            This method set the transformation to the canvas to NullTransform.
+            This method set the transformation of channels to NullTransform.
             """
-            # Get canvas name :
-            name = canvas.title
-            condition = bool(name.find('Canvas') + 1)
-            if condition and not self._slMagnify.isChecked():
-                # Get channel name :
-                chan = name.split('Canvas_')[1]
-                # Get index :
-                idx = self._channels.index(chan)
-                # Build transformation :
-                self._chan.node[idx].transform = vist.NullTransform()
+            is_chan = canvas is self._chanCanvas.canvas
+            if is_chan and not self._slMagnify.isChecked():
+                for k in self._chan.node:
+                    if not isinstance(k.transform, vist.NullTransform):
+                        k.transform = vist.NullTransform()
 
         @canvas.events.mouse_double_click.connect
         def on_mouse_double_click(event):
@@ -964,9 +1027,15 @@ class CanvasShortcuts(object):
 
             :event: the trigger event
             """
-            # Get canvas title :
+            # Get canvas title (or the channel under the cursor) :
             is_sp_hyp = canvas.title in ['Hypnogram', 'Spectrogram']
-            title = canvas.title if is_sp_hyp else canvas.title.split('_')[1]
+            if canvas is self._chanCanvas.canvas:
+                idx = self._chanCanvas.lane_at(event.pos)
+                if idx < 0:
+                    return
+                title = self._channels[idx]
+            else:
+                title = canvas.title
             # Annotate the timing :
             if is_sp_hyp:
                 cursor = self._time[-1] * event.pos[0] / canvas.size[0]
@@ -1016,15 +1085,15 @@ class CanvasShortcuts(object):
             Magnigy the signal under the mouse cursor only.
             """
             # ------------- MAGNIFY : CTRL + left click -------------
-            name = canvas.title
+            is_chan = canvas is self._chanCanvas.canvas
             is_left = self._is_left_click(event)
             is_ctrl = self._is_modifier(event, 'Control')
-            condition = bool(name.find('Canvas') + 1) and is_left and is_ctrl
+            condition = is_chan and is_left and is_ctrl
             if condition and not self._slMagnify.isChecked():
-                # Get channel name :
-                chan = name.split('Canvas_')[1]
-                # Get index :
-                idx = self._channels.index(chan)
+                # Get the channel under the cursor :
+                idx = self._chanCanvas.lane_at(event.pos)
+                if idx < 0:
+                    return
                 # Get cursor position :
                 val = self._SlVal.value()
                 step = self._SigSlStep.value()
@@ -1063,7 +1132,8 @@ class Visuals(CanvasShortcuts):
         self._spec = Spectrogram(camera=cameras[1],
                                  fcn=self._fcn_spec_set_data,
                                  parent=self._specCanvas.wc.scene)
-        self._spec.set_data(sf, data[0, ...], time, cmap=self._defcmap)
+        self._spec.set_data(sf, data[0, ...], time, cmap=self._defcmap,
+                            cache=self._cache, cache_key=(self._data_key, 0))
         PROFILER('Spectrogram', level=1)
         # Create a visual indicator for spectrogram :
         self._specInd = Indicator(name='spectro_indic', visible=True, alpha=.3,
@@ -1090,7 +1160,8 @@ class Visuals(CanvasShortcuts):
                                  self._defsw, self._defpeaks, self._defmt,
                                  self._spinsym, self._remsym, self._kcsym,
                                  self._swsym, self._peaksym, self._mtsym,
-                                 self._chan.node, self._hypCanvas.wc.scene)
+                                 self._chan.node, self._hypCanvas.wc.scene,
+                                 self._chan.mesh)
         PROFILER('Detections', level=1)
 
         # =================== TOPOPLOT ===================
@@ -1103,7 +1174,7 @@ class Visuals(CanvasShortcuts):
         PROFILER('Topoplot', level=1)
 
         # =================== SHORTCUTS ===================
-        vbcanvas = self._chanCanvas + [self._specCanvas, self._hypCanvas]
+        vbcanvas = [self._chanCanvas, self._specCanvas, self._hypCanvas]
         for k in vbcanvas:
             CanvasShortcuts.__init__(self, k.canvas)
         self._shpopup.set_shortcuts(self.sh)
@@ -49,3 +49,40 @@ def test_import_topo():
 def test_import_colorbar():
     """Import the Topo module."""
     from visbrain import Colorbar  # noqa
+
+
+def test_import_headless():
+    """Import non-graphical entry points without Qt."""
+    import sys
+    import subprocess
+    code = ("import sys; import visbrain, visbrain.io, "
+            "visbrain.utils.sleep.detection; "
+            "assert 'PyQt5' not in sys.modules; "
+            "assert 'vispy.app' not in sys.modules")
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+def test_utils_public_names():
+    """Test the lazy public API of visbrain.utils."""
+    import types
+    from importlib import import_module
+    import visbrain.utils as utils
+    for sub, names in utils._SUBMODULES.items():
+        module = import_module('visbrain.utils.' + sub)
+        public = getattr(module, '__all__', None) or [
+            k for k in dir(module) if not k.startswith('_') and not
+            isinstance(getattr(module, k), types.ModuleType)]
+        assert sorted(public) == sorted(names), sub
+    assert set(utils.__all__) <= set(dir(utils))
+
+
+def test_utils_lazy_import():
+    """Test that unknown names of visbrain.utils don't import sub-modules."""
+    import sys
+    import subprocess
+    code = ("import sys; import visbrain.utils as u; "
+            "assert not hasattr(u, 'nothing'); "
+            "assert 'visbrain.utils.gui' not in sys.modules; "
+            "ns = {}; exec('from visbrain.utils import *', ns); "
+            "assert 'array2colormap' in ns and 'Montage' in ns")
+    subprocess.check_call([sys.executable, '-c', code])
@@ -1,15 +1,70 @@
-from .cameras import *
-from .color import *
-from .filtering import *
-from .gui import *
-from .guitools import *
-from .logging import *
-from .memory import *
-from .mesh import *
-from .others import *
-from .physio import *
-from .picture import *
-from .sigproc import *
-from .sleep import *
-from .transform import *
-from .wrappers import *
+"""Utility functions.
+
+Sub-modules are imported on first access so that Qt dependent modules (gui,
+guitools) are only imported when needed.
+"""
+import sys
+from importlib import import_module
+
+# Public names of each sub-module :
+_SUBMODULES = dict(
+    logging=['set_log_level'],
+    profiling=['Tracer', 'TRACER', 'traced'],
+    memory=['id', 'arrays_share_data', 'code_timer', 'LRUCache', 'Prefetcher',
+            'is_lazy_array', 'check_lazy_array', 'iter_chunks',
+            'chunked_stats', 'as_float32'],
+    wrappers=['wrap_properties'],
+    sigproc=['normalize', 'derivative', 'tkeo', 'zerocrossing',
+             'power_of_ten', 'averaging', 'normalization', 'smoothing',
+             'smooth_3d'],
+    filtering=['filt', 'morlet', 'ndmorlet', 'morlet_power', 'welch_power',
+               'PrepareData'],
+    physio=['find_non_eeg', 'rereferencing', 'bipolarization',
+            'commonaverage', 'montage_matrix', 'Montage', 'tal2mni',
+            'mni2tal', 'load_predefined_roi', 'generate_eeg'],
+    sleep=['HypnoTally', 'kcdetect', 'mtdetect', 'peakdetect', 'remdetect',
+           'sleepstats', 'slowwavedetect', 'spindlesdetect', 'transient'],
+    others=['Profiler', 'get_dsf', 'set_if_not_none'],
+    mesh=['vispy_array', 'convert_meshdata', 'volume_to_mesh',
+          'smoothing_matrix', 'mesh_edges', 'laplacian_smoothing',
+          'mesh_ray_grids', 'points_in_mesh'],
+    transform=['vprescale', 'vprecenter', 'vpnormalize', 'array_to_stt',
+               'stt_to_array'],
+    cameras=['FixedCam', 'rotate_turntable', 'optimal_scale_factor',
+             'merge_cameras'],
+    color=['color2vb', 'array2colormap', 'cmap_to_glsl', 'dynamic_color',
+           'color2faces', 'type_coloring', 'mpl_cmap', 'color2tuple',
+           'mpl_cmap_index'],
+    picture=['piccrop', 'picresize'],
+    guitools=['slider2opacity', 'textline2color', 'color2json', 'ndsubplot',
+              'combo', 'is_color', 'MouseEventControl', 'disconnect_all',
+              'extend_combo_list', 'get_combo_list_index', 'safely_set_cbox',
+              'safely_set_spin', 'safely_set_slider', 'toggle_enable_tab',
+              'get_screen_size', 'set_widget_size', 'fill_pyqt_table',
+              'ArrayTableModel'],
+    gui=['HelpMenu', 'ScreenshotPopup', 'ShortcutPopup', 'Ui_Screenshot'],
+)
+_NAMES = {name: sub for sub, names in _SUBMODULES.items() for name in names}
+
+__all__ = list(_NAMES.keys())
+
+
+def __getattr__(name):
+    """Import sub-modules on first access."""
+    if name in _SUBMODULES:
+        return import_module('.' + name, __name__)
+    elif name in _NAMES:
+        attr = getattr(import_module('.' + _NAMES[name], __name__), name)
+        globals()[name] = attr
+        return attr
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    """List module attributes, including lazy ones."""
+    return sorted(set(list(globals().keys()) + __all__))
+
+
+if sys.version_info < (3, 7):  # no module __getattr__ (PEP 562)
+    for _name in __all__:
+        __getattr__(_name)
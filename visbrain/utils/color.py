@@ -9,17 +9,22 @@ import numpy as np
 
 from vispy.color.colormap import Colormap
 
+import matplotlib as mpl
 from matplotlib import cm
 import matplotlib.colors as mplcol
 from warnings import warn
 
 from .sigproc import normalize
+from .profiling import traced
 
 
 __all__ = ('color2vb', 'array2colormap', 'cmap_to_glsl', 'dynamic_color',
            'color2faces', 'type_coloring', 'mpl_cmap', 'color2tuple',
            'mpl_cmap_index')
 
+# Cached lookup tables of named colormaps (see _get_cmap_lut) :
+_CMAP_LUT = {}
+
 
 def color2vb(color=None, default=(1., 1., 1.), length=1, alpha=1.0,
              faces_index=False):
@@ -118,11 +123,58 @@ def color2tuple(color, astype=np.float32, rmalpha=True, roundto=2):
         return tuple(ccol)
 
 
+def _get_cmap_lut(cmap, n_colors=1024):
+    """Get the lookup table of a colormap.
+
+    Lookup tables of named colormaps are cached. The table can't have more
+    colors than the colormap (cmap.N) so that quantized colors are the ones
+    of matplotlib.
+
+    Parameters
+    ----------
+    cmap : string | matplotlib.colors.Colormap
+        Matplotlib colormap name or instance.
+    n_colors : int | 1024
+        Maximum number of colors in the lookup table.
+
+    Returns
+    -------
+    lut : array_like
+        Read-only array of RGBA colors of shape (min(n_colors, cmap.N), 4)
+        and type float32.
+    """
+    key = (cmap, n_colors) if isinstance(cmap, str) else None
+    if key in _CMAP_LUT:
+        return _CMAP_LUT[key]
+    if isinstance(cmap, str):
+        if hasattr(mpl, 'colormaps'):  # matplotlib >= 3.5
+            cmap_obj = mpl.colormaps[cmap]
+        else:
+            cmap_obj = cm.get_cmap(cmap)
+    else:
+        cmap_obj = cmap
+    if n_colors >= cmap_obj.N:  # exact colors of the colormap
+        lut = cmap_obj(np.arange(cmap_obj.N))
+    else:
+        lut = cmap_obj(np.linspace(0., 1., n_colors))
+    lut = lut.astype(np.float32)
+    lut.flags.writeable = False
+    if key is not None:
+        _CMAP_LUT[key] = lut
+    return lut
+
+
+@traced('utils.array2colormap')
 def array2colormap(x, cmap='inferno', clim=None, alpha=1.0, vmin=None,
                    vmax=None, under='dimgray', over='darkred',
-                   translucent=None, faces_render=False):
+                   translucent=None, faces_render=False, out=None,
+                   n_colors=1024):
     """Transform an array of data into colormap (array of RGBA).
 
+    Data are quantized into a cached lookup table of the colormap. Under,
+    over, bad (NaN / masked values) and translucent colors are handled by
+    the quantization step so that colors are obtained using a single gather.
+
     Parameters
     ----------
     x: array
@@ -155,6 +207,13 @@ def array2colormap(x, cmap='inferno', clim=None, alpha=1.0, vmin=None,
             * (f_1, None) f_1 <= x are set to translucent
     faces_render : boll | False
         Precise if the render should be applied to faces
+    out : array_like | None
+        Array of type float32 and of shape (*x.shape, 4) in which the colors
+        are written. If None, a new array is created. Ignored if faces_render
+        is True.
+    n_colors : int | 1024
+        Maximum number of colors of the lookup table (limited to the number
+        of colors of the colormap).
 
     Returns
     -------
@@ -162,8 +221,14 @@ def array2colormap(x, cmap='inferno', clim=None, alpha=1.0, vmin=None,
         Array of RGBA colors
     """
     # ================== Check input argument types ==================
-    # Force data to be an array :
-    x = np.asarray(x)
+    # Force data to be an array (masked values use the bad color) :
+    if np.ma.isMaskedArray(x):
+        is_bad = np.ma.getmaskarray(x)
+        x = np.ma.getdata(x)
+    else:
+        x, is_bad = np.asarray(x), None
+    if x.dtype.kind != 'f':
+        x = x.astype(np.float32)
 
     # Check clim :
     clim = (None, None) if clim is None else list(clim)
@@ -174,48 +239,84 @@ def array2colormap(x, cmap='inferno', clim=None, alpha=1.0, vmin=None,
     if (alpha < 0) or (alpha > 1):
         warn("The alpha parameter must be >= 0 and <= 1.")
 
-    # ================== Define colormap ==================
-    sc = cm.ScalarMappable(cmap=cmap)
-
-    # Fix limits :
-    norm = mplcol.Normalize(vmin=clim[0], vmax=clim[1])
-    sc.set_norm(norm)
-
-    # ================== Apply colormap ==================
-    # Apply colormap to x :
-    x_cmap = np.array(sc.to_rgba(x, alpha=alpha))
-
-    # ================== Colormap (under, over) ==================
+    # ================== Lookup table ==================
+    # Rows : [colormap, under, over, bad] (+ translucent copy) :
+    lut = _get_cmap_lut(cmap, n_colors)
+    n_colors = len(lut)
+    n_lut = n_colors + 3
+    n_rep = 1 if translucent is None else 2
+    full_lut = np.empty((n_rep * n_lut, 4), dtype=np.float32)
+    full_lut[0:n_colors, :] = lut
+    full_lut[0:n_colors, -1] = 1. if translucent is not None else alpha
+    full_lut[n_colors, :] = color2vb(under) if under is not None else lut[0]
+    full_lut[n_colors + 1, :] = color2vb(over) if over is not None else lut[-1]
+    full_lut[n_colors + 2, :] = 0.
+    if translucent is not None:
+        full_lut[n_lut::, :] = full_lut[0:n_lut, :]
+        full_lut[n_lut::, -1] = 0.
+        full_lut[0:n_lut, -1] = 1.
+
+    # ================== Quantization ==================
+    if (clim[0] is None) or (clim[1] is None):
+        valid = x if is_bad is None else x[~is_bad]
+        c_min = np.nanmin(valid) if valid.size else 0.
+        c_max = np.nanmax(valid) if valid.size else 0.
+        clim = [c_min if clim[0] is None else clim[0],
+                c_max if clim[1] is None else clim[1]]
+    c_min, c_max = float(clim[0]), float(clim[1])
+    scale = n_colors / (c_max - c_min) if c_max > c_min else 0.
+    idx = np.subtract(x, c_min, dtype=np.float64)
+    idx *= scale
+    np.clip(idx, 0, n_colors - 1, out=idx)
+    is_nan = np.isnan(idx)
+    if is_nan.any():
+        idx[is_nan] = n_colors + 2
+    idx = idx.astype(np.intp)
+    # ================== Colormap (under, over, bad) ==================
     if (vmin is not None) and (under is not None):
-        under = color2vb(under)  # if isinstance(under, str) else under
-        x_cmap[x < vmin, :] = under
+        idx[x < vmin] = n_colors
     if (vmax is not None) and (over is not None):
-        over = color2vb(over)  # if isinstance(over, str) else over
-        x_cmap[x > vmax, :] = over
+        idx[x > vmax] = n_colors + 1
+    if is_bad is not None:
+        idx[is_bad] = n_colors + 2
 
     # ================== Transparency ==================
-    x_cmap = _transclucent_cmap(x, x_cmap, translucent)
+    if translucent is not None:
+        idx[_translucent_index(x, translucent)] += n_lut
+
+    # ================== Gather ==================
+    if faces_render:
+        out = None
+    if out is None:
+        out = np.empty(x.shape + (4,), dtype=np.float32)
+    assert out.shape == x.shape + (4,) and out.dtype == np.float32
+    np.take(full_lut, idx, axis=0, out=out)
 
     # Faces render (repeat the color to other dimensions):
     if faces_render:
-        x_cmap = np.transpose(np.tile(x_cmap[..., np.newaxis],
-                                      (1, 1, 3)), (0, 2, 1))
+        out = np.transpose(np.tile(out[..., np.newaxis], (1, 1, 3)),
+                           (0, 2, 1))
+
+    return out
+
 
-    return x_cmap.astype(np.float32)
+def _translucent_index(x, translucent):
+    """Get where data are in the translucent range."""
+    is_num = [isinstance(k, (int, float)) for k in translucent]
+    assert len(translucent) == 2 and any(is_num)
+    if all(is_num):                # (f_1, f_2)
+        trans_x = np.logical_and(translucent[0] <= x, x <= translucent[1])
+    elif is_num == [True, False]:  # (f_1, None)
+        trans_x = translucent[0] <= x
+    elif is_num == [False, True]:  # (None, f_2)
+        trans_x = x <= translucent[1]
+    return trans_x
 
 
 def _transclucent_cmap(x, x_cmap, translucent):
     """Sub function to define transparency."""
     if translucent is not None:
-        is_num = [isinstance(k, (int, float)) for k in translucent]
-        assert len(translucent) == 2 and any(is_num)
-        if all(is_num):                # (f_1, f_2)
-            trans_x = np.logical_and(translucent[0] <= x, x <= translucent[1])
-        elif is_num == [True, False]:  # (f_1, None)
-            trans_x = translucent[0] <= x
-        elif is_num == [False, True]:  # (None, f_2)
-            trans_x = x <= translucent[1]
-        x_cmap[..., -1] = np.invert(trans_x)
+        x_cmap[..., -1] = np.invert(_translucent_index(x, translucent))
     return x_cmap
 
 
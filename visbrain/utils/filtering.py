@@ -193,7 +193,7 @@ def morlet_power(x, freqs, sf, norm=True):
     # Build frequency vector :
     f = np.c_[freqs[0:-1], freqs[1::]].mean(1)
     # Get wavelet transform :
-    xpow = np.zeros((len(f), len(x)), dtype=np.float)
+    xpow = np.zeros((len(f), len(x)), dtype=float)
     for num, k in enumerate(f):
         xpow[num, :] = np.abs(morlet(x, sf, k))
     # Compute inplace power :
@@ -233,7 +233,7 @@ def welch_power(x, freqs, sf, window_s=10, norm=True):
     freq_spacing = .1
     n_epoch = max(1, int(len(x) / (window_s * sf)))
 
-    xpow = np.zeros((len(freqs) - 1, n_epoch), dtype=np.float)
+    xpow = np.zeros((len(freqs) - 1, n_epoch), dtype=float)
 
     for i in np.arange(0, len(x), window_s * sf):
         f, pxx_spec = welch(x[int(i):int(i + window_s * sf)], sf,
@@ -286,6 +286,12 @@ class PrepareData(object):
         """Return if data have to be prepared."""
         return any([self.demean, self.detrend, self.filt])
 
+    def _get_key(self):
+        """Get a hashable representation of the preparation parameters."""
+        return (self.axis, self.demean, self.detrend, self.filt, self.fstart,
+                self.fend, self.forder, self.way, self.filt_meth, self.btype,
+                self.dispas)
+
     def _prepare_data(self, sf, data, time):
         """Prepare data before plotting."""
         # ============= DEMEAN =============
@@ -1,5 +1,7 @@
 """Usefull functions for graphical interface managment."""
 
+import logging
+
 from PyQt5 import QtCore
 
 import numpy as np
@@ -11,7 +13,9 @@ __all__ = ('slider2opacity', 'textline2color', 'color2json',
            'disconnect_all', 'extend_combo_list', 'get_combo_list_index',
            'safely_set_cbox', 'safely_set_spin', 'safely_set_slider',
            'toggle_enable_tab', 'get_screen_size', 'set_widget_size',
-           'fill_pyqt_table')
+           'fill_pyqt_table', 'ArrayTableModel')
+
+logger = logging.getLogger('visbrain')
 
 
 def slider2opacity(value, thmin=0.0, thmax=100.0, vmin=-5.0, vmax=105.0,
@@ -460,3 +464,241 @@ def fill_pyqt_table(table, col_names=None, col=None, df=None):
     for i in range(table.rowCount()):
         for k in range(table.columnCount()):
             table.setItem(i, k, QTableWidgetItem(str(col[k][i])))
+
+
+class ArrayTableModel(QtCore.QAbstractTableModel):
+    """Qt table model backed by NumPy columns.
+
+    Only cells displayed by the view are converted into text and edits are
+    written back into the arrays. The model is wrapped into a
+    QSortFilterProxyModel (proxy attribute) in order to sort and filter rows
+    without modifying the arrays.
+
+    Parameters
+    ----------
+    header : list
+        Name of each column.
+    dtypes : list | None
+        Data type of each column. By default, columns are float.
+    editable : list | None
+        Index of editable columns. By default, every column is editable.
+    fmt : dict | None
+        Dictionary {column_index: function} used to convert a value into a
+        text. By default, NaN values are displayed as empty cells.
+    parse : dict | None
+        Dictionary {column_index: function} used to convert an edited text
+        into a value. If the function raises a ValueError, the edit is
+        rejected. By default, the column type is used.
+    parent : QObject | None
+        Parent object.
+    """
+
+    # Emitted after an edit from the view (row, column, previous value) :
+    edited = QtCore.pyqtSignal(int, int, object)
+
+    def __init__(self, header, dtypes=None, editable=None, fmt=None,
+                 parse=None, parent=None):
+        """Init."""
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        n_cols = len(header)
+        self._header = list(header)
+        self._dtypes = [float] * n_cols if dtypes is None else list(dtypes)
+        self._editable = range(n_cols) if editable is None else editable
+        self._fmt = {} if fmt is None else fmt
+        self._parse = {k: str if t is object else t for k, t in enumerate(
+            self._dtypes)}
+        self._parse.update({} if parse is None else parse)
+        assert len(self._dtypes) == n_cols
+        self.columns = [np.array([], dtype=k) for k in self._dtypes]
+        # Sorting / filtering :
+        self.proxy = QtCore.QSortFilterProxyModel(parent)
+        self.proxy.setSourceModel(self)
+        self.proxy.setSortRole(QtCore.Qt.UserRole)
+
+    def __len__(self):
+        """Get the number of rows."""
+        return len(self.columns[0])
+
+    def _as_columns(self, columns):
+        """Convert a list of columns into arrays."""
+        assert len(columns) == len(self._header)
+        columns = [np.asarray(c, dtype=t).ravel() for c, t in zip(
+            columns, self._dtypes)]
+        assert len(set(len(c) for c in columns)) == 1
+        return columns
+
+    # ----------------------------- QT API -----------------------------
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Get the number of rows."""
+        return 0 if parent.isValid() else len(self)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """Get the number of columns."""
+        return 0 if parent.isValid() else len(self._header)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """Get the header of a column (or the number of a row)."""
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self._header[section]
+        return str(section + 1)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Get the text (or the value for sorting) of a cell."""
+        if not index.isValid():
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self.text(index.row(), index.column())
+        elif role == QtCore.Qt.UserRole:
+            value = self.columns[index.column()][index.row()]
+            return value.item() if isinstance(value, np.generic) else value
+        return None
+
+    def flags(self, index):
+        """Get the flags of a cell."""
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        if index.column() in self._editable:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """Write an edited text into the arrays."""
+        if not index.isValid() or (role != QtCore.Qt.EditRole):
+            return False
+        row, col = index.row(), index.column()
+        try:
+            value = self._parse[col](str(value))
+        except ValueError:
+            logger.error("%r is not a valid value for the column %r" % (
+                str(value), self._header[col]))
+            return False
+        old = self.columns[col][row]
+        self.columns[col][row] = value
+        self.dataChanged.emit(index, index)
+        self.edited.emit(row, col, old)
+        return True
+
+    def removeRows(self, row, count, parent=QtCore.QModelIndex()):
+        """Remove consecutive rows."""
+        if (count <= 0) or (row < 0) or (row + count > len(self)):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        sl = np.s_[row:row + count]
+        self.columns = [np.delete(c, sl) for c in self.columns]
+        self.endRemoveRows()
+        return True
+
+    # ----------------------------- ARRAYS -----------------------------
+    def text(self, row, col):
+        """Get the text of a cell.
+
+        Parameters
+        ----------
+        row : int
+            Row index (in the model).
+        col : int
+            Column index.
+
+        Returns
+        -------
+        text : str
+            Text of the cell.
+        """
+        value = self.columns[col][row]
+        if col in self._fmt:
+            return self._fmt[col](value)
+        if isinstance(value, (float, np.floating)) and np.isnan(value):
+            return ''
+        return str(value)
+
+    def set_columns(self, columns):
+        """Replace every row of the table.
+
+        Parameters
+        ----------
+        columns : list
+            List of arrays (one per column) with the same length.
+        """
+        columns = self._as_columns(columns)
+        self.beginResetModel()
+        self.columns = columns
+        self.endResetModel()
+
+    def insert_rows(self, row, columns):
+        """Insert rows before a row.
+
+        Parameters
+        ----------
+        row : int
+            Index of the row before which rows are inserted.
+        columns : list
+            List of arrays (one per column) of the rows to insert.
+        """
+        columns = self._as_columns(columns)
+        n = len(columns[0])
+        if not n:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), row, row + n - 1)
+        self.columns = [np.insert(c, row, k) for c, k in zip(self.columns,
+                                                              columns)]
+        self.endInsertRows()
+
+    def append_rows(self, columns):
+        """Append rows at the end of the table.
+
+        Parameters
+        ----------
+        columns : list
+            List of arrays (one per column) of the rows to append.
+        """
+        self.insert_rows(len(self), columns)
+
+    def clear(self):
+        """Remove every row."""
+        self.set_columns([[]] * len(self._header))
+
+    # ----------------------------- VIEW -----------------------------
+    def attach(self, view):
+        """Display the (sortable) model in a QTableView.
+
+        Parameters
+        ----------
+        view : QTableView
+            The table view.
+        """
+        view.setModel(self.proxy)
+
+    def current_row(self, view):
+        """Get the model index of the current row of a view.
+
+        Parameters
+        ----------
+        view : QTableView
+            The table view.
+
+        Returns
+        -------
+        row : int
+            Row index in the model (-1 if there is no current row).
+        """
+        index = self.proxy.mapToSource(view.currentIndex())
+        return index.row() if index.isValid() else -1
+
+    def select_row(self, view, row, col=0):
+        """Select a row of a view using its model index.
+
+        Parameters
+        ----------
+        view : QTableView
+            The table view.
+        row : int
+            Row index in the model.
+        col : int | 0
+            The column of the current cell.
+        """
+        index = self.proxy.mapFromSource(self.index(row, col))
+        if index.isValid():
+            view.selectRow(index.row())
+            view.setCurrentIndex(index)
+        return index
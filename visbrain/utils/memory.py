@@ -2,10 +2,18 @@
 
 Taken from the numpy tricks : http://ipython-books.github.io/featured-01/
 """
+import threading
+from collections import OrderedDict, deque
+
 import numpy as np
 
 
-__all__ = ('id', 'arrays_share_data', 'code_timer')
+__all__ = ('id', 'arrays_share_data', 'code_timer', 'LRUCache',
+           'Prefetcher', 'is_lazy_array', 'check_lazy_array', 'iter_chunks',
+           'chunked_stats', 'as_float32')
+
+# Maximum number of bytes read at once from lazy arrays :
+CHUNK_BYTES = 64 * 2 ** 20
 
 
 def id(x):
@@ -49,3 +57,327 @@ def code_timer(previous=0., verbose=True, prefix='', unit='s'):
     if verbose:
         print(prefix, st * fact, '(' + unit + ')')
     return current
+
+
+def _nbytes(value):
+    """Get the number of bytes of the arrays contained in a value."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    elif isinstance(value, (tuple, list)):
+        return sum(_nbytes(k) for k in value)
+    elif isinstance(value, dict):
+        return sum(_nbytes(k) for k in value.values())
+    return 0
+
+
+class LRUCache(object):
+    """Thread-safe bounded cache with a least recently used eviction.
+
+    Parameters
+    ----------
+    maxsize : int | 32
+        Maximum number of entries.
+    max_bytes : int | None
+        Maximum number of bytes of the arrays stored in the cache.
+    """
+
+    def __init__(self, maxsize=32, max_bytes=None):
+        """Init."""
+        assert isinstance(maxsize, int) and maxsize > 0
+        self.maxsize, self.max_bytes = maxsize, max_bytes
+        self._data = OrderedDict()
+        self._nbytes = {}
+        self._pending = set()
+        self._cond = threading.Condition()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        """Get the number of entries."""
+        return len(self._data)
+
+    def __contains__(self, key):
+        """Get if a key is in the cache."""
+        return key in self._data
+
+    @property
+    def nbytes(self):
+        """Get the number of bytes stored in the cache."""
+        return sum(self._nbytes.values())
+
+    def get(self, key, fcn=None):
+        """Get a value from the cache.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the value.
+        fcn : callable | None
+            Function called without arguments to compute the value if the key
+            is missing. If the value is being computed by another thread, wait
+            for the result instead of computing it twice.
+
+        Returns
+        -------
+        value : object
+            The cached value (None if missing and fcn is None).
+        """
+        with self._cond:
+            while key in self._pending:
+                self._cond.wait()
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            if fcn is None:
+                return None
+            self._pending.add(key)
+        try:
+            value = fcn()
+            self.set(key, value)
+        finally:
+            with self._cond:
+                self._pending.discard(key)
+                self._cond.notify_all()
+        return value
+
+    def set(self, key, value):
+        """Add a value to the cache."""
+        with self._cond:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._nbytes[key] = _nbytes(value)
+            while len(self._data) > self.maxsize or (
+                    self.max_bytes is not None and len(self._data) > 1 and
+                    self.nbytes > self.max_bytes):
+                old, _ = self._data.popitem(last=False)
+                self._nbytes.pop(old)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._cond:
+            self._data.clear()
+            self._nbytes.clear()
+
+
+class Prefetcher(object):
+    """Fill a cache in a background thread.
+
+    Parameters
+    ----------
+    cache : LRUCache
+        The cache to fill.
+    """
+
+    def __init__(self, cache):
+        """Init."""
+        assert isinstance(cache, LRUCache)
+        self.cache = cache
+        self._jobs = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._busy = False
+
+    def schedule(self, jobs):
+        """Replace pending jobs.
+
+        Parameters
+        ----------
+        jobs : list
+            List of (key, fcn) tuples, computed in order. Keys already in the
+            cache are skipped.
+        """
+        with self._cond:
+            self._jobs.clear()
+            self._jobs.extend(jobs)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run,
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self):
+        """Remove pending jobs."""
+        with self._cond:
+            self._jobs.clear()
+
+    def wait(self, timeout=None):
+        """Wait until all pending jobs are done."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._jobs and
+                                       not self._busy, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+                self._cond.wait_for(lambda: len(self._jobs))
+                key, fcn = self._jobs.popleft()
+                self._busy = True
+            if key in self.cache:
+                continue
+            try:
+                self.cache.get(key, fcn)
+            except Exception:  # the main thread will compute it again
+                pass
+
+
+###############################################################################
+#                               LAZY ARRAYS
+###############################################################################
+# Lazy arrays are arrays whose data are only read when sliced (numpy.memmap,
+# h5py / zarr datasets...). Entry points accepting them only convert the
+# needed portions to float32 and compute statistics by chunks.
+
+def is_lazy_array(x):
+    """Get if an array is only read when sliced.
+
+    Parameters
+    ----------
+    x : object
+        Either a numpy.memmap or any object exposing shape, ndim, dtype,
+        __getitem__ and __array__ (e.g h5py.Dataset).
+
+    Returns
+    -------
+    is_lazy : bool
+        True if x is a lazy array.
+    """
+    if isinstance(x, np.memmap):
+        return True
+    elif isinstance(x, np.ndarray):
+        return False
+    attrs = ['shape', 'ndim', 'dtype', '__getitem__', '__array__']
+    return all(hasattr(x, k) for k in attrs)
+
+
+def check_lazy_array(x, ndim=None):
+    """Convert an input to a NumPy array, except for lazy arrays.
+
+    Parameters
+    ----------
+    x : array_like
+        NumPy array, lazy array, list or tuple.
+    ndim : list | None
+        List of accepted number of dimensions.
+
+    Returns
+    -------
+    x : array_like
+        The NumPy or lazy array (never copied).
+    """
+    if not (isinstance(x, np.ndarray) or is_lazy_array(x)):
+        x = np.asarray(x)
+    if (ndim is not None) and (x.ndim not in ndim):
+        raise ValueError("The array should have %s dimensions (got %i)" % (
+            ' or '.join(str(k) for k in ndim), x.ndim))
+    return x
+
+
+def iter_chunks(x, axis=0, max_bytes=None):
+    """Iterate over an array by chunks along an axis.
+
+    Parameters
+    ----------
+    x : array_like
+        NumPy or lazy array.
+    axis : int | 0
+        Axis along which to split the array.
+    max_bytes : int | None
+        Maximum number of bytes of each chunk (at least one slice along axis
+        is read). If None, CHUNK_BYTES is used.
+
+    Yields
+    ------
+    sl : tuple
+        The index of the chunk in x.
+    chunk : array_like
+        The NumPy array of the chunk.
+    """
+    max_bytes = CHUNK_BYTES if max_bytes is None else max_bytes
+    axis = axis % x.ndim
+    n = x.shape[axis]
+    n_slice = int(np.prod([k for i, k in enumerate(x.shape) if i != axis]))
+    step = max(1, int(max_bytes // max(n_slice * x.dtype.itemsize, 1)))
+    sl = [slice(None)] * x.ndim
+    for start in range(0, n, step):
+        sl[axis] = slice(start, min(start + step, n))
+        yield tuple(sl), np.asarray(x[tuple(sl)])
+
+
+def chunked_stats(x, axis=None, stats=('min', 'max'), max_bytes=None):
+    """Compute statistics of a (lazy) array by chunks.
+
+    Parameters
+    ----------
+    x : array_like
+        NumPy or lazy array.
+    axis : int | None
+        Axis along which statistics are computed. If None, statistics are
+        computed over the entire array.
+    stats : tuple | ('min', 'max')
+        Statistics to compute. Use 'min', 'max', 'ptp', 'mean' or 'std'.
+    max_bytes : int | None
+        Maximum number of bytes read at once.
+
+    Returns
+    -------
+    stats : dict
+        Dictionary of statistics.
+    """
+    assert all(k in ['min', 'max', 'ptp', 'mean', 'std'] for k in stats)
+    it_axis = 0 if axis is None else axis
+    kw = dict(axis=axis)
+    c_min = c_max = c_sum = c_sqr = None
+    for _, c in iter_chunks(x, it_axis, max_bytes):
+        _min, _max = c.min(**kw), c.max(**kw)
+        c_min = _min if c_min is None else np.minimum(c_min, _min)
+        c_max = _max if c_max is None else np.maximum(c_max, _max)
+        if ('mean' in stats) or ('std' in stats):
+            c64 = c.astype(np.float64, copy=False)
+            _sum, _sqr = c64.sum(**kw), np.square(c64).sum(**kw)
+            c_sum = _sum if c_sum is None else c_sum + _sum
+            c_sqr = _sqr if c_sqr is None else c_sqr + _sqr
+    n = int(np.prod(x.shape)) if axis is None else x.shape[axis]
+    out = dict(min=c_min, max=c_max)
+    if 'ptp' in stats:
+        out['ptp'] = c_max - c_min
+    if c_sum is not None:
+        out['mean'] = c_sum / n
+        out['std'] = np.sqrt(np.maximum(c_sqr / n - out['mean'] ** 2, 0.))
+    return {k: out[k] for k in stats}
+
+
+def as_float32(x, scale=None, max_bytes=None):
+    """Convert an array to a contiguous float32 NumPy array, by chunks.
+
+    In-memory float32 C-contiguous arrays are returned without copy. For
+    other arrays (including memory-mapped ones), a single float32 array is
+    allocated and filled chunk by chunk, so that no temporary copy of the
+    full array is created and the input is never modified.
+
+    Parameters
+    ----------
+    x : array_like
+        NumPy or lazy array.
+    scale : float | None
+        Multiply the data by this factor.
+    max_bytes : int | None
+        Maximum number of bytes read at once.
+
+    Returns
+    -------
+    x : array_like
+        The float32 NumPy array.
+    """
+    if isinstance(x, np.ndarray) and not isinstance(x, np.memmap) and (
+            x.dtype == np.float32) and x.flags['C_CONTIGUOUS'] and (
+            scale is None):
+        return x
+    out = np.empty(x.shape, dtype=np.float32)
+    for sl, c in iter_chunks(x, 0, max_bytes):
+        out[sl] = c
+        if scale is not None:
+            out[sl] *= scale
+    return out
@@ -11,7 +11,8 @@ from .sigproc import smooth_3d
 
 
 __all__ = ('vispy_array', 'convert_meshdata', 'volume_to_mesh',
-           'smoothing_matrix', 'mesh_edges', 'laplacian_smoothing')
+           'smoothing_matrix', 'mesh_edges', 'laplacian_smoothing',
+           'mesh_ray_grids', 'points_in_mesh')
 
 
 logger = logging.getLogger('visbrain')
@@ -266,3 +267,173 @@ def laplacian_smoothing(vertices, faces, n_neighbors=-1):
         # Take the mean of selected vertices :
         new_vertices[k, :] = vertices[to_smooth, :].mean(0).reshape(1, -1)
     return new_vertices
+
+
+# Fixed ray directions used for the inside / outside test. Directions are
+# not aligned with the axis to avoid rays passing exactly through edges or
+# vertices of meshes sampled on a grid.
+_RAY_DIRECTIONS = ((.8, .36, .48), (-.36, .8, -.48), (.48, -.48, -.72))
+
+
+def _ray_basis(direction):
+    """Get an orthonormal basis where the first axis is the ray direction."""
+    d = np.asarray(direction, dtype=np.float64)
+    d /= np.linalg.norm(d)
+    u = np.cross(d, np.eye(3)[np.abs(d).argmin(), :])
+    u /= np.linalg.norm(u)
+    return np.c_[d, u, np.cross(d, u)].T
+
+
+def _ray_grid(vertices, faces, rot):
+    """Bin triangles projected on a plane orthogonal to a ray direction.
+
+    Parameters
+    ----------
+    vertices : array_like
+        The vertices of shape (n_vertices, 3).
+    faces : array_like
+        The faces of shape (n_faces, 3).
+    rot : array_like
+        Orthonormal basis of shape (3, 3). The ray is cast along the first
+        axis.
+
+    Returns
+    -------
+    grid : dict
+        Dictionary with the rotated triangles, the grid definition and the
+        triangles per cell as a CSR structure (order, indptr).
+    """
+    rot = np.asarray(rot, dtype=np.float64)
+    tri = np.dot(vertices.astype(np.float64), rot.T)[faces, :]
+    # Projected bounding boxes of each triangle :
+    tri_min, tri_max = tri[..., 1:].min(1), tri[..., 1:].max(1)
+    lo, hi = tri_min.min(0), tri_max.max(0)
+    n_cells = max(int(np.sqrt(len(faces)) / 2.), 1)
+    size = np.maximum((hi - lo) / n_cells, np.finfo(np.float64).eps)
+    c_min = np.clip(((tri_min - lo) / size).astype(int), 0, n_cells - 1)
+    c_max = np.clip(((tri_max - lo) / size).astype(int), 0, n_cells - 1)
+    # Cells overlapped by each triangle :
+    span = c_max - c_min + 1
+    n_per_tri = span[:, 0] * span[:, 1]
+    tri_idx = np.repeat(np.arange(len(faces)), n_per_tri)
+    local = np.arange(len(tri_idx)) - np.repeat(np.cumsum(n_per_tri) -
+                                                 n_per_tri, n_per_tri)
+    row = c_min[tri_idx, 0] + local // span[tri_idx, 1]
+    col = c_min[tri_idx, 1] + local % span[tri_idx, 1]
+    cell = row * n_cells + col
+    order = np.argsort(cell, kind='mergesort')
+    indptr = np.zeros((n_cells ** 2 + 1,), dtype=np.int64)
+    np.cumsum(np.bincount(cell, minlength=n_cells ** 2), out=indptr[1:])
+    return dict(tri=tri, rot=rot, lo=lo, size=size, n_cells=n_cells,
+                order=tri_idx[order], indptr=indptr)
+
+
+def _ray_crossings(grid, xyz, chunk=500000):
+    """Count the number of triangles crossed by rays starting from points.
+
+    Parameters
+    ----------
+    grid : dict
+        The grid returned by _ray_grid.
+    xyz : array_like
+        The points of shape (n_points, 3).
+    chunk : int | 500000
+        Maximum number of (point, triangle) pairs tested at once.
+
+    Returns
+    -------
+    crossings : array_like
+        Number of crossings per point of shape (n_points,).
+    """
+    tri, order, indptr = grid['tri'], grid['order'], grid['indptr']
+    n_cells = grid['n_cells']
+    q = np.dot(np.asarray(xyz, dtype=np.float64), grid['rot'].T)
+    crossings = np.zeros((q.shape[0],), dtype=np.int64)
+    # Cell of each point (points outside of the grid are never crossed) :
+    c = np.floor((q[:, 1:] - grid['lo']) / grid['size']).astype(int)
+    is_in = np.logical_and(c >= 0, c < n_cells).all(1)
+    pt = np.where(is_in)[0]
+    cell = c[pt, 0] * n_cells + c[pt, 1]
+    n_cand = indptr[cell + 1] - indptr[cell]
+    # Split points into chunks of candidate (point, triangle) pairs :
+    cum = np.cumsum(n_cand)
+    splits = np.searchsorted(cum, np.arange(chunk, cum[-1], chunk)) if len(
+        cum) else []
+    for sl in np.split(np.arange(len(pt)), splits):
+        cnt = n_cand[sl]
+        if not cnt.sum():
+            continue
+        p_idx = np.repeat(sl, cnt)
+        local = np.arange(cnt.sum()) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+        t_idx = order[indptr[cell[p_idx]] + local]
+        t, p = tri[t_idx, ...], q[pt[p_idx], :]
+        # 2D edge functions in the projected plane :
+        e = np.empty((len(t_idx), 3), dtype=np.float64)
+        for k in range(3):
+            a, b = t[:, k, 1:], t[:, (k + 1) % 3, 1:]
+            e[:, (k + 2) % 3] = ((b[:, 0] - a[:, 0]) * (p[:, 2] - a[:, 1]) -
+                                 (b[:, 1] - a[:, 1]) * (p[:, 1] - a[:, 0]))
+        inside = np.logical_or((e > 0).all(1), (e < 0).all(1))
+        # Position of the hit along the ray (barycentric interpolation) :
+        e, t, p, p_hit = e[inside], t[inside], p[inside], p_idx[inside]
+        x_hit = (e * t[..., 0]).sum(1) / e.sum(1)
+        crossings += np.bincount(pt[p_hit[x_hit > p[:, 0]]],
+                                 minlength=len(crossings))
+    return crossings
+
+
+def mesh_ray_grids(vertices, faces):
+    """Build the acceleration structures used by points_in_mesh.
+
+    Parameters
+    ----------
+    vertices : array_like
+        The vertices of shape (n_vertices, 3).
+    faces : array_like
+        The faces of shape (n_faces, 3).
+
+    Returns
+    -------
+    grids : list
+        List of grids (one per ray direction).
+    """
+    assert vertices.ndim == 2 and vertices.shape[1] == 3
+    assert faces.ndim == 2 and faces.shape[1] == 3
+    return [_ray_grid(vertices, faces, _ray_basis(k)) for k in
+            _RAY_DIRECTIONS]
+
+
+def points_in_mesh(xyz, vertices=None, faces=None, grids=None):
+    """Test if points are inside a closed mesh.
+
+    The test is performed by ray casting : a point is inside the mesh if a
+    ray starting from it crosses the surface an odd number of times. Three
+    rays are cast per point and the majority is used in order to be robust
+    to small holes in the mesh. Triangles are binned on a regular grid so
+    that each ray is only tested against a few triangles.
+
+    Parameters
+    ----------
+    xyz : array_like
+        The points of shape (n_points, 3).
+    vertices : array_like | None
+        The vertices of shape (n_vertices, 3).
+    faces : array_like | None
+        The faces of shape (n_faces, 3).
+    grids : list | None
+        Precomputed grids (see mesh_ray_grids). If None, grids are built using
+        vertices and faces.
+
+    Returns
+    -------
+    inside : array_like
+        Boolean array of shape (n_points,) where True refer to points inside
+        the mesh.
+    """
+    xyz = np.asarray(xyz).reshape(-1, 3)
+    if grids is None:
+        grids = mesh_ray_grids(vertices, faces)
+    votes = np.zeros((xyz.shape[0],), dtype=int)
+    for k in grids:
+        votes += _ray_crossings(k, xyz) % 2
+    return 2 * votes > len(grids)
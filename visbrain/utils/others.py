@@ -4,6 +4,8 @@ import logging
 import numpy as np
 from vispy.util import profiler
 
+from .profiling import TRACER
+
 
 __all__ = ('Profiler', 'get_dsf', 'set_if_not_none')
 
@@ -12,28 +14,32 @@ class Profiler(object):
     """Visbrain profiler.
 
     The visbrain profiler add some basic functionalities to the vispy profiler.
+    Messages are printed if the log level is 'profiler' and are also sent to
+    the visbrain tracer (see visbrain.utils.TRACER) as marks.
     """
 
     def __init__(self, delayed=True):
         """Init."""
         self._delayed = delayed
-        logger = logging.getLogger('visbrain')
-        enable = logger.level == 1  # enable for PROFILER
-        if enable and not hasattr(self, '_vp_profiler'):
-            self._vp_profiler = profiler.Profiler(disabled=not enable,
+        self._vp_profiler = None
+
+    def _get_profiler(self):
+        """Get the vispy profiler (created the first time it's enabled)."""
+        if logging.getLogger('visbrain').level != 1:  # enable for PROFILER
+            return None
+        if self._vp_profiler is None:
+            self._vp_profiler = profiler.Profiler(disabled=False,
                                                   delayed=self._delayed)
+        return self._vp_profiler
 
     def __bool__(self):
         """Return if the profiler is enable."""
-        if hasattr(self, '_vp_profiler'):
-            return not isinstance(self._vp_profiler,
-                                  profiler.Profiler.DisabledProfiler)
-        else:
-            return False
+        return not isinstance(self._get_profiler(), (
+            type(None), profiler.Profiler.DisabledProfiler))
 
     def __call__(self, msg=None, level=0, as_type='msg'):
         """Call the vispy profiler."""
-        self.__init__(delayed=self._delayed)
+        TRACER.mark(msg, level=level)
         if self:
             if as_type == 'msg':
                 if isinstance(msg, str) and isinstance(level, int):
@@ -46,7 +52,8 @@ class Profiler(object):
 
     def finish(self, msg=None):
         """Finish the profiler."""
-        self._vp_profiler.finish(msg)
+        if self._vp_profiler is not None:
+            self._vp_profiler.finish(msg)
 
     @staticmethod
     def _new_msg(msg):
@@ -4,13 +4,15 @@ import logging
 
 import numpy as np
 from itertools import product
+from scipy import sparse
 from scipy.stats import zscore
 
 from .sigproc import smoothing
 from ..io.path import get_data_path, get_files_in_data
 
 __all__ = ('find_non_eeg', 'rereferencing', 'bipolarization', 'commonaverage',
-           'tal2mni', 'mni2tal', 'load_predefined_roi', 'generate_eeg')
+           'montage_matrix', 'Montage', 'tal2mni', 'mni2tal',
+           'load_predefined_roi', 'generate_eeg')
 
 logger = logging.getLogger('visbrain')
 
@@ -206,6 +208,134 @@ def commonaverage(data, chans, to_ignore=None):
     return data, chans, consider
 
 
+def montage_matrix(method, chans, reference=None, to_ignore=None, sep='.'):
+    """Get the sparse matrix of a re-referencing montage.
+
+    The montage is obtained by applying the re-referencing function to the
+    identity matrix. Applying the montage to data of shape (nchan, npts) is
+    then a matrix product, that can be restricted to a time window.
+
+    Parameters
+    ----------
+    method : {'reference', 'average', 'bipolar'} | list
+        Re-referencing method (see :func:`rereferencing`,
+        :func:`commonaverage` and :func:`bipolarization`). Alternatively, use
+        a list of derivations [(chan, ref), ...] where ref can be None (e.g
+        [('C3', 'A2'), ('C4', 'A1'), ('EOG1', None)]).
+    chans : list
+        List of channel names of length nchan.
+    reference : int | None
+        The index of the channel to consider as a reference (only if method
+        is 'reference').
+    to_ignore : list | None
+        List of channels to ignore in the re-referencing.
+    sep : string | '.'
+        Separator used to simplify channel names (only if method is
+        'bipolar').
+
+    Returns
+    -------
+    matrix : scipy.sparse.csr_matrix
+        The montage matrix of shape (n_virtual, nchan).
+    channelsr : list
+        List of re-referenced channel names of length n_virtual.
+    consider : list
+        List of boolean values of channels that have to be considered
+        during the ploting processus.
+    """
+    chans = list(chans)
+    if isinstance(method, (list, tuple)):
+        matrix = sparse.lil_matrix((len(method), len(chans)))
+        names = []
+        for num, (chan, ref) in enumerate(method):
+            matrix[num, chans.index(chan)] = 1.
+            if ref is not None:
+                matrix[num, chans.index(ref)] -= 1.
+            names.append(chan if ref is None else chan + '-' + ref)
+        return matrix.tocsr(), names, np.ones((len(method),), dtype=bool)
+    eye = np.eye(len(chans))
+    if method == 'reference':
+        assert isinstance(reference, int)
+        matrix, chans, consider = rereferencing(eye, chans, reference,
+                                                to_ignore)
+    elif method == 'average':
+        matrix, chans, consider = commonaverage(eye, chans, to_ignore)
+    elif method == 'bipolar':
+        matrix, chans, consider = bipolarization(eye, chans, to_ignore, sep)
+    else:
+        raise ValueError("method should either be 'reference', 'average', "
+                         "'bipolar' or a list of derivations.")
+    return sparse.csr_matrix(matrix), chans, consider
+
+
+class Montage(object):
+    """Re-referenced data computed on demand.
+
+    The raw data is never copied nor modified. Only the slice of data that is
+    requested is re-referenced.
+
+    Parameters
+    ----------
+    data : array_like
+        Raw data of shape (nchan, npts). Can be a memory-mapped array. If data
+        is already a Montage, both montages are combined.
+    matrix : array_like | scipy.sparse matrix
+        Montage matrix of shape (n_virtual, nchan) (see
+        :func:`montage_matrix`).
+
+    Examples
+    --------
+    >>> matrix, chans, consider = montage_matrix('bipolar', chans)
+    >>> data_r = Montage(data, matrix)
+    >>> window = data_r[:, 1000:2000]  # only this window is re-referenced
+    """
+
+    def __init__(self, data, matrix):
+        """Init."""
+        matrix = sparse.csr_matrix(matrix)
+        if isinstance(data, Montage):
+            data, matrix = data.raw, matrix.dot(data.matrix).tocsr()
+        assert data.ndim == 2 and matrix.shape[1] == data.shape[0]
+        self.raw, self.matrix = data, matrix
+        is_float = np.issubdtype(data.dtype, np.floating)
+        self.dtype = data.dtype if is_float else np.dtype(np.float32)
+        self.shape = (matrix.shape[0], data.shape[1])
+        self.ndim = 2
+
+    def __len__(self):
+        """Get the number of virtual channels."""
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        """Re-reference a slice of data."""
+        key = key if isinstance(key, tuple) else (key,)
+        # Expand the ellipsis to the missing dimensions :
+        n_ell = sum(k is Ellipsis for k in key)
+        assert n_ell <= 1, "An index can only have a single ellipsis"
+        if n_ell:
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            fill = (slice(None),) * (2 - len(key) + 1)
+            key = key[:i] + fill + key[i + 1:]
+        assert len(key) <= 2, "Too many indices for a Montage"
+        rows, cols = key + (slice(None),) * (2 - len(key))
+        rows = np.arange(self.shape[0])[rows]
+        squeeze = np.ndim(rows) == 0
+        sub = self.matrix[np.atleast_1d(rows), :]
+        # Only read raw channels involved in the requested rows :
+        used = np.unique(sub.indices)
+        if isinstance(cols, (slice, int, np.integer)):
+            raw = self.raw[used, cols]
+        else:
+            raw = self.raw[np.ix_(used, np.asarray(cols))]
+        data = np.asarray(sub[:, used].dot(raw), dtype=self.dtype)
+        return data[0] if squeeze else data
+
+    def __array__(self, dtype=None):
+        """Re-reference all of the data."""
+        data = self[:, :]
+        return data if dtype is None else data.astype(dtype, copy=False)
+
+
 ###############################################################################
 ###############################################################################
 #                               XYZ CONVERSION
@@ -0,0 +1,257 @@
+"""Structured profiling using named spans and counters.
+
+Spans measure the duration of a block of code and can be nested. Counters
+accumulate values (e.g number of bytes uploaded to the GPU). When the tracer
+is disabled, spans and counters are no-ops.
+
+>>> from visbrain.utils import TRACER
+>>> TRACER.enable()
+>>> with TRACER.span('load', file='data.edf') as sp:
+...     sp.set(nbytes=1024)
+>>> TRACER.count('gpu.upload.bytes', 1024)
+>>> TRACER.to_chrome_trace('trace.json')
+"""
+import os
+import json
+import threading
+from time import perf_counter
+from functools import wraps
+
+
+__all__ = ('Tracer', 'TRACER', 'traced')
+
+
+class _NullSpan(object):
+    """Span used when the tracer is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def set(self, **attrs):
+        """Do nothing."""
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span(object):
+    """A named span."""
+
+    __slots__ = ('_tracer', 'name', 'attrs', 'start', 'depth', 'parent')
+
+    def __init__(self, tracer, name, attrs):
+        self._tracer = tracer
+        self.name, self.attrs = name, attrs
+
+    def __enter__(self):
+        stack = self._tracer._stack()
+        self.parent = stack[-1].name if stack else None
+        self.depth = len(stack)
+        stack.append(self)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        duration = perf_counter() - self.start
+        self._tracer._stack().pop()
+        self._tracer._emit(dict(type='span', name=self.name, start=self.start,
+                                duration=duration, depth=self.depth,
+                                parent=self.parent, attrs=self.attrs,
+                                thread=threading.get_ident()))
+        return False
+
+    def set(self, **attrs):
+        """Set attributes of the span (e.g nbytes, n_points)."""
+        self.attrs.update(attrs)
+
+
+class Tracer(object):
+    """Collect spans, counters and marks.
+
+    Parameters
+    ----------
+    enabled : bool | False
+        Enable the tracer.
+    max_records : int | 100000
+        Maximum number of records kept in memory. Older records are dropped.
+    """
+
+    def __init__(self, enabled=False, max_records=100000):
+        """Init."""
+        self.enabled = enabled
+        self._max_records = max_records
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sinks = []
+        self.clear()
+
+    def enable(self):
+        """Enable the tracer."""
+        self.enabled = True
+
+    def disable(self):
+        """Disable the tracer."""
+        self.enabled = False
+
+    def clear(self):
+        """Remove all records and reset counters."""
+        self.records, self.counters = [], {}
+        self._t0 = perf_counter()
+
+    def add_sink(self, sink):
+        """Add a function called with each new record (a dict)."""
+        assert callable(sink)
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink):
+        """Remove a sink."""
+        self._sinks.remove(sink)
+
+    def span(self, name, **attrs):
+        """Measure the duration of a block of code.
+
+        Parameters
+        ----------
+        name : string
+            Name of the span (e.g 'io.read_sleep').
+        attrs : dict
+            Additional attributes of the span.
+
+        Returns
+        -------
+        span : context manager
+            Use span.set(**attrs) to add attributes inside the block.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, attrs)
+
+    def count(self, name, value=1):
+        """Increment a counter.
+
+        Parameters
+        ----------
+        name : string
+            Name of the counter (e.g 'gpu.upload.bytes').
+        value : int | float | 1
+            Value to add to the counter.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            total = self.counters.get(name, 0) + value
+            self.counters[name] = total
+        self._emit(dict(type='counter', name=name, start=perf_counter(),
+                        value=total, thread=threading.get_ident()))
+
+    def mark(self, name, **attrs):
+        """Add an instantaneous event."""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        self._emit(dict(type='mark', name=name, start=perf_counter(),
+                        depth=len(stack), attrs=attrs,
+                        parent=stack[-1].name if stack else None,
+                        thread=threading.get_ident()))
+
+    def summary(self):
+        """Get the number of calls and the total duration of each span.
+
+        Returns
+        -------
+        summary : dict
+            Dict of {name: {'calls': int, 'total': float}} (in seconds).
+        """
+        summary = {}
+        for r in self.records:
+            if r['type'] == 'span':
+                s = summary.setdefault(r['name'], dict(calls=0, total=0.))
+                s['calls'] += 1
+                s['total'] += r['duration']
+        return summary
+
+    def to_json(self, filename=None):
+        """Export records and counters as JSON.
+
+        Parameters
+        ----------
+        filename : string | None
+            Name of the JSON file. If None, the JSON string is returned.
+        """
+        records = [dict(r, start=r['start'] - self._t0) for r in self.records]
+        return self._dump(dict(records=records, counters=self.counters,
+                               summary=self.summary()), filename)
+
+    def to_chrome_trace(self, filename=None):
+        """Export records in the Chrome trace event format.
+
+        The file can be opened in chrome://tracing or https://ui.perfetto.dev
+
+        Parameters
+        ----------
+        filename : string | None
+            Name of the JSON file. If None, the JSON string is returned.
+        """
+        pid, events = os.getpid(), []
+        for r in self.records:
+            ev = dict(name=r['name'], pid=pid, tid=r['thread'],
+                      ts=(r['start'] - self._t0) * 1e6)
+            if r['type'] == 'span':
+                ev.update(ph='X', dur=r['duration'] * 1e6, args=r['attrs'])
+            elif r['type'] == 'counter':
+                ev.update(ph='C', args={r['name']: r['value']})
+            else:
+                ev.update(ph='i', s='t', args=r['attrs'])
+            events.append(ev)
+        return self._dump(dict(traceEvents=events, displayTimeUnit='ms'),
+                          filename)
+
+    def _stack(self):
+        """Get the stack of opened spans of the current thread."""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _emit(self, record):
+        """Store a record and send it to sinks."""
+        with self._lock:
+            self.records.append(record)
+            if len(self.records) > self._max_records:
+                del self.records[0:len(self.records) - self._max_records]
+        for sink in self._sinks:
+            sink(record)
+
+    @staticmethod
+    def _dump(obj, filename):
+        if filename is None:
+            return json.dumps(obj, default=str)
+        with open(filename, 'w') as f:
+            json.dump(obj, f, default=str)
+
+
+"""Visbrain tracer
+"""
+TRACER = Tracer()
+
+
+def traced(name):
+    """Decorator measuring each call of a function as a span.
+
+    Parameters
+    ----------
+    name : string
+        Name of the span.
+    """
+    def decorator(fcn):
+        @wraps(fcn)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return fcn(*args, **kwargs)
+            with TRACER.span(name):
+                return fcn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -226,8 +226,8 @@ def averaging(ts, n_window, axis=-1, overlap=0., window='flat'):
     for k in range(n_ind):
         sl_ts[axis] = slice(ind[k, 0], ind[k, 1])
         sl_av[axis] = slice(k, k + 1)
-        average[sl_av] += (ts[sl_ts] * win).mean(axis=axis, keepdims=True)
-
+        average[tuple(sl_av)] += (ts[tuple(sl_ts)] * win).mean(axis=axis,
+                                                              keepdims=True)
     return average
 
 
@@ -262,7 +262,7 @@ def normalization(data, axis=-1, norm=None, baseline=None):
     if (baseline is not None) and (len(baseline) == 2):
         sl = [slice(None)] * data.ndim
         sl[axis] = slice(baseline[0], baseline[1])
-        _data = data[sl]
+        _data = data[tuple(sl)]
     else:
         _data = None
 
@@ -12,10 +12,15 @@ Perform:
 """
 import numpy as np
 from scipy.signal import hilbert, detrend, welch
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
 
 from ..filtering import filt, morlet, morlet_power
 from ..sigproc import derivative, tkeo, smoothing, normalization
-from .event import (_events_distance_fill, _index_to_events, _events_to_index)
+from .event import (_events_distance_fill, _index_to_events, _events_to_index,
+                    _events_reduce, _events_snap, _events_merge,
+                    _events_duration)
+from ..profiling import traced
+from ..memory import CHUNK_BYTES, chunked_stats, iter_chunks, is_lazy_array
 
 __all__ = ('kcdetect', 'spindlesdetect', 'remdetect', 'slowwavedetect',
            'mtdetect', 'peakdetect')
@@ -25,6 +30,7 @@ __all__ = ('kcdetect', 'spindlesdetect', 'remdetect', 'slowwavedetect',
 ###########################################################################
 
 
+@traced('sleep.kcdetect')
 def kcdetect(data, sf, proba_thr, amp_thr, hypno, nrem_only, tmin, tmax,
              kc_min_amp, kc_max_amp, fmin=.5, fmax=4., delta_thr=.75,
              smoothing_s=20, spindles_thresh=2., range_spin_sec=20,
@@ -107,30 +113,23 @@ def kcdetect(data, sf, proba_thr, amp_thr, hypno, nrem_only, tmin, tmax,
     if idx_hard.size == 0:
         return np.array([], dtype=int)
 
-    # Initialize K-complexes index vector
-    idx_kc = np.array([], dtype=int)
     # Fill gap between events separated by less than min_distance_ms
     idx_hard = _events_distance_fill(idx_hard, min_distance_ms, sf)
     # Get where K-complex start / end :
     idx_start, idx_stop = _events_to_index(idx_hard).T
 
     # Find true beginning / end using soft threshold
-    for s in idx_start:
-        d = s - idx_zc_soft
-        soft_beg = d[d > 0].min()
-        soft_end = np.abs(d[d < 0]).min()
-        idx_kc = np.append(idx_kc, np.arange(s - soft_beg, s + soft_end))
+    idx_start, idx_stop = _events_snap(idx_start, idx_zc_soft)
+    idx_start, idx_stop = _events_merge(idx_start, idx_stop - 1, 0., sf)
+    idx_kc = _index_to_events(np.c_[idx_start, idx_stop])
 
     # Check if spindles are present in range_spin_sec
-    idx_spin = spindlesdetect(data, sf, spindles_thresh, hypno, False)[0]
-    idx_start, idx_stop = _events_to_index(idx_kc).T
-    spin_bool = np.array([], dtype=np.bool)
-
-    for idx, val in enumerate(idx_start):
-        step = 0.5 * range_spin_sec * sf
-        is_spin = np.in1d(np.arange(val - step, val + step, 1),
-                          idx_spin, assume_unique=True)
-        spin_bool = np.append(spin_bool, any(is_spin))
+    idx_spin = np.sort(spindlesdetect(data, sf, spindles_thresh, hypno,
+                                      False)[0])
+    step = 0.5 * range_spin_sec * sf
+    n_spin = np.searchsorted(idx_spin, idx_start + step) - np.searchsorted(
+        idx_spin, idx_start - step)
+    spin_bool = n_spin > 0
 
     kc_spin = np.where(spin_bool)[0]
     idx_kc_spin = _index_to_events(np.c_[idx_start, idx_stop][kc_spin])
@@ -161,18 +160,13 @@ def kcdetect(data, sf, proba_thr, amp_thr, hypno, nrem_only, tmin, tmax,
 
     # Morphological criteria
     idx_start, idx_stop = _events_to_index(idx_kc).T
-    duration_ms = (idx_stop - idx_start) * (1000 / sf)
 
     # Remove events with bad duration
-    good_dur = np.where(np.logical_and(duration_ms > tmin,
-                                       duration_ms < tmax))[0]
-    idx_kc = _index_to_events(np.c_[idx_start, idx_stop][good_dur])
+    good_dur = _events_duration(idx_start, idx_stop, sf, tmin, tmax)
+    idx_start, idx_stop = idx_start[good_dur], idx_stop[good_dur]
 
     # Remove events with bad amplitude
-    idx_start, idx_stop = _events_to_index(idx_kc).T
-    amp = np.zeros(shape=idx_start.size)
-    for i, (start, stop) in enumerate(zip(idx_start, idx_stop)):
-        amp[i] = np.ptp(data[start:stop])
+    amp = _events_reduce(data, idx_start, idx_stop, 'ptp')
     good_amp = np.where(np.logical_and(amp > kc_min_amp,
                                        amp < kc_max_amp))[0]
 
@@ -183,6 +177,7 @@ def kcdetect(data, sf, proba_thr, amp_thr, hypno, nrem_only, tmin, tmax,
 # SPINDLES DETECTION
 ###########################################################################
 
+@traced('sleep.spindlesdetect')
 def spindlesdetect(data, sf, threshold, hypno, nrem_only, fmin=12., fmax=14.,
                    tmin=300, tmax=3000, method='wavelet', min_distance_ms=300,
                    sigma_thr=0.2, adapt_band=True, return_full=False):
@@ -274,9 +269,6 @@ def spindlesdetect(data, sf, threshold, hypno, nrem_only, fmin=12., fmax=14.,
     idx_zc_soft = _events_to_index(idx_soft).flatten()
 
     if idx_hard.size > 0:
-        # Initialize spindles vector
-        idx_spindles = np.array([], dtype=int)
-
         # Keep only period with high relative sigma power
         idx_hard = np.intersect1d(idx_hard, idx_sigma, True)
 
@@ -286,26 +278,17 @@ def spindlesdetect(data, sf, threshold, hypno, nrem_only, fmin=12., fmax=14.,
         # Get where spindles start / end :
         idx_start, idx_stop = _events_to_index(idx_hard).T
 
-        # Find true beginning / end using soft threshold
-        for s in idx_start:
-            d = s - idx_zc_soft
-            # Find distance to nearest soft threshold crossing before start
-            soft_beg = d[d > 0].min()
-            # Find distance to nearest soft threshold crossing after end
-            soft_end = np.abs(d[d < 0]).min()
-            idx_spindles = np.append(idx_spindles, np.arange(
-                                     s - soft_beg, s + soft_end))
-
-        # Fill gap between events separated by less than min_distance_ms
-        idx_spindles = _events_distance_fill(idx_spindles, min_distance_ms, sf)
-
-        # Get duration
-        idx_start, idx_stop = _events_to_index(idx_spindles).T
-        duration_ms = (idx_stop - idx_start) * (1000 / sf)
+        # Find true beginning / end using the nearest soft threshold
+        # crossings, then fill gap between events separated by less than
+        # min_distance_ms :
+        idx_start, idx_stop = _events_snap(idx_start, idx_zc_soft)
+        idx_start, idx_stop = _events_merge(idx_start, idx_stop - 1,
+                                            min_distance_ms, sf)
+        idx_spindles = _index_to_events(np.c_[idx_start, idx_stop])
 
         # Remove events with bad duration
-        good_dur = np.where(np.logical_and(duration_ms > tmin,
-                                           duration_ms < tmax))[0]
+        good_dur = np.where(_events_duration(idx_start, idx_stop, sf, tmin,
+                                             tmax))[0]
 
         if idx_spindles.size == 0:
             return np.array([], dtype=int)
@@ -318,11 +301,8 @@ def spindlesdetect(data, sf, threshold, hypno, nrem_only, fmin=12., fmax=14.,
             density = number / (length / sf / 60.)
 
             # Compute mean power of each spindles
-            pwrs = np.zeros(shape=number)
-            for i, (start, stop) in enumerate(zip(idx_start, idx_stop)):
-                ind_pwr = morlet_power(data[start:stop], [fmin, fmax], sf,
-                                       norm=False)[0]
-                pwrs[i] = np.mean(ind_pwr)
+            pwr = morlet_power(data, [fmin, fmax], sf, norm=False)[0]
+            pwrs = _events_reduce(pwr, idx_start, idx_stop, 'mean')
             # Normalize by dividing by the mean
             normalization(pwrs, norm=2)
 
@@ -338,6 +318,7 @@ def spindlesdetect(data, sf, threshold, hypno, nrem_only, fmin=12., fmax=14.,
 ###########################################################################
 
 
+@traced('sleep.remdetect')
 def remdetect(data, sf, hypno, rem_only, threshold, tmin=300, tmax=800,
               min_distance_ms=300, smoothing_ms=200, deriv_ms=50):
     """Perform a rapid eye movement (REM) detection.
@@ -406,9 +387,6 @@ def remdetect(data, sf, hypno, rem_only, threshold, tmin=300, tmax=800,
     if idx_hard.size == 0:
         return np.array([], dtype=int)
 
-    # Initialize rem vector
-    idx_rem = np.array([], dtype=int)
-
     # Keep only period with low relative beta power (i.e. remove artefact)
     idx_hard = np.intersect1d(idx_hard, idx_beta, True)
 
@@ -418,25 +396,14 @@ def remdetect(data, sf, hypno, rem_only, threshold, tmin=300, tmax=800,
     # Get where spindles start / end :
     idx_start, idx_stop = _events_to_index(idx_hard).T
 
-    # Find true beginning / end using soft threshold
-    for s in idx_start:
-        d = s - idx_zc_soft
-        # Find distance to nearest soft threshold crossing before start
-        soft_beg = d[d > 0].min()
-        # Find distance to nearest soft threshold crossing after end
-        soft_end = np.abs(d[d < 0]).min()
-        idx_rem = np.append(idx_rem, np.arange(s - soft_beg, s + soft_end))
-
-    # Fill gap between events separated by less than min_distance_ms
-    idx_rem = _events_distance_fill(idx_rem, min_distance_ms, sf)
-
-    # Get duration
-    idx_start, idx_stop = _events_to_index(idx_rem).T
-    duration_ms = (idx_stop - idx_start) * (1000 / sf)
+    # Find true beginning / end using the nearest soft threshold crossings,
+    # then fill gap between events separated by less than min_distance_ms :
+    idx_start, idx_stop = _events_snap(idx_start, idx_zc_soft)
+    idx_start, idx_stop = _events_merge(idx_start, idx_stop - 1,
+                                        min_distance_ms, sf)
 
     # Remove events with bad duration
-    good_dur = np.where(np.logical_and(duration_ms > tmin,
-                                       duration_ms < tmax))[0]
+    good_dur = _events_duration(idx_start, idx_stop, sf, tmin, tmax)
 
     return np.c_[idx_start, idx_stop][good_dur]
 
@@ -446,6 +413,7 @@ def remdetect(data, sf, hypno, rem_only, threshold, tmin=300, tmax=800,
 ###########################################################################
 
 
+@traced('sleep.slowwavedetect')
 def slowwavedetect(data, sf, threshold, min_amp=70., max_amp=400., tmin=1000.,
                    fmin=.5, fmax=4., smoothing_s=20):
     """Perform a Slow Wave detection.
@@ -494,16 +462,12 @@ def slowwavedetect(data, sf, threshold, min_amp=70., max_amp=400., tmin=1000.,
 
     # Get where slow waves start / end :
     idx_start, idx_stop = _events_to_index(idx_sw).T
-    duration_ms = (idx_stop - idx_start) * (1000 / sf)
 
     # Check amplitude and duration
-    amp = np.zeros(shape=idx_start.shape)
-    for idx, (start, stop) in enumerate(zip(idx_start, idx_stop)):
-        amp[idx] = np.ptp(data[start:stop])
-    good_amp = np.where(np.logical_and(amp > min_amp, amp < max_amp))[0]
-    good_dur = np.where(duration_ms > tmin)[0]
-    good_event = np.intersect1d(good_amp, good_dur, True)
-    idx_sw = np.c_[idx_start, idx_stop][good_event]
+    amp = _events_reduce(data, idx_start, idx_stop, 'ptp')
+    good_amp = np.logical_and(amp > min_amp, amp < max_amp)
+    good_dur = _events_duration(idx_start, idx_stop, sf, tmin)
+    idx_sw = np.c_[idx_start, idx_stop][good_amp & good_dur]
 
     if idx_sw.size == 0:
         return np.array([], dtype=int)
@@ -516,6 +480,7 @@ def slowwavedetect(data, sf, threshold, min_amp=70., max_amp=400., tmin=1000.,
 ###########################################################################
 
 
+@traced('sleep.mtdetect')
 def mtdetect(data, sf, threshold, hypno, rem_only, fmin=0., fmax=50.,
              tmin=800, tmax=2500, min_distance_ms=1000, min_amp=50,
              max_amp=400):
@@ -589,18 +554,13 @@ def mtdetect(data, sf, threshold, hypno, rem_only, fmin=0., fmax=50.,
 
     # MORPHOLOGICAL CRITERIA
     idx_start, idx_stop = _events_to_index(idx_hard).T
-    duration_ms = (idx_stop - idx_start) * (1000 / sf)
 
     # Remove events with bad duration
-    good_dur = np.where(np.logical_and(duration_ms > tmin,
-                                       duration_ms < tmax))[0]
-    idx_mt = _index_to_events(np.c_[idx_start, idx_stop][good_dur])
+    good_dur = _events_duration(idx_start, idx_stop, sf, tmin, tmax)
+    idx_start, idx_stop = idx_start[good_dur], idx_stop[good_dur]
 
     # Remove events with bad amplitude
-    idx_start, idx_stop = _events_to_index(idx_mt).T
-    amp = np.zeros(shape=idx_start.size)
-    for i, (start, stop) in enumerate(zip(idx_start, idx_stop)):
-        amp[i] = np.ptp(data[start:stop])
+    amp = _events_reduce(data, idx_start, idx_stop, 'ptp')
     good_amp = np.where(np.logical_and(amp > min_amp,
                                        amp < max_amp))[0]
     idx_mt = np.c_[idx_start, idx_stop][good_amp]
@@ -617,8 +577,62 @@ def mtdetect(data, sf, threshold, hypno, rem_only, fmin=0., fmax=50.,
 ###########################################################################
 
 
+def _forward_extrema(y, lookahead):
+    """Get the max and min of y[i:i + lookahead] for each sample i.
+
+    Windows are truncated at the end of y.
+    """
+    n, half = len(y), lookahead // 2
+    kw = dict(size=lookahead, mode='constant')
+    y_max = maximum_filter1d(np.r_[y, np.full((lookahead,), -np.inf)],
+                             cval=-np.inf, **kw)
+    y_min = minimum_filter1d(np.r_[y, np.full((lookahead,), np.inf)],
+                             cval=np.inf, **kw)
+    return y_max[half:half + n], y_min[half:half + n]
+
+
+def _first_peak(y, y_fwd, start, run, delta):
+    """Find the first maximum of y[start:] (use -y for minima).
+
+    A sample is a peak if it is below the running maximum minus delta and if
+    the following lookahead samples (y_fwd) are all below the running maximum.
+    The search is performed over windows of increasing size.
+
+    Returns
+    -------
+    index : int | None
+        Index of the peak in y (None if not found).
+    run : float
+        Running maximum of the searched samples.
+    """
+    n, size = len(y), 256
+    while start < n:
+        stop = min(start + size, n)
+        run_max = np.maximum(np.maximum.accumulate(y[start:stop]), run)
+        is_peak = (y[start:stop] < run_max.astype(float) - delta) & (
+            y_fwd[start:stop] < run_max)
+        hit = np.flatnonzero(is_peak)
+        if hit.size:
+            return start + hit[0], run
+        run, start, size = run_max[-1], stop, 2 * size
+    return None, run
+
+
+def _chunked_linear_trend(y, max_bytes=None):
+    """Get the (slope, intercept) of the least-squares line by chunks."""
+    n, s_t, s_tt, s_y, s_ty = len(y), 0., 0., 0., 0.
+    for sl, c in iter_chunks(y, max_bytes=max_bytes):
+        t = np.arange(sl[0].start, sl[0].stop, dtype=np.float64)
+        c = c.astype(np.float64, copy=False)
+        s_t, s_tt = s_t + t.sum(), s_tt + (t ** 2).sum()
+        s_y, s_ty = s_y + c.sum(), s_ty + (t * c).sum()
+    slope = (n * s_ty - s_t * s_y) / (n * s_tt - s_t ** 2)
+    return slope, (s_y - slope * s_t) / n
+
+
+@traced('sleep.peakdetect')
 def peakdetect(sf, y_axis, x_axis=None, lookahead=200, delta=1., get='max',
-               threshold='auto'):
+               threshold='auto', chunk_size=None):
     """Perform a peak detection.
 
     Converted from/based on a MATLAB script at:
@@ -660,6 +674,10 @@ def peakdetect(sf, y_axis, x_axis=None, lookahead=200, delta=1., get='max',
         Use a threshold to ignore values. Use None for no threshold, 'auto'
         to use the signal deviation or a float number for specific
         threshold.
+    chunk_size : int | None
+        Number of samples read at once (with an overlap of lookahead samples).
+        If None, memory-mapped data are read by chunks of 64MB and other
+        arrays at once.
 
     Returns
     -------
@@ -673,8 +691,11 @@ def peakdetect(sf, y_axis, x_axis=None, lookahead=200, delta=1., get='max',
     if len(y_axis) != len(x_axis):
         raise ValueError("Input vectors y_axis and x_axis must have same "
                          "length")
-    # Needs to be a numpy array
-    y_axis, x_axis = np.asarray(y_axis), np.asarray(x_axis)
+    # Needs to be a numpy array (except lazy arrays, read by chunks) :
+    if not is_lazy_array(y_axis):
+        y_axis = np.asarray(y_axis)
+    if not np.issubdtype(y_axis.dtype, np.floating):
+        y_axis = y_axis.astype(float)
 
     # store data length for later use
     length = len(y_axis)
@@ -690,64 +711,84 @@ def peakdetect(sf, y_axis, x_axis=None, lookahead=200, delta=1., get='max',
         raise ValueError("The get parameter must either be 'min', 'max' or"
                          " 'minmax'")
 
-    # ============== PRE-ALLOCATION ==============
-    max_peaks, min_peaks = [], []
-    dump = []   # Used to pop the first hit which almost always is false
-
-    # maxima and minima candidates are temporarily stored in
-    # mx and mn respectively
-    mn, mx = np.Inf, -np.Inf
+    # Chunk size :
+    if chunk_size is None and is_lazy_array(y_axis):
+        chunk_size = CHUNK_BYTES // y_axis.dtype.itemsize
+    elif chunk_size is None:
+        chunk_size = length
+    chunk_size = max(int(chunk_size), 1)
+    is_chunked = chunk_size < length
 
     # ============== THRESHOLD ==============
     if threshold is not None:
-        if threshold is 'auto':
-            threshold = np.std(y_axis)
-        # Detrend / demean y-axis :
-        y_axisp = detrend(y_axis)
-        y_axisp -= y_axisp.mean()
-        # Find values above threshold :
-        above = np.abs(y_axisp) >= threshold
-        zp = zip(np.arange(length)[above], x_axis[above], y_axis[above])
+        if is_chunked:
+            if isinstance(threshold, str) and threshold == 'auto':
+                threshold = chunked_stats(y_axis, stats=('std',))['std']
+            # Detrend y-axis by chunks :
+            slope, intercept = _chunked_linear_trend(y_axis)
+        else:
+            if isinstance(threshold, str) and threshold == 'auto':
+                threshold = np.std(y_axis)
+            # Detrend / demean y-axis :
+            y_axisp = detrend(y_axis)
+            y_axisp -= y_axisp.mean()
+            # Find values above threshold :
+            above = np.abs(y_axisp) >= threshold
+        n_cand = length
     else:
-        zp = zip(np.arange(length)[:-lookahead], x_axis[:-lookahead],
-                 y_axis[:-lookahead])
+        # Only detect peak if there is 'lookahead' amount of points after it
+        n_cand = max(length - lookahead, 0)
 
     # ============== FIND MIN / MAX PEAKS ==============
-    # Only detect peak if there is 'lookahead' amount of points after it
-    for index, x, y in zp:
-        if y > mx:
-            mx = y
-        if y < mn:
-            mn = y
-
-        # ==== Look for max ====
-        if y < mx - delta and mx != np.Inf:
-            # Maxima peak candidate found
-            # look ahead in signal to ensure that this is a peak and not jitter
-            if y_axis[index:index + lookahead].max() < mx:
-                max_peaks.append(index)
-                dump.append(True)
-                # set algorithm to only find minima now
-                mx = np.Inf
-                mn = np.Inf
-                if index + lookahead >= length:
-                    # end is within lookahead no more peaks can be found
-                    break
-                continue
-
-        # ==== Look for max ====
-        if y > mn + delta and mn != -np.Inf:
-            # Minima peak candidate found
-            # look ahead in signal to ensure that this is a peak and not jitter
-            if y_axis[index:index + lookahead].min() > mn:
-                min_peaks.append(index)
-                dump.append(False)
-                # set algorithm to only find maxima now
-                mn = -np.Inf
-                mx = -np.Inf
-                if index + lookahead >= length:
-                    # end is within lookahead no more peaks can be found
-                    break
+    max_peaks, min_peaks = [], []
+    dump = []   # Used to pop the first hit which almost always is false
+    # Search for both maxima and minima until the first peak is found. Then,
+    # alternate between minima and maxima :
+    find_max = find_min = True
+    mx, mn = -np.inf, -np.inf  # running max (of y and -y)
+    for start in range(0, n_cand, chunk_size):
+        stop = min(start + chunk_size, n_cand)
+        # Overlapping chunk to get the lookahead extrema :
+        y_chunk = np.asarray(y_axis[start:min(stop + lookahead - 1, length)])
+        y_max, y_min = _forward_extrema(y_chunk, lookahead)
+        n = stop - start
+        y_chunk, y_max, y_min = y_chunk[0:n], y_max[0:n], y_min[0:n]
+        index = np.arange(start, stop)
+        # Keep values above threshold :
+        if threshold is not None:
+            if is_chunked:
+                trend = slope * index + intercept
+                keep = np.abs(y_chunk - trend) >= threshold
+            else:
+                keep = above[start:stop]
+            y_chunk, y_max, y_min = y_chunk[keep], y_max[keep], y_min[keep]
+            index = index[keep]
+        ny_chunk, ny_min = -y_chunk, -y_min
+
+        k, found_last = 0, False
+        while k < len(y_chunk):
+            i_max = i_min = None
+            if find_max:
+                i_max, mx = _first_peak(y_chunk, y_max, k, mx, delta)
+            if find_min:
+                i_min, mn = _first_peak(ny_chunk, ny_min, k, mn, delta)
+            if (i_max is None) and (i_min is None):
+                break
+            is_max = (i_min is None) or ((i_max is not None) and (
+                i_max <= i_min))
+            k = i_max if is_max else i_min
+            # Peak found (set algorithm to find the other kind of peak) :
+            (max_peaks if is_max else min_peaks).append(index[k])
+            dump.append(is_max)
+            find_max, find_min = not is_max, is_max
+            mx, mn = -np.inf, -np.inf
+            k += 1
+            if index[k - 1] + lookahead >= length:
+                # end is within lookahead no more peaks can be found
+                found_last = True
+                break
+        if found_last:
+            break
 
     if min_peaks and max_peaks:
         # ============== CLEAN ==============
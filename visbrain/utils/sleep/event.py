@@ -1,8 +1,15 @@
-"""Goup of functions for index / event managment."""
+"""Goup of functions for index / event managment.
+
+Events are either described by a continuous vector of indices or by (start,
+stop) arrays. Functions working on (start, stop) arrays are vectorized over
+events.
+"""
 
 import numpy as np
 
-__all__ = ('_events_distance_fill', '_events_to_index', '_index_to_events')
+__all__ = ('_events_distance_fill', '_events_to_index', '_index_to_events',
+           '_events_reduce', '_events_snap', '_events_merge',
+           '_events_duration')
 
 
 def _events_distance_fill(index, min_distance_ms, sf):
@@ -32,8 +39,7 @@ def _events_distance_fill(index, min_distance_ms, sf):
     bad = idx_distance[np.where(distance < min_distance)[0]]
     # Fill gap between events separated with less than min_distance_ms
     if len(bad) > 0:
-        fill = np.hstack([np.arange(index[j] + 1, index[j + 1])
-                          for i, j in enumerate(bad)])
+        fill = _index_to_events(np.c_[index[bad] + 1, index[bad + 1] - 1])
         f_index = np.sort(np.append(index, fill))
         return f_index
     else:
@@ -54,10 +60,13 @@ def _events_to_index(x):
         An array of shape (n_events, 2) where the dimension 2 refer to the
         indices where each event start and finish.
     """
+    x = np.asarray(x)
+    if not x.size:
+        return np.zeros((0, 2), dtype=int)
     # Split indices where it stopped :
-    sp = np.split(x, np.where(np.diff(x) != 1)[0] + 1)
+    sp = np.flatnonzero(np.diff(x) != 1)
     # Return (start, end) :
-    return np.array([[k[0], k[-1]] for k in sp]).astype(int)
+    return np.c_[x[np.r_[0, sp + 1]], x[np.r_[sp, len(x) - 1]]].astype(int)
 
 
 def _index_to_events(x):
@@ -73,7 +82,138 @@ def _index_to_events(x):
     index : array_like
         Continuous array of indicies.
     """
-    index = np.array([])
-    for k in range(x.shape[0]):
-        index = np.append(index, np.arange(x[k, 0], x[k, 1] + 1))
-    return index.astype(int)
+    x = np.asarray(x, dtype=int).reshape(-1, 2)
+    length = np.maximum(x[:, 1] - x[:, 0] + 1, 0)
+    # Offset of each event in the output :
+    offset = np.cumsum(length) - length
+    return np.arange(length.sum()) + np.repeat(x[:, 0] - offset, length)
+
+
+def _events_reduce(data, start, stop, reduce='ptp'):
+    """Reduce data over each [start, stop[ segment.
+
+    Parameters
+    ----------
+    data : array_like
+        Data vector.
+    start, stop : array_like
+        Arrays of segment bounds (stop excluded) of shape (n_events,).
+    reduce : {'ptp', 'max', 'min', 'sum', 'mean', 'rms', 'power'}
+        The reduction. 'power' is the mean squared value. The reduction of
+        an empty segment is 0 for 'ptp' and 'sum' and NaN otherwise.
+
+    Returns
+    -------
+    values : array_like
+        Array of reduced values of shape (n_events,).
+    """
+    assert reduce in ('ptp', 'max', 'min', 'sum', 'mean', 'rms', 'power')
+    start, stop = np.asarray(start, dtype=int), np.asarray(stop, dtype=int)
+    if not start.size:
+        return np.zeros((0,), dtype=float)
+    empty = stop <= start
+    # Segment bounds are interleaved (the reduction over [stop, next start[
+    # is dropped). A trailing value allows to reduce up to the end of data :
+    bounds = np.c_[start, np.maximum(start, stop)].ravel()
+    data = np.r_[np.asarray(data, dtype=float), 0.]
+    if reduce == 'min':
+        values = np.minimum.reduceat(data, bounds)[::2]
+    elif reduce in ('ptp', 'max'):
+        values = np.maximum.reduceat(data, bounds)[::2]
+        if reduce == 'ptp':
+            values -= np.minimum.reduceat(data, bounds)[::2]
+    else:
+        if reduce in ('rms', 'power'):
+            data = data * data
+        values = np.add.reduceat(data, bounds)[::2]
+        if reduce != 'sum':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values /= stop - start
+        if reduce == 'rms':
+            np.sqrt(values, out=values)
+    values[empty] = 0. if reduce in ('ptp', 'sum') else np.nan
+    return values
+
+
+def _events_snap(index, crossings):
+    """Snap indices to the surrounding threshold crossings.
+
+    Parameters
+    ----------
+    index : array_like
+        Array of indices of shape (n_events,).
+    crossings : array_like
+        Sorted array of threshold-crossing indices.
+
+    Returns
+    -------
+    start, stop : array_like
+        For each index, the last crossing strictly before and the first
+        crossing strictly after. If there's no such crossing, the index is
+        used instead.
+    """
+    index, crossings = np.asarray(index), np.asarray(crossings)
+    n = len(crossings)
+    before = np.searchsorted(crossings, index, side='left') - 1
+    after = np.searchsorted(crossings, index, side='right')
+    start = np.where(before >= 0, crossings[np.clip(before, 0, n - 1)], index)
+    stop = np.where(after < n, crossings[np.clip(after, 0, n - 1)], index)
+    return start.astype(int), stop.astype(int)
+
+
+def _events_merge(start, stop, min_distance_ms, sf):
+    """Merge events separated by less than a minimum distance.
+
+    Overlapping and contiguous events are always merged.
+
+    Parameters
+    ----------
+    start, stop : array_like
+        Arrays of (included) event bounds of shape (n_events,).
+    min_distance_ms : float
+        Minimum distance (ms) between two events to consider them as two
+        distinct events.
+    sf : float
+        Sampling frequency of the data (Hz).
+
+    Returns
+    -------
+    start, stop : array_like
+        Bounds of merged events.
+    """
+    start, stop = np.asarray(start, dtype=int), np.asarray(stop, dtype=int)
+    if not start.size:
+        return start, stop
+    order = np.argsort(start, kind='mergesort')
+    start, stop = start[order], stop[order]
+    # Distance between an event and the furthest end of previous events :
+    gap = start[1:] - np.maximum.accumulate(stop)[:-1]
+    min_distance = min_distance_ms / 1000. * sf
+    first = np.flatnonzero(np.r_[True, (gap > 1) & (gap >= min_distance)])
+    return start[first], np.maximum.reduceat(stop, first)
+
+
+def _events_duration(start, stop, sf, tmin=None, tmax=None):
+    """Get events with a duration comprised in ]tmin, tmax[.
+
+    Parameters
+    ----------
+    start, stop : array_like
+        Arrays of event bounds of shape (n_events,).
+    sf : float
+        Sampling frequency of the data (Hz).
+    tmin, tmax : float | None
+        Minimum and maximum durations (ms). Use None for no limit.
+
+    Returns
+    -------
+    good : array_like
+        Boolean array of shape (n_events,).
+    """
+    duration_ms = (np.asarray(stop) - np.asarray(start)) * (1000 / sf)
+    good = np.ones(duration_ms.shape, dtype=bool)
+    if tmin is not None:
+        good &= duration_ms > tmin
+    if tmax is not None:
+        good &= duration_ms < tmax
+    return good
@@ -2,7 +2,7 @@
 
 import numpy as np
 
-__all__ = ('transient', 'sleepstats')
+__all__ = ('transient', 'sleepstats', 'HypnoTally')
 
 
 def transient(data, xvec=None):
@@ -84,46 +84,106 @@ def sleepstats(hypno, sf_hyp):
     stats: dict
         Sleep statistics (expressed in minutes)
     """
-    stats = {}
-    tov = np.nan
-
-    # Downsample to 1 value per second
-    hypno = hypno[::int(sf_hyp)]
-
-    stats['TIB'] = len(hypno)
-    stats['TDT'] = np.where(hypno != 0)[0].max() if np.nonzero(
-        hypno)[0].size else tov
-
-    # Duration of each sleep stages
-    stats['Art'] = hypno[hypno == -1].size
-    stats['W'] = hypno[hypno == 0].size
-    stats['N1'] = hypno[hypno == 1].size
-    stats['N2'] = hypno[hypno == 2].size
-    stats['N3'] = hypno[hypno == 3].size
-    stats['REM'] = hypno[hypno == 4].size
-
-    # Sleep stage latencies
-    stats['LatN1'] = np.where(hypno == 1)[0].min() if 1 in hypno else tov
-    stats['LatN2'] = np.where(hypno == 2)[0].min() if 2 in hypno else tov
-    stats['LatN3'] = np.where(hypno == 3)[0].min() if 3 in hypno else tov
-    stats['LatREM'] = np.where(hypno == 4)[0].min() if 4 in hypno else tov
-
-    if not np.isnan(stats['LatN1']) and not np.isnan(stats['TDT']):
-        hypno_s = hypno[stats['LatN1']:stats['TDT']]
-
-        stats['SPT'] = hypno_s.size
-        stats['WASO'] = hypno_s[hypno_s == 0].size
-        stats['TST'] = stats['SPT'] - stats['WASO']
-    else:
-        stats['SPT'] = tov
-        stats['WASO'] = tov
-        stats['TST'] = tov
+    return HypnoTally(hypno, sf_hyp).stats()
+
 
-    # Convert to minutes
-    for key, value in stats.items():
-        stats[key] = value / 60
+class HypnoTally(object):
+    """Stage durations and transitions of an hypnogram, updated by edits.
 
-    stats['SE'] = np.round(stats['TST'] / stats['TDT'] * 100., 2)
-    stats['Units'] = 'minutes'
+    As in :func:`sleepstats`, the hypnogram is downsampled to one value per
+    second. Editing a stage only updates the tally over the edited span.
+
+    Parameters
+    ----------
+    hypno : array_like
+        Hypnogram vector.
+    sf_hyp : float
+        The sampling frequency of the hypnogram.
+    """
 
-    return stats
+    def __init__(self, hypno, sf_hyp):
+        """Init."""
+        self._step = int(sf_hyp)
+        self._hypno = np.array(hypno[::self._step])
+        stages, counts = np.unique(self._hypno, return_counts=True)
+        self.durations = dict(zip(stages.tolist(), counts.tolist()))
+        self.transitions = np.count_nonzero(np.diff(self._hypno))
+
+    def __len__(self):
+        """Get the number of seconds."""
+        return len(self._hypno)
+
+    def set_stage(self, start, stop, stage):
+        """Set a stage between two samples of the original hypnogram.
+
+        Parameters
+        ----------
+        start : int
+            The index where the stage start.
+        stop : int
+            The index where the stage end (excluded).
+        stage : int
+            Stage value.
+        """
+        n = len(self)
+        a = min(max(-(-int(start) // self._step), 0), n)
+        b = min(max(-(-int(stop) // self._step), 0), n)
+        if a >= b:
+            return
+        # Stages durations :
+        stages, counts = np.unique(self._hypno[a:b], return_counts=True)
+        for k, c in zip(stages.tolist(), counts.tolist()):
+            self.durations[k] -= c
+        self.durations[stage] = self.durations.get(stage, 0) + b - a
+        # Transitions (including the borders of the span) :
+        sl = slice(max(a - 1, 0), min(b + 1, n))
+        self.transitions -= np.count_nonzero(np.diff(self._hypno[sl]))
+        self._hypno[a:b] = stage
+        self.transitions += np.count_nonzero(np.diff(self._hypno[sl]))
+
+    def stats(self):
+        """Get sleep statistics (see :func:`sleepstats`).
+
+        Returns
+        -------
+        stats: dict
+            Sleep statistics (expressed in minutes)
+        """
+        hypno, dur = self._hypno, self.durations
+        stats = {}
+        tov = np.nan
+
+        stats['TIB'] = len(hypno)
+        is_sleep = hypno != 0
+        stats['TDT'] = len(hypno) - np.argmax(is_sleep[::-1]) - 1 if len(
+            hypno) - dur.get(0, 0) else tov
+
+        # Duration of each sleep stages
+        for name, k in zip(['Art', 'W', 'N1', 'N2', 'N3', 'REM'],
+                           [-1, 0, 1, 2, 3, 4]):
+            stats[name] = dur.get(k, 0)
+
+        # Sleep stage latencies
+        for name, k in zip(['LatN1', 'LatN2', 'LatN3', 'LatREM'],
+                           [1, 2, 3, 4]):
+            stats[name] = np.argmax(hypno == k) if dur.get(k, 0) else tov
+
+        if not np.isnan(stats['LatN1']) and not np.isnan(stats['TDT']):
+            hypno_s = hypno[stats['LatN1']:stats['TDT']]
+
+            stats['SPT'] = hypno_s.size
+            stats['WASO'] = hypno_s.size - np.count_nonzero(hypno_s)
+            stats['TST'] = stats['SPT'] - stats['WASO']
+        else:
+            stats['SPT'] = tov
+            stats['WASO'] = tov
+            stats['TST'] = tov
+
+        # Convert to minutes
+        for key, value in stats.items():
+            stats[key] = value / 60
+
+        stats['SE'] = np.round(stats['TST'] / stats['TDT'] * 100., 2)
+        stats['Units'] = 'minutes'
+
+        return stats
@@ -1,5 +1,6 @@
 """Test functions in detections.py."""
 import numpy as np
+from scipy.signal import detrend
 
 from visbrain.utils.sleep.detection import (kcdetect, spindlesdetect,
                                             remdetect, slowwavedetect,
@@ -22,6 +23,64 @@ art = np.full((n_per_seg,), -1)
 hypno = np.hstack((wake, n1, n2, n3, rem, art))
 
 
+def _peakdetect_loop(sf, y_axis, x_axis=None, lookahead=200, delta=1.,
+                     get='max', threshold='auto'):
+    """Reference (sample by sample) peak detection."""
+    if x_axis is None:
+        x_axis = range(len(y_axis))
+    y_axis, x_axis = np.asarray(y_axis), np.asarray(x_axis)
+    length = len(y_axis)
+    max_peaks, min_peaks, dump = [], [], []
+    mn, mx = np.inf, -np.inf
+    if threshold is not None:
+        if threshold == 'auto':
+            threshold = np.std(y_axis)
+        y_axisp = detrend(y_axis)
+        y_axisp -= y_axisp.mean()
+        above = np.abs(y_axisp) >= threshold
+        zp = zip(np.arange(length)[above], x_axis[above], y_axis[above])
+    else:
+        zp = zip(np.arange(length)[:-lookahead], x_axis[:-lookahead],
+                 y_axis[:-lookahead])
+    for index, x, y in zp:
+        if y > mx:
+            mx = y
+        if y < mn:
+            mn = y
+        if y < mx - delta and mx != np.inf:
+            if y_axis[index:index + lookahead].max() < mx:
+                max_peaks.append(index)
+                dump.append(True)
+                mx = np.inf
+                mn = np.inf
+                if index + lookahead >= length:
+                    break
+                continue
+        if y > mn + delta and mn != -np.inf:
+            if y_axis[index:index + lookahead].min() > mn:
+                min_peaks.append(index)
+                dump.append(False)
+                mn = -np.inf
+                mx = -np.inf
+                if index + lookahead >= length:
+                    break
+    if min_peaks and max_peaks:
+        if threshold is None:
+            if dump[0]:
+                max_peaks.pop(0)
+            else:
+                min_peaks.pop(0)
+        if get == 'max':
+            index = np.array(max_peaks)
+        elif get == 'min':
+            index = np.array(min_peaks)
+        elif get == 'minmax':
+            index = np.vstack((min_peaks, max_peaks))
+        return np.c_[index, index]
+    else:
+        return np.array([])
+
+
 class TestDetections(object):
     """Test functions in detection.py."""
 
@@ -52,3 +111,26 @@ class TestDetections(object):
         peakdetect(sf, data, get='min')
         peakdetect(sf, data, get='max')
         peakdetect(sf, data, get='minmax', threshold=.6)
+
+    def test_peakdetect_regression(self):
+        """Test peakdetect against the sample by sample implementation."""
+        for look, delta, thr in [(10, 0., None), (50, .5, 'auto'),
+                                 (200, 1., .5)]:
+            for get in ['min', 'max']:
+                ref = _peakdetect_loop(sf, signal, None, look, delta, get,
+                                       thr)
+                for chunk_size in [None, 1000]:
+                    out = peakdetect(sf, signal, None, look, delta, get, thr,
+                                     chunk_size=chunk_size)
+                    np.testing.assert_array_equal(out, ref)
+
+    def test_peakdetect_memmap(self):
+        """Test peakdetect on memory-mapped data."""
+        import os
+        from visbrain.io import path_to_tmp
+        file = os.path.join(path_to_tmp(folder='memmap'), 'peaks.dat')
+        mm = np.memmap(file, dtype=np.float32, mode='w+', shape=signal.shape)
+        mm[:] = signal
+        ref = peakdetect(sf, np.array(mm), lookahead=20, threshold=None)
+        out = peakdetect(sf, mm, lookahead=20, threshold=None, chunk_size=999)
+        np.testing.assert_array_equal(out, ref)
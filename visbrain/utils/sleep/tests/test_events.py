@@ -2,7 +2,9 @@
 import numpy as np
 
 from visbrain.utils.sleep.event import (_events_distance_fill,
-                                        _events_to_index, _index_to_events)
+                                        _events_to_index, _index_to_events,
+                                        _events_reduce, _events_snap,
+                                        _events_merge, _events_duration)
 
 
 class TestEvent(object):
@@ -22,13 +24,59 @@ class TestEvent(object):
 
     def test_events_distance_fill(self):
         """Test function events_distance_fill."""
-        _events_distance_fill(self._get_index(), 200., 100.)
+        index = _events_distance_fill(self._get_index(), 40., 100.)
+        np.testing.assert_array_equal(index, np.r_[0:11, 14:20])
 
     def test_event_to_index(self):
         """Test function event_to_index."""
-        _events_to_index(self._get_index())
+        idx = _events_to_index(self._get_index())
+        np.testing.assert_array_equal(idx, [[0, 4], [7, 10], [14, 19]])
+        assert _events_to_index([]).shape == (0, 2)
 
     def test_index_to_event(self):
         """Test function index_to_event."""
         idx = _events_to_index(self._get_index())
-        _index_to_events(idx)
+        np.testing.assert_array_equal(_index_to_events(idx),
+                                      self._get_index())
+
+    def test_events_reduce(self):
+        """Test function events_reduce."""
+        data, _, idx_start, idx_stop = self._get_data()
+        idx_start, idx_stop = np.r_[idx_start, 5, 995], np.r_[idx_stop, 5,
+                                                              1000]
+        fcns = {'ptp': np.ptp, 'max': np.max, 'min': np.min, 'sum': np.sum,
+                'mean': np.mean, 'rms': lambda x: np.sqrt(np.mean(x ** 2)),
+                'power': lambda x: np.mean(x ** 2)}
+        for reduce, fcn in fcns.items():
+            values = _events_reduce(data, idx_start, idx_stop, reduce)
+            ref = [fcn(data[k:i]) for k, i in zip(idx_start[:3],
+                                                  idx_stop[:3])]
+            np.testing.assert_allclose(values[[0, 1, 2, 4]],
+                                       ref + [fcn(data[995:])])
+            # Empty segment :
+            assert (values[3] == 0.) or np.isnan(values[3])
+
+    def test_events_snap(self):
+        """Test function events_snap."""
+        crossings = np.array([10, 20, 30, 40])
+        start, stop = _events_snap([15, 20, 35, 5, 45], crossings)
+        np.testing.assert_array_equal(start, [10, 10, 30, 5, 40])
+        np.testing.assert_array_equal(stop, [20, 30, 40, 10, 45])
+
+    def test_events_merge(self):
+        """Test function events_merge."""
+        start, stop = _events_merge([0, 2, 20, 24, 50], [5, 4, 21, 30, 60],
+                                    40., 100.)
+        np.testing.assert_array_equal(start, [0, 20, 50])
+        np.testing.assert_array_equal(stop, [5, 30, 60])
+        # Same as filling the continuous vector of indices :
+        index = self._get_index()
+        start, stop = _events_merge(*_events_to_index(index).T, 40., 100.)
+        np.testing.assert_array_equal(np.c_[start, stop], _events_to_index(
+            _events_distance_fill(index, 40., 100.)))
+
+    def test_events_duration(self):
+        """Test function events_duration."""
+        good = _events_duration([0, 0, 0], [10, 20, 30], 100., 100., 300.)
+        np.testing.assert_array_equal(good, [False, True, False])
+        assert _events_duration([0], [10], 100.).all()
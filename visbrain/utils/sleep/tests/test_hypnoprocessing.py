@@ -1,7 +1,8 @@
 """Test functions in hypnoprocessing.py."""
 import numpy as np
 
-from visbrain.utils.sleep.hypnoprocessing import (transient, sleepstats)
+from visbrain.utils.sleep.hypnoprocessing import (transient, sleepstats,
+                                                  HypnoTally)
 
 
 class TestHypnoprocessing(object):
@@ -23,3 +24,35 @@ class TestHypnoprocessing(object):
         """Test function sleepstats."""
         hypno = np.random.randint(-1, 3, (2000,))
         sleepstats(hypno, 100.)
+
+    def test_sleepstats_values(self):
+        """Test values returned by sleepstats on a known hypnogram."""
+        # W, Art, N1, N2, W, N3, REM, W (in seconds) :
+        hypno = np.repeat([0, -1, 1, 2, 0, 3, 4, 0],
+                          [60, 60, 120, 180, 60, 120, 60, 60])
+        stats = sleepstats(np.repeat(hypno, 2), 2.)
+        expected = dict(TIB=12., TDT=659 / 60., Art=1., W=3., N1=2., N2=3.,
+                        N3=2., REM=1., LatN1=2., LatN2=4., LatN3=8.,
+                        LatREM=10., SPT=539 / 60., WASO=1., TST=479 / 60.,
+                        SE=72.69)
+        assert stats.pop('Units') == 'minutes'
+        assert stats == expected
+
+    def test_hypno_tally(self):
+        """Test HypnoTally edits against sleepstats."""
+        sf = 10.
+        hypno = np.repeat(np.random.randint(-1, 5, (50,)),
+                          np.random.randint(5, 100, (50,))).astype(float)
+        tally = HypnoTally(hypno, sf)
+        for k in range(20):
+            start = np.random.randint(len(hypno))
+            stop = start + np.random.randint(1, 200)
+            stage = np.random.randint(-1, 5)
+            hypno[start:stop] = stage
+            tally.set_stage(start, stop, stage)
+            h = hypno[::int(sf)]
+            assert tally.transitions == np.count_nonzero(np.diff(h))
+            ref, stats = sleepstats(hypno, sf), tally.stats()
+            assert list(ref.keys()) == list(stats.keys())
+            np.testing.assert_array_equal(list(ref.values())[:-1],
+                                          list(stats.values())[:-1])
@@ -40,6 +40,39 @@ class TestColor(object):
                        over='red', cmap='Spectral_r')
         array2colormap(vec, faces_render=True)
 
+    def test_array2colormap_lut(self):
+        """Test the lookup table of array2colormap against matplotlib."""
+        from matplotlib import cm
+        import matplotlib.colors as mplcol
+        x = np.random.randn(100, 20)
+        x[0, 0] = np.nan
+        kw = dict(cmap='Spectral_r', clim=(-1., 1.), vmin=-.5, under='gray',
+                  vmax=.7, over='red')
+        sc = cm.ScalarMappable(cmap=kw['cmap'],
+                               norm=mplcol.Normalize(*kw['clim']))
+        expected = sc.to_rgba(x).astype(np.float32)
+        expected[x < kw['vmin'], :] = color2vb(kw['under'])
+        expected[x > kw['vmax'], :] = color2vb(kw['over'])
+        np.testing.assert_allclose(array2colormap(x, **kw), expected)
+        # Preallocated output :
+        out = np.zeros((100, 20, 4), dtype=np.float32)
+        col = array2colormap(x, out=out, translucent=(None, 0.), **kw)
+        assert col is out
+        assert np.array_equal(out[..., -1], ~(x <= 0.))
+        # Masked values :
+        x_m = np.ma.masked_array([1., 2., 3.], mask=[False, True, False])
+        assert not array2colormap(x_m)[1, :].any()
+
+    def test_array2colormap_listed(self):
+        """Test array2colormap with a qualitative colormap."""
+        from matplotlib import cm
+        import matplotlib.colors as mplcol
+        x = np.random.rand(1000)
+        sc = cm.ScalarMappable(cmap='tab10', norm=mplcol.Normalize(0., 1.))
+        expected = sc.to_rgba(x).astype(np.float32)
+        np.testing.assert_array_equal(array2colormap(
+            x, cmap='tab10', clim=(0., 1.)), expected)
+
     def test_cmap_to_glsl(self):
         """Test function cmap_to_glsl."""
         from vispy.color.colormap import Colormap
@@ -1,4 +1,5 @@
 """Test functions in guitools.py."""
+import numpy as np
 import pytest
 from PyQt5 import QtWidgets, QtCore
 
@@ -9,7 +10,7 @@ from visbrain.utils.guitools import (slider2opacity, textline2color,
                                      get_combo_list_index, safely_set_cbox,
                                      safely_set_spin, safely_set_slider,
                                      toggle_enable_tab, get_screen_size,
-                                     set_widget_size)
+                                     set_widget_size, ArrayTableModel)
 
 
 class TestGuitools(object):
@@ -161,3 +162,41 @@ class TestGuitools(object):
         app = QtWidgets.QApplication([])
         w = QtWidgets.QWidget()
         set_widget_size(app, w)
+
+    def test_array_table_model(self):
+        """Test class ArrayTableModel."""
+        model = ArrayTableModel(['Start', 'End', 'Text'],
+                                dtypes=[float, float, object], editable=[0, 2],
+                                fmt={1: lambda k: '%.1f' % k})
+        model.set_columns([[3., 1., 2.], [4., 2., 3.], ['c', 'a', 'b']])
+        assert (model.rowCount(), model.columnCount()) == (3, 3)
+        assert model.headerData(2, QtCore.Qt.Horizontal) == 'Text'
+        assert model.text(0, 1) == '4.0'
+        assert not model.flags(model.index(0, 1)) & QtCore.Qt.ItemIsEditable
+        # Edit (including a rejected one) :
+        edited = []
+        model.edited.connect(lambda *args: edited.append(args))
+        assert model.setData(model.index(1, 0), '1.5')
+        assert not model.setData(model.index(1, 0), 'bad')
+        assert model.columns[0][1] == 1.5 and edited == [(1, 0, 1.)]
+        # Sort through the proxy without touching the arrays :
+        model.proxy.sort(0, QtCore.Qt.AscendingOrder)
+        order = [model.proxy.mapToSource(model.proxy.index(k, 0)).row()
+                 for k in range(3)]
+        assert order == [1, 2, 0]
+        np.testing.assert_array_equal(model.columns[0], [3., 1.5, 2.])
+        # Filter :
+        model.proxy.setFilterKeyColumn(2)
+        model.proxy.setFilterFixedString('b')
+        assert model.proxy.rowCount() == 1
+        model.proxy.setFilterFixedString('')
+        # Insert / remove rows :
+        model.insert_rows(1, [[10., 11.], [12., 13.], ['d', 'e']])
+        np.testing.assert_array_equal(model.columns[0],
+                                      [3., 10., 11., 1.5, 2.])
+        model.removeRows(0, 2)
+        assert list(model.columns[2]) == ['e', 'a', 'b']
+        model.append_rows([[np.nan], [np.nan], ['']])
+        assert model.text(3, 0) == '' and len(model) == 4
+        model.clear()
+        assert not len(model)
@@ -1,6 +1,20 @@
 """Test functions in memory.py."""
 import numpy as np
-from visbrain.utils.memory import arrays_share_data, id, code_timer
+from visbrain.utils.memory import (arrays_share_data, id, code_timer,
+                                   LRUCache, Prefetcher, is_lazy_array,
+                                   check_lazy_array, iter_chunks,
+                                   chunked_stats, as_float32)
+from visbrain.io import path_to_tmp
+
+
+def _memmap(x, name='lazy.dat'):
+    """Get a read-only memory-mapped copy of an array."""
+    import os
+    filename = os.path.join(path_to_tmp(folder='memmap'), name)
+    mm = np.memmap(filename, dtype=x.dtype, mode='w+', shape=x.shape)
+    mm[:] = x
+    mm.flush()
+    return np.memmap(filename, dtype=x.dtype, mode='r', shape=x.shape)
 
 
 class TestMemory(object):
@@ -21,3 +35,55 @@ class TestMemory(object):
         start = code_timer(verbose=False)
         code_timer(start, unit='ms')
         code_timer(start, unit='us')
+
+    def test_lru_cache(self):
+        """Test the LRUCache class."""
+        cache = LRUCache(maxsize=2)
+        assert cache.get('a', lambda: 1) == 1
+        assert cache.get('a', lambda: 2) == 1  # cached
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)  # 'b' is the least recently used
+        assert 'b' not in cache and len(cache) == 2
+        assert cache.get('b') is None
+        # Bytes limit :
+        cache = LRUCache(maxsize=10, max_bytes=1000)
+        for k in range(3):
+            cache.set(k, np.zeros((100,), dtype=np.float32))
+        assert len(cache) == 2 and cache.nbytes == 800
+        cache.clear()
+        assert not len(cache)
+
+    def test_prefetcher(self):
+        """Test the Prefetcher class."""
+        cache = LRUCache()
+        pref = Prefetcher(cache)
+        pref.schedule([(k, lambda k=k: k ** 2) for k in range(5)])
+        assert pref.wait(timeout=10.)
+        assert [cache.get(k) for k in range(5)] == [0, 1, 4, 9, 16]
+
+    def test_lazy_arrays(self):
+        """Test chunked functions on memory-mapped arrays."""
+        x = np.random.rand(7, 3, 50)
+        mm = _memmap(x)
+        assert is_lazy_array(mm) and not is_lazy_array(x)
+        assert check_lazy_array(mm) is mm
+        assert isinstance(check_lazy_array([[0, 1]], ndim=[2]), np.ndarray)
+        # Chunks :
+        chunks = list(iter_chunks(mm, axis=2, max_bytes=1000))
+        assert len(chunks) > 1
+        assert all(not isinstance(c, np.memmap) for _, c in chunks)
+        np.testing.assert_array_equal(np.concatenate([c for _, c in chunks],
+                                                     axis=2), x)
+        # Statistics :
+        stats = ('min', 'max', 'ptp', 'mean', 'std')
+        for axis in [None, 0, 2]:
+            st = chunked_stats(mm, axis=axis, stats=stats, max_bytes=1000)
+            for k in stats:
+                np.testing.assert_allclose(st[k], getattr(np, k)(x, axis=axis))
+        # Conversion :
+        x_32 = x.astype(np.float32)
+        assert as_float32(x_32) is x_32
+        out = as_float32(mm, scale=2., max_bytes=1000)
+        assert out.dtype == np.float32 and not isinstance(out, np.memmap)
+        np.testing.assert_allclose(out, 2. * x, rtol=1e-6)
@@ -3,7 +3,8 @@ import numpy as np
 
 from visbrain.utils.mesh import (convert_meshdata, vispy_array, volume_to_mesh,
                                  mesh_edges, smoothing_matrix,
-                                 laplacian_smoothing)
+                                 laplacian_smoothing, points_in_mesh,
+                                 mesh_ray_grids)
 
 
 class TestMesh(object):
@@ -72,3 +73,23 @@ class TestMesh(object):
         self._creation()
         laplacian_smoothing(self.vertices, self.faces)
         laplacian_smoothing(self.vertices, self.faces, n_neighbors=3)
+
+    def test_points_in_mesh(self):
+        """Test function points_in_mesh."""
+        from vispy.geometry import create_sphere
+        mesh = create_sphere(50, 50, radius=10.)
+        vertices, faces = mesh.get_vertices(), mesh.get_faces()
+        xyz = np.random.uniform(-12., 12., (2000, 3))
+        norm = np.linalg.norm(xyz, axis=1)
+        xyz = xyz[np.abs(norm - 10.) > .5, :]
+        inside = points_in_mesh(xyz, vertices, faces)
+        assert np.array_equal(inside, np.linalg.norm(xyz, axis=1) < 10.)
+        # Precomputed grids :
+        grids = mesh_ray_grids(vertices, faces)
+        assert np.array_equal(inside, points_in_mesh(xyz, grids=grids))
+        # Non-convex mesh (two disjoint spheres) :
+        v_2 = np.r_[vertices - [15., 0., 0.], vertices + [15., 0., 0.]]
+        f_2 = np.r_[faces, faces + len(vertices)]
+        inside = points_in_mesh([[-15., 0., 0.], [0., 0., 0.],
+                                 [15., 1., 1.]], v_2, f_2)
+        assert np.array_equal(inside, [True, False, True])
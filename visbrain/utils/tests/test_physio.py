@@ -2,8 +2,8 @@
 import numpy as np
 
 from visbrain.utils.physio import (find_non_eeg, rereferencing, bipolarization,
-                                   commonaverage, tal2mni, mni2tal,
-                                   generate_eeg)
+                                   commonaverage, montage_matrix, Montage,
+                                   tal2mni, mni2tal, generate_eeg)
 
 
 class TestPhysio(object):
@@ -48,6 +48,43 @@ class TestPhysio(object):
         data_r, chan_r, consider = commonaverage(data, channels, ignore)
         assert chan_r == ['Cz-m', 'Pz-m', 'Fz-m', 'EOG']
 
+    def test_montage(self):
+        """Test function montage_matrix and Montage."""
+        for meth in ['reference', 'average', 'bipolar']:
+            data, channels, ignore = self._generate_eeg_dataset('intra')
+            raw = data.copy()
+            matrix, chan_m, consider_m = montage_matrix(meth, channels, 1,
+                                                        ignore)
+            if meth == 'reference':
+                out = rereferencing(data, list(channels), 1, ignore)
+            elif meth == 'average':
+                out = commonaverage(data, list(channels), ignore)
+            elif meth == 'bipolar':
+                out = bipolarization(data, list(channels), ignore)
+            data_m = Montage(raw, matrix)
+            assert chan_m == out[1]
+            assert np.array_equal(consider_m, out[2])
+            np.testing.assert_allclose(np.asarray(data_m), out[0])
+            np.testing.assert_allclose(data_m[:, 10:20], out[0][:, 10:20])
+            np.testing.assert_allclose(data_m[2, [3, 5]], out[0][2, [3, 5]])
+        # Derivations (raw data should not be modified) :
+        data, channels, _ = self._generate_eeg_dataset('eeg')
+        raw = data.copy()
+        matrix, chan_m, _ = montage_matrix([('Cz', 'Pz'), ('EOG', None)],
+                                           channels)
+        data_m = Montage(data, matrix)
+        assert chan_m == ['Cz-Pz', 'EOG'] and data_m.shape == (2, 100)
+        np.testing.assert_allclose(data_m[0, :], data[0, :] - data[1, :])
+        np.testing.assert_allclose(data_m[1, :], data[3, :])
+        np.testing.assert_array_equal(data, raw)
+        # Ellipsis :
+        full = np.asarray(data_m)
+        for k in range(2):
+            np.testing.assert_allclose(data_m[..., k], full[..., k])
+            np.testing.assert_allclose(data_m[k, ...], full[k, ...])
+        np.testing.assert_allclose(data_m[...], full)
+        np.testing.assert_allclose(data_m[..., 1:5], full[..., 1:5])
+
     def test_tal2mni(self):
         """Test function tal2mni."""
         xyz = self._generate_coordinates()
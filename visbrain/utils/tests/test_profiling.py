@@ -0,0 +1,64 @@
+"""Test functions in profiling.py."""
+import json
+
+import numpy as np
+
+from visbrain.utils.profiling import Tracer, TRACER, traced
+from visbrain.utils import array2colormap
+
+
+class TestProfiling(object):
+    """Test functions in profiling.py."""
+
+    def test_disabled(self):
+        """Test that a disabled tracer doesn't record anything."""
+        tr = Tracer()
+        with tr.span('a') as sp:
+            sp.set(nbytes=10)
+        tr.count('c', 2)
+        tr.mark('m')
+        assert not tr.records and not tr.counters
+
+    def test_spans(self):
+        """Test nested spans, counters and marks."""
+        tr = Tracer(enabled=True)
+        records = []
+        tr.add_sink(records.append)
+        with tr.span('parent', file='f'):
+            with tr.span('child') as sp:
+                sp.set(nbytes=10)
+            tr.count('bytes', 10)
+            tr.count('bytes', 5)
+            tr.mark('step')
+        assert tr.counters == {'bytes': 15}
+        spans = [k for k in tr.records if k['type'] == 'span']
+        assert [k['name'] for k in spans] == ['child', 'parent']
+        assert spans[0]['parent'] == 'parent' and spans[0]['depth'] == 1
+        assert spans[0]['attrs'] == {'nbytes': 10}
+        assert spans[1]['duration'] >= spans[0]['duration']
+        assert len(records) == len(tr.records) == 5
+        assert tr.summary()['child']['calls'] == 1
+        # Exports :
+        js = json.loads(tr.to_json())
+        assert js['counters'] == {'bytes': 15}
+        trace = json.loads(tr.to_chrome_trace())['traceEvents']
+        assert [k['ph'] for k in trace] == ['X', 'C', 'C', 'i', 'X']
+        tr.clear()
+        assert not tr.records
+
+    def test_traced(self):
+        """Test the traced decorator on instrumented functions."""
+        TRACER.enable()
+        try:
+            TRACER.clear()
+            array2colormap(np.random.rand(10))
+
+            @traced('custom')
+            def fcn(x):
+                return 2 * x
+            assert fcn(2) == 4
+            assert set(TRACER.summary()) == {'utils.array2colormap',
+                                             'custom'}
+        finally:
+            TRACER.disable()
+            TRACER.clear()
@@ -12,6 +12,7 @@ Authors: Etienne Combrisson <e.combrisson@gmail.com>
 License: BSD (3-clause)
 """
 import numpy as np
+from scipy.spatial import cKDTree
 import logging
 
 from vispy import gloo
@@ -20,7 +21,7 @@ import vispy.visuals.transforms as vist
 from vispy.scene.visuals import create_visual_node
 
 from ..utils import (array2colormap, color2vb, convert_meshdata, vispy_array,
-                     wrap_properties)
+                     wrap_properties, mesh_ray_grids, points_in_mesh, TRACER)
 
 
 logger = logging.getLogger('visbrain')
@@ -33,10 +34,14 @@ VERT_SHADER = """
 varying vec3 v_position;
 varying vec4 v_color;
 varying vec3 v_normal;
+varying float v_data;
+varying float v_cmap;
 
 void main() {
     v_position = $a_position;
     v_normal = $a_normal;
+    v_data = $a_data;
+    v_cmap = 0.;
 
     // Mask : (0. = (white, sulcus), 1. = color, 2. = mask_color)
     // Sulcus : (0. = white, sulcus = gray)
@@ -53,7 +58,9 @@ void main() {
     }
     else if ($a_mask == 1.)
     {
-        v_color = $a_color;
+        // In scalar mode, the color is computed by the fragment shader
+        v_color = $a_color * (1. - $u_use_cmap);
+        v_cmap = $u_use_cmap;
     }
     else if ($a_mask == 2.)
     {
@@ -76,11 +83,34 @@ FRAG_SHADER = """
 varying vec3 v_position;
 varying vec4 v_color;
 varying vec3 v_normal;
+varying float v_data;
+varying float v_cmap;
+
+vec4 data_to_color(float x) {
+    // Under / over thresholds :
+    if (($u_isvmin == 1.) && (x < $u_vmin)) {
+        return $u_under;
+    }
+    if (($u_isvmax == 1.) && (x > $u_vmax)) {
+        return $u_over;
+    }
+    // Normalize using clim and get the color in the 1-D colormap texture :
+    float t = (x - $u_clim.x) / max($u_clim.y - $u_clim.x, 1e-20);
+    t = clamp(t, 0., 1.);
+    t = (t * ($u_cmap_size - 1.) + .5) / $u_cmap_size;
+    return texture2D($u_cmap, vec2(t, .5));
+}
 
 void main() {
 
+    // ----------------- Scalar color -----------------
+    vec4 color = v_color;
+    if (v_cmap > 0.) {
+        color += v_cmap * data_to_color(v_data) * $u_light_color;
+    }
+
     // ----------------- Ambient light -----------------
-    vec3 ambientLight = $u_coef_ambient * v_color.rgb * $u_light_intensity;
+    vec3 ambientLight = $u_coef_ambient * color.rgb * $u_light_intensity;
 
 
     // ----------------- Diffuse light -----------------
@@ -94,7 +124,7 @@ void main() {
     brightness = max(min(brightness, 1.0), 0.0);
 
     // Get diffuse light :
-    vec3 diffuseLight =  v_color.rgb * brightness * $u_light_intensity;
+    vec3 diffuseLight =  color.rgb * brightness * $u_light_intensity;
 
 
     // ----------------- Specular light -----------------
@@ -142,6 +172,12 @@ class BrainVisual(Visual):
         * 1. : custom colors (e.g projection, activation...)
         * 2. : uniform mask color (e.g non-significant p-values...)
 
+    Custom colors (level 1.) can either be defined as an RGBA color per vertex
+    (see `set_color`) or as a scalar per vertex that is turned into color
+    on the GPU using a colormap texture (see `set_scalars` and `set_cmap`). In
+    the second case, changing the colormap, clim, vmin or vmax only update
+    shader uniforms.
+
     Parameters
     ----------
     vertices : array_like | None
@@ -200,6 +236,9 @@ class BrainVisual(Visual):
         self._translucent = True
         self._alpha = alpha
         self._hemisphere = hemisphere
+        self._use_cmap = False
+        self._cmap_name = None
+        self._kdtree, self._ray_grids = {}, {}
 
         # Initialize the vispy.Visual class with the vertex / fragment buffer :
         Visual.__init__(self, vcode=VERT_SHADER, fcode=FRAG_SHADER)
@@ -214,20 +253,28 @@ class BrainVisual(Visual):
         self._vert_buffer = gloo.VertexBuffer(def_3)
         self._color_buffer = gloo.VertexBuffer(def_4)
         self._normals_buffer = gloo.VertexBuffer(def_3)
+        self._data_buffer = gloo.VertexBuffer(np.zeros((0,), np.float32))
         self._mask_buffer = gloo.VertexBuffer()
         self._sulcus_buffer = gloo.VertexBuffer()
         self._index_buffer = gloo.IndexBuffer()
+        # Colormap texture :
+        self._cmap_texture = gloo.Texture2D(np.zeros((1, 2, 4), np.float32),
+                                            interpolation='linear')
 
         # _________________ PROGRAMS _________________
         self.shared_program.vert['a_position'] = self._vert_buffer
         self.shared_program.vert['a_color'] = self._color_buffer
         self.shared_program.vert['a_normal'] = self._normals_buffer
+        self.shared_program.vert['a_data'] = self._data_buffer
+        self.shared_program.vert['u_use_cmap'] = 0.
         self.shared_program.frag['u_alpha'] = alpha
+        self.shared_program.frag['u_cmap'] = self._cmap_texture
 
         # _________________ DATA / CAMERA / LIGHT _________________
         self.set_data(vertices, faces, normals, hemisphere, lr_index,
                       invert_normals, sulcus, meshdata)
         self.set_camera(camera)
+        self.set_cmap()
         self.mask_color = mask_color
         self.light_color = light_color
         self.light_position = light_position
@@ -276,6 +323,7 @@ class BrainVisual(Visual):
         self._vertices = vertices
         self._faces = faces
         self._normals = normals
+        self._kdtree, self._ray_grids = {}, {}
         # Keep shapes :
         self._shapes = np.zeros(1, dtype=[('vert', int), ('faces', int)])
         self._shapes['vert'] = vertices.shape[0]
@@ -296,24 +344,30 @@ class BrainVisual(Visual):
         self._lr_index = lr_index.astype(bool)
 
         # ____________________ BUFFERS ____________________
-        # Vertices // faces // normals :
-        self._vert_buffer.set_data(vertices, convert=True)
-        self._normals_buffer.set_data(normals, convert=True)
-        self.hemisphere = hemisphere
-        # Mask :
-        self._mask = np.zeros((len(self),), dtype=np.float32)
-        self._mask_buffer.set_data(self._mask, convert=True)
-        self.shared_program.vert['a_mask'] = self._mask_buffer
-        # Sulcus :
-        sulcus = self._mask.copy() if sulcus is None else sulcus
-        sulcus = sulcus.astype(np.float32)
-        assert isinstance(sulcus, np.ndarray)
-        assert len(sulcus) == vertices.shape[0]
-        assert (sulcus.min() == 0.) and (sulcus.max() <= 1.)
-        self._sulcus_buffer.set_data(sulcus, convert=True)
-        self.shared_program.vert['a_sulcus'] = self._sulcus_buffer
-        # Color :
-        self.color = np.ones((len(self), 4), dtype=np.float32)
+        with TRACER.span('visuals.brain.set_data', n_vertices=len(vertices),
+                         n_faces=len(faces)):
+            # Vertices // faces // normals :
+            self._vert_buffer.set_data(vertices, convert=True)
+            self._normals_buffer.set_data(normals, convert=True)
+            self.hemisphere = hemisphere
+            # Mask :
+            self._mask = np.zeros((len(self),), dtype=np.float32)
+            self._mask_buffer.set_data(self._mask, convert=True)
+            self.shared_program.vert['a_mask'] = self._mask_buffer
+            # Sulcus :
+            sulcus = self._mask.copy() if sulcus is None else sulcus
+            sulcus = sulcus.astype(np.float32)
+            assert isinstance(sulcus, np.ndarray)
+            assert len(sulcus) == vertices.shape[0]
+            assert (sulcus.min() == 0.) and (sulcus.max() <= 1.)
+            self._sulcus_buffer.set_data(sulcus, convert=True)
+            self.shared_program.vert['a_sulcus'] = self._sulcus_buffer
+            # Scalars :
+            self._data_buffer.set_data(self._mask.copy(), convert=True)
+            # Color :
+            self.color = np.ones((len(self), 4), dtype=np.float32)
+            # float32 vertices, normals, mask, sulcus and scalars :
+            TRACER.count('gpu.upload.bytes', 4 * len(self) * 9)
 
     def set_color(self, data=None, color='white', alpha=1.0, **kwargs):
         """Set specific colors on the brain.
@@ -348,6 +402,75 @@ class BrainVisual(Visual):
         self._color_buffer.set_data(vispy_array(col))
         self.update()
 
+    def set_scalars(self, data):
+        """Set a scalar per vertex colored on the GPU.
+
+        The data are uploaded once. Then, the colormap and the limits can be
+        changed using the `set_cmap` method without sending new colors to the
+        GPU.
+
+        Parameters
+        ----------
+        data : array_like
+            Array of data of shape (n_vertices,).
+        """
+        data = np.ma.getdata(data).ravel()
+        assert len(data) == len(self)
+        self._data_buffer.set_data(vispy_array(data), convert=True)
+        TRACER.count('gpu.upload.bytes', 4 * len(data))
+        self._use_cmap = True
+        self.shared_program.vert['u_use_cmap'] = 1.
+        self.update()
+
+    def set_cmap(self, cmap='viridis', clim=None, vmin=None, under=None,
+                 vmax=None, over=None, n_colors=1024):
+        """Set the colormap used to color scalars.
+
+        The colormap is sent to the GPU as a texture only if it changed.
+        Limits and thresholds are passed as uniforms.
+
+        Parameters
+        ----------
+        cmap : string | 'viridis'
+            Matplotlib colormap.
+        clim : tuple | None
+            Colorbar limits. If None, (0., 1.) is used.
+        vmin : float | None
+            Every values under vmin will have the color defined using the
+            under parameter.
+        under : tuple/string | None
+            Matplotlib color for values under vmin.
+        vmax : float | None
+            Every values over vmax will have the color defined using the
+            over parameter.
+        over : tuple/string | None
+            Matplotlib color for values over vmax.
+        n_colors : int | 1024
+            Number of colors in the colormap texture.
+        """
+        # Colormap texture :
+        if (cmap, n_colors) != self._cmap_name:
+            lut = array2colormap(np.linspace(0., 1., n_colors), cmap=cmap,
+                                 clim=(0., 1.))
+            self._cmap_texture.set_data(lut[np.newaxis, ...])
+            self.shared_program.frag['u_cmap_size'] = float(n_colors)
+            self._cmap_name = (cmap, n_colors)
+        # Limits :
+        clim = (0., 1.) if clim is None else clim
+        assert len(clim) == 2
+        self.shared_program.frag['u_clim'] = tuple(float(k) for k in clim)
+        # Under / over :
+        is_vmin = isinstance(vmin, (int, float)) and (under is not None)
+        is_vmax = isinstance(vmax, (int, float)) and (over is not None)
+        frag = self.shared_program.frag
+        frag['u_isvmin'] = float(is_vmin)
+        frag['u_vmin'] = float(vmin) if is_vmin else 0.
+        frag['u_under'] = color2vb(under).ravel() if is_vmin else [0.] * 4
+        frag['u_isvmax'] = float(is_vmax)
+        frag['u_vmax'] = float(vmax) if is_vmax else 0.
+        frag['u_over'] = color2vb(over).ravel() if is_vmax else [0.] * 4
+        self.update()
+
     def set_alpha(self, alpha, index=None):
         """Set transparency to the brain.
 
@@ -381,6 +504,65 @@ class BrainVisual(Visual):
             self._camera_transform = self._camera.transform
             self.update()
 
+    def get_kdtree(self, hemisphere=None):
+        """Get a KD-tree of the vertices for nearest vertex queries.
+
+        The KD-tree of each hemisphere is only built once.
+
+        Parameters
+        ----------
+        hemisphere : {None, 'both', 'left', 'right'}
+            Hemisphere of the vertices. If None, the current hemisphere is
+            used.
+
+        Returns
+        -------
+        tree : scipy.spatial.cKDTree
+            The KD-tree. Vertices are in tree.data.
+        """
+        hemisphere = self.hemisphere if hemisphere is None else hemisphere
+        assert hemisphere in ['left', 'both', 'right']
+        if hemisphere not in self._kdtree:
+            logger.debug("Build KD-tree of %s vertices" % hemisphere)
+            if hemisphere == 'both':
+                vertices = self._vertices
+            elif hemisphere == 'left':
+                vertices = self._vertices[self._lr_index, :]
+            elif hemisphere == 'right':
+                vertices = self._vertices[~self._lr_index, :]
+            self._kdtree[hemisphere] = cKDTree(vertices)
+        return self._kdtree[hemisphere]
+
+    def is_inside(self, xyz, hemisphere=None):
+        """Test if points are inside the mesh.
+
+        The acceleration structures of each hemisphere are only built once.
+
+        Parameters
+        ----------
+        xyz : array_like
+            The points of shape (n_points, 3).
+        hemisphere : {None, 'both', 'left', 'right'}
+            Hemisphere of the mesh. If None, the current hemisphere is used.
+
+        Returns
+        -------
+        inside : array_like
+            Boolean array of shape (n_points,).
+        """
+        hemisphere = self.hemisphere if hemisphere is None else hemisphere
+        assert hemisphere in ['left', 'both', 'right']
+        if hemisphere not in self._ray_grids:
+            logger.debug("Build ray casting grids of %s faces" % hemisphere)
+            faces = self._faces
+            if hemisphere == 'left':
+                faces = faces[self._lr_index[faces[:, 0]], :]
+            elif hemisphere == 'right':
+                faces = faces[~self._lr_index[faces[:, 0]], :]
+            self._ray_grids[hemisphere] = mesh_ray_grids(self._vertices,
+                                                         faces)
+        return points_in_mesh(xyz, grids=self._ray_grids[hemisphere])
+
     def clean(self):
         """Clean the mesh.
 
@@ -390,6 +572,8 @@ class BrainVisual(Visual):
         self._vert_buffer.delete()
         self._index_buffer.delete()
         self._color_buffer.delete()
+        self._data_buffer.delete()
+        self._cmap_texture.delete()
         self._normals_buffer.delete()
 
     # =======================================================================
@@ -462,6 +646,9 @@ class BrainVisual(Visual):
         assert isinstance(value, np.ndarray) and value.ndim == 2
         assert value.shape[0] == len(self)
         self._color_buffer.set_data(value.astype(np.float32))
+        TRACER.count('gpu.upload.bytes', 16 * len(value))
+        self._use_cmap = False
+        self.shared_program.vert['u_use_cmap'] = 0.
         self.update()
         # self._color = value
 
@@ -583,6 +770,7 @@ class BrainVisual(Visual):
         """Set light_color value."""
         assert len(value) == 4
         self.shared_program.vert['u_light_color'] = value
+        self.shared_program.frag['u_light_color'] = value
         self._light_color = value
         self.update()
 
@@ -10,7 +10,8 @@ from itertools import product
 from vispy import gloo, visuals
 from vispy.scene.visuals import create_visual_node, Text
 
-from visbrain.utils import color2vb, vispy_array, PrepareData, ndsubplot
+from visbrain.utils import (color2vb, vispy_array, PrepareData, ndsubplot,
+                            check_lazy_array, iter_chunks)
 
 
 __all__ = ('GridSignal')
@@ -88,7 +89,7 @@ class GridSignalVisual(visuals.Visual):
                  method='gl', force_shape=None):
         """Init."""
         # =========================== CHECKING ===========================
-        assert isinstance(data, np.ndarray) and (data.ndim <= 3)
+        data = check_lazy_array(data, ndim=[1, 2, 3])
         assert isinstance(axis, int)
         assert isinstance(sf, (int, float))
         assert isinstance(space, (int, float))
@@ -155,42 +156,45 @@ class GridSignalVisual(visuals.Visual):
 
         # ====================== CHECKING ======================
         # Data :
-        if isinstance(data, np.ndarray):
-            # -------------- (n_rows, n_cols, n_time) --------------
-            if data.ndim == 1:  # 1-D array
-                data = data.reshape(1, 1, -1)
-                g_size = (1, 1)
-            elif data.ndim == 2:  # 2-D array
-                if axis == 0:  # data need to be transposed
-                    data = np.swapaxes(data, 0, 1)
-                    axis = 1
-                g_size = (data.shape[0], 1)  # (n_row, 1)
-                data = data[np.newaxis, ...]
-            elif data.ndim == 3:  # 3-D array
-                if axis != data.ndim - 1:  # data need to be transposed
-                    data = np.swapaxes(data, axis, -1)
-                    axis = data.ndim - 1
-                g_size = (data.shape[0], data.shape[1])
+        if data is not None:
+            data = check_lazy_array(data, ndim=[1, 2, 3])
+            # -------------- (n_rows, n_cols) --------------
+            # The time axis is swapped with the last one :
+            perm = list(range(data.ndim))
+            perm[axis], perm[-1] = perm[-1], perm[axis]
+            n_times = data.shape[axis]
+            g_size = tuple(data.shape[k] for k in perm[0:-1])
+            g_size = (g_size + (1, 1))[0:2]
 
             # -------------- Signals index --------------
-            m = np.prod(list(data.shape)[0:-1])
+            m = int(np.prod(g_size))
             sig_index = np.arange(m).reshape(*g_size)
 
             # -------------- Optimal 2-D --------------
             self._data = data
-            self._ori_shape = list(data.shape)[0:-1]
+            self._ori_shape = [1, m] if data.ndim == 2 else list(g_size)
             if force_shape is None:
                 n_rows, n_cols = ndsubplot(m)
             elif len(g_size) == 2:
                 n_rows, n_cols = force_shape
-            data = data.reshape(n_rows, n_cols, len(self))
             sig_index = sig_index.reshape(n_rows, n_cols)
             g_size = (n_rows, n_cols)
-            self._opt_shape = list(data.shape)[0:-1]
+            self._opt_shape = [n_rows, n_cols]
             self._sig_index = sig_index
 
             # -------------- (n_rows * n_cols, n_time) --------------
-            data = np.reshape(data, (m, len(self)), order='F')
+            # Signals are read by chunks (the input is never copied nor
+            # modified) then sorted in column-major order of the grid :
+            data_f = np.empty((m, n_times), dtype=np.float32)
+            if data.ndim == 1:
+                data_f[0, :] = np.asarray(data[:])
+            else:
+                n_rest = m // data.shape[perm[0]]
+                for sl, c in iter_chunks(data, axis=perm[0]):
+                    c = np.transpose(c, perm).reshape(-1, n_times)
+                    s = np.arange(len(c)) + sl[perm[0]].start * n_rest
+                    data_f[s // n_cols + (s % n_cols) * n_rows, :] = c
+            data = data_f
 
             # -------------- Prepare --------------
             # Force demean / detrend of _prep :
@@ -19,7 +19,9 @@ varying vec4 v_color;
 
 void main() {
     v_color = $a_color;
-    gl_Position = $transform(vec4($a_position, 1.));
+    // Pictures are resized and translated on the GPU :
+    vec3 position = $a_center + vec3($a_offset * $u_size, 0.) + $u_dxyz;
+    gl_Position = $transform(vec4(position, 1.));
 }
 """
 
@@ -62,16 +64,21 @@ class PicVisual(visuals.Visual):
         self._check_data(data, pos)
 
         # Get vertices and faces :
-        a_position = self._data_to_pos(pos)
-        faces, grid = self._get_index()
+        self._a_center, self._a_offset = self._data_to_pos(pos)
+        self._faces, grid = self._get_index()
 
         # Define index and position buffers :
-        self._index_buffer = gloo.IndexBuffer(faces)
-        self._pos_buffer = gloo.VertexBuffer(a_position)
-        self.shared_program.vert['a_position'] = self._pos_buffer
+        self._index_buffer = gloo.IndexBuffer(self._faces)
+        self.shared_program.vert['a_center'] = gloo.VertexBuffer(
+            self._a_center)
+        self.shared_program.vert['a_offset'] = gloo.VertexBuffer(
+            self._a_offset)
+        self.shared_program.vert['u_size'] = (float(self.w), float(self.h))
+        self.shared_program.vert['u_dxyz'] = tuple(self._dxyz.astype(float))
 
         # Re-order data :
-        self._data = data.ravel()[np.argsort(grid.ravel())]
+        self._data = np.empty((data.size,), dtype=data.dtype)
+        self._data[grid.ravel()] = data.ravel()
         # Define the color buffer :
         color = np.zeros((self._data.shape[0], 4), dtype=np.float32)
         self._color_buffer = gloo.VertexBuffer(color)
@@ -124,19 +131,19 @@ class PicVisual(visuals.Visual):
 
         Returns
         -------
-        grid : array_like
-            The grid of positions of shape (n_centers * n_rows * n_cols, 3).
+        center : array_like
+            The center of the picture of each vertex of shape
+            (n_centers * n_rows * n_cols, 3).
+        offset : array_like
+            The offset of each vertex to its center, for a picture of unit
+            width and height, of shape (n_centers * n_rows * n_cols, 2).
         """
-        grid = np.zeros((self.n, self.ncols, self.nrows, 3), dtype=np.float32)
-        # Build (starting, ending) indices :
-        xg, yg = np.mgrid[-self.w / 2:self.w / 2:self.ncols * 1j,
-                          -self.h / 2:self.h / 2:self.nrows * 1j]
-        xg = np.flipud(xg)
-        for k in range(self.n):
-            grid[k, :, :, 0] = pos[k, 0] + xg + self._dxyz[0]
-            grid[k, :, :, 1] = pos[k, 1] + yg + self._dxyz[1]
-            grid[k, :, :, 2] = pos[k, 2] + self._dxyz[2]
-        return grid.reshape(self.n * self.nrows * self.ncols, 3)
+        n_pts = self.nrows * self.ncols
+        center = np.repeat(pos.astype(np.float32), n_pts, axis=0)
+        # Offsets for one picture (repeated for each one) :
+        xg, yg = np.mgrid[-.5:.5:self.ncols * 1j, -.5:.5:self.nrows * 1j]
+        offset = np.c_[np.flipud(xg).ravel(), yg.ravel()].astype(np.float32)
+        return center, np.tile(offset, (self.n, 1))
 
     def _get_index(self):
         """Build the index of triangles.
@@ -155,21 +162,17 @@ class PicVisual(visuals.Visual):
         g = np.arange(nr * nc).reshape(nc, nr)
         g = np.fliplr(g.T)  # np.fliplr(np.flipud(g.T))
         # Build indices for one map :
-        index = np.zeros((2 * (nr - 1) * (nc - 1), 3))
-        q = 0
-        for k in range(nc - 1, 0, -1):
-            for i in range(nr - 1, 0, -1):
-                index[q, :] = [g[i, k], g[i - 1, k], g[i, k - 1]]
-                index[q + 1, :] = [g[i - 1, k], g[i, k - 1], g[i - 1, k - 1]]
-                q += 2
-        # Repeat indices for each map :
-        select = np.zeros((self.n, nr, nc), dtype=int)
-        l = index.shape[0]  # noqa
-        idx = np.zeros((self.n * l, 3), dtype=np.uint32)
-        for k in range(self.n):
-            idx[k * l:(k + 1) * l, :] = index + k * (nr * nc)
-            select[k, ...] = g + k * (nr * nc)
-        return idx, select
+        k, i = np.mgrid[nc - 1:0:-1, nr - 1:0:-1]
+        index = np.stack((np.c_[g[i, k].ravel(), g[i - 1, k].ravel(),
+                                g[i, k - 1].ravel()],
+                          np.c_[g[i - 1, k].ravel(), g[i, k - 1].ravel(),
+                                g[i - 1, k - 1].ravel()]), axis=1)
+        index = index.reshape(-1, 3)
+        # Offset indices for each map :
+        offset = np.arange(self.n).reshape(-1, 1, 1) * (nr * nc)
+        idx = (index.reshape(1, -1, 3) + offset).reshape(-1, 3)
+        select = g.reshape(1, nr, nc) + offset
+        return idx.astype(np.uint32), select
 
     def set_data(self, width=None, height=None, dxyz=None, **kwargs):
         """Convert data into a compatible colormap.
@@ -184,20 +187,15 @@ class PicVisual(visuals.Visual):
         cmap : array_like
             The colormap of shape (n_sources, n_rows, n_cols, RGBA).
         """
-        # Update width/heigth :
-        needupdate = False
+        # Update width/heigth (uniforms only) :
         if width is not None:
             self.w = width
-            needupdate = True
         if height is not None:
             self.h = height
-            needupdate = True
         if dxyz is not None:
             self._dxyz = np.array(dxyz)
-            needupdate = True
-        if needupdate:
-            a_position = self._data_to_pos(self._pos)
-            self._pos_buffer.set_data(a_position)
+        self.shared_program.vert['u_size'] = (float(self.w), float(self.h))
+        self.shared_program.vert['u_dxyz'] = tuple(self._dxyz.astype(float))
         # Update color properties :
         color = array2colormap(self._data, **kwargs)
         # Send the color to the buffer :
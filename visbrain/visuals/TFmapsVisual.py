@@ -77,6 +77,25 @@ class TFmapsMesh(CbarBase):
         norm : int | None
             The normalization method. See the `normalization` function.
         """
+        tf, freqs, time = self._compute_tf(data, sf, f_min, f_max, f_step,
+                                           baseline, norm, n_window, overlap,
+                                           window)
+        self._set_tf(tf, freqs, time, f_min, contrast, **kwargs)
+
+    def _compute_tf(self, data, sf, f_min=1., f_max=160., f_step=1.,
+                    baseline=None, norm=3, n_window=None, overlap=0.,
+                    window='flat'):
+        """Compute the time-frequency map without updating the visual.
+
+        Returns
+        -------
+        tf : array_like
+            Time-frequency map of shape (n_freqs, n_times).
+        freqs : array_like
+            Frequency vector.
+        time : array_like
+            Time vector.
+        """
         # ======================= CHECKING =======================
         assert isinstance(data, np.ndarray) and data.ndim == 1
         assert isinstance(sf, (int, float))
@@ -86,10 +105,9 @@ class TFmapsMesh(CbarBase):
         # assert isinstance(baseline)
 
         # ======================= PRE-ALLOCATION =======================
-        self._n = len(data)
         freqs = np.arange(f_min, f_max, f_step)  # frequency vector
-        time = np.arange(len(self)) / sf
-        tf = np.zeros((len(freqs), len(self)), dtype=data.dtype)
+        time = np.arange(len(data)) / sf
+        tf = np.zeros((len(freqs), len(data)), dtype=data.dtype)
 
         # ======================= COMPUTE TF =======================
         for i, k in enumerate(freqs):
@@ -108,6 +126,11 @@ class TFmapsMesh(CbarBase):
         if tf.shape[1] > self._n_limits:
             downsample = int(np.round(tf.shape[1] / self._n_limits))
             tf = tf[:, ::downsample]
+        return tf, freqs, time
+
+    def _set_tf(self, tf, freqs, time, f_min=1., contrast=.1, **kwargs):
+        """Send a time-frequency map computed with _compute_tf."""
+        self._n = len(time)
 
         # ======================= CLIM // CMAP =======================
         # Get contrast (if defined) :